@@ -11,6 +11,8 @@ particular it holds:
   commands OpenClaw is allowed to invoke and whether sudo is permitted.
 * A lightweight database layer (`db.py`) that stores run metadata and
   metrics in SQLite.
+* A cached, shared reader/writer for ``config.json`` (`config.py`) that
+  reparses the file only when it changes on disk.
 
 These modules are used by the main application to coordinate background
 services and share state.
@@ -20,3 +22,4 @@ from .proxy import ProxyServer  # noqa: F401
 from .log_manager import LogManager  # noqa: F401
 from .permissions import Permissions  # noqa: F401
 from .db import Database  # noqa: F401
+from .config import ConfigFile, config_file  # noqa: F401
@@ -0,0 +1,177 @@
+"""Cached access to the application's ``config.json``.
+
+The proxy asks for the configuration on every request and the GUI on
+most settings interactions.  Re-reading and re-parsing the file each
+time is wasteful, so :class:`ConfigFile` keeps the parsed dictionary
+and only reloads it when the file's ``(mtime_ns, size)`` changes.
+Edits made by the UI (or by hand) are therefore still picked up on the
+next call.
+
+:func:`load_json` and :func:`dump_json` are the JSON helpers every
+component uses for the config file; they go through ``orjson`` when it
+is installed.
+
+Use :func:`config_file` to get the instance for a path, so that every
+component of a process (proxy, permissions, crypto helpers) shares one
+cache and a save made by one of them is seen by the others without a
+re-parse.
+
+The returned dictionary is shared between callers and must be treated
+as read-only; copy it before making changes.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore
+
+# orjson parses/serialises the config considerably faster than the
+# stdlib; fall back to ``json`` when it is not installed.
+try:
+    import orjson
+except Exception:
+    orjson = None  # type: ignore
+
+
+def load_json(data: bytes) -> Any:
+    """Parse a JSON document from bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_json(obj: Any) -> bytes:
+    """Serialise ``obj`` as JSON indented by two spaces, as config.json is written."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+class ConfigFile:
+    """Callable returning the parsed contents of a JSON config file.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        Location of the configuration file.
+
+    Calling the instance returns the configuration dictionary, or an
+    empty dict if the file is missing or cannot be parsed.  It is safe
+    to call from several threads at once.
+    """
+
+    def __init__(self, path: "os.PathLike[str] | str") -> None:
+        self.path = os.fspath(path)
+        self._lock = threading.Lock()
+        self._sig: Optional[Tuple[int, int]] = None
+        self._cfg: Dict[str, Any] = {}
+
+    def __call__(self) -> Dict[str, Any]:
+        cfg = self.load()
+        return cfg if cfg is not None else {}
+
+    def _signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Return the configuration, or None if it cannot be read or parsed."""
+        sig = self._signature()
+        if sig is None:
+            return None
+        with self._lock:
+            if sig == self._sig:
+                return self._cfg
+            try:
+                with open(self.path, "rb") as f:
+                    cfg = load_json(f.read())
+            except Exception:
+                return None
+            if not isinstance(cfg, dict):
+                return None
+            self._sig = sig
+            self._cfg = cfg
+            return cfg
+
+    def save(self, cfg: Dict[str, Any]) -> None:
+        """Write ``cfg`` to the file and make it the cached configuration.
+
+        The data goes to a uniquely named temporary sibling that is
+        renamed over the config, so a crash mid-write cannot leave a
+        truncated file and concurrent writers never share a temporary
+        file.  ``cfg`` must not be modified afterwards.  Raises OSError
+        if the file cannot be written.
+
+        Callers doing a read-modify-write should hold :meth:`lock`.
+        """
+        data = dump_json(cfg)
+        directory, name = os.path.split(self.path)
+        with self._lock:
+            fd, tmp_path = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory or None)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+            sig = self._signature()
+            if sig is not None:
+                self._sig = sig
+                self._cfg = cfg
+
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold an exclusive advisory lock for a read-modify-write of the file.
+
+        The GUI and ``proxy_runner`` may both write the same file; the
+        lock (on a sidecar ``.lock`` file) keeps their saves from
+        interleaving.  It is not reentrant, and is a no-op where
+        ``fcntl`` is unavailable.
+        """
+        if fcntl is None:
+            yield
+            return
+        try:
+            fd = os.open(self.path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        except OSError:
+            yield
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+
+# One ConfigFile per absolute path, shared by everything in the process.
+_instances: Dict[str, ConfigFile] = {}
+_instances_lock = threading.Lock()
+
+
+def config_file(path: "os.PathLike[str] | str") -> ConfigFile:
+    """Return the shared :class:`ConfigFile` for ``path``."""
+    key = os.path.abspath(os.fspath(path))
+    with _instances_lock:
+        inst = _instances.get(key)
+        if inst is None:
+            inst = _instances[key] = ConfigFile(key)
+        return inst
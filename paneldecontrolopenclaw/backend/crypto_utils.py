@@ -12,11 +12,16 @@ reading them back via :func:`decrypt_value`.  Unencrypted values are
 returned untouched.
 
 The encryption key is automatically created when first needed.  It is
-generated using :func:`cryptography.fernet.Fernet.generate_key`,
-which yields a URL-safe base64-encoded 32-byte key.  This module
+a URL-safe base64-encoded 32-byte random key, the same format produced
+by :func:`cryptography.fernet.Fernet.generate_key`.  This module
 handles reading and writing the key to the configuration file so that
 encryption is transparent for callers.
 
+When the `rfernet` package (Rust bindings for Fernet) is installed it
+is used in preference to `cryptography`; both produce interchangeable
+tokens, so existing ``ENC:`` values keep working whichever backend is
+present.  If neither is installed values are left unencrypted.
+
 Functions defined here are intentionally decoupled from the GUI and
 backend components to avoid cyclic dependencies.  The `config_path`
 must be provided for each call so that the key can be looked up and
@@ -25,30 +30,55 @@ saved consistently.
 
 from __future__ import annotations
 
-import json
+import base64
+import os
+import threading
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
+
+from .config import config_file
 
+# Fernet backends, preferred first.  Both produce the same tokens but
+# differ in argument and return types: rfernet takes the key and the
+# token as str and returns tokens as str, while cryptography works with
+# bytes throughout.  _FernetAdapter hides the difference.
 try:
-    from cryptography.fernet import Fernet
+    from rfernet import Fernet as _RustFernet  # type: ignore
 except Exception:
-    Fernet = None  # type: ignore
+    _RustFernet = None  # type: ignore
+try:
+    from cryptography.fernet import Fernet as _PyFernet
+except Exception:
+    _PyFernet = None  # type: ignore
+Fernet = _RustFernet or _PyFernet
+
+# Fernet instances keyed by encryption key, to skip the key setup on
+# every encrypt/decrypt.
+_fernet_cache: dict[str, Any] = {}
+# Last Fernet instance resolved for each config path.  Decryption uses
+# it directly, without touching the config file; it is dropped and
+# re-resolved if a token fails to decrypt (e.g. the key was changed).
+_fernet_by_path: dict[str, Any] = {}
+_cache_lock = threading.Lock()
+
+# Marker prepended to encrypted values.
+_ENC_PREFIX = "ENC:"
+
 
 def _load_config(config_path: str) -> dict[str, Any]:
-    """Load the JSON configuration file, returning an empty dict on error."""
-    try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {}
+    """Load the JSON configuration file, returning an empty dict on error.
+
+    The parsed result is shared with other readers of the file and must
+    not be modified.
+    """
+    return config_file(config_path)()
 
 
 def _save_config(config_path: str, cfg: dict[str, Any]) -> None:
-    """Persist the given configuration back to disk."""
+    """Persist the given configuration back to disk, atomically."""
     try:
-        with open(config_path, "w", encoding="utf-8") as f:
-            json.dump(cfg, f, indent=2)
-    except Exception:
+        config_file(config_path).save(cfg)
+    except OSError:
         pass
 
 
@@ -82,13 +112,77 @@ def _ensure_encryption_key(cfg: dict[str, Any], config_path: str) -> str:
             key = ""
         else:
             # Generate a new key and persist it
-            key_bytes = Fernet.generate_key()
-            key = key_bytes.decode("utf-8")
+            key = base64.urlsafe_b64encode(os.urandom(32)).decode("utf-8")
+            cfg = dict(cfg)
             cfg["encryption_key"] = key
             _save_config(config_path, cfg)
     return key
 
 
+class _FernetAdapter:
+    """Uniform ``str`` in / ``str`` out wrapper around either Fernet backend."""
+
+    __slots__ = ("_fernet", "_str_api")
+
+    def __init__(self, backend: Any, key: str) -> None:
+        # rfernet's API is str-based, cryptography's bytes-based
+        self._str_api = backend is _RustFernet
+        self._fernet = backend(key if self._str_api else key.encode("utf-8"))
+
+    def encrypt(self, value: str) -> str:
+        token = self._fernet.encrypt(value.encode("utf-8"))
+        return token if isinstance(token, str) else token.decode("ascii")
+
+    def decrypt(self, token: str) -> str:
+        data = self._fernet.decrypt(token if self._str_api else token.encode("ascii"))
+        return data.decode("utf-8") if isinstance(data, (bytes, bytearray)) else data
+
+
+def _make_fernet(key: str) -> Optional[_FernetAdapter]:
+    """Return a working Fernet adapter for ``key``, or None.
+
+    Each installed backend is tried in order of preference and kept only
+    if a value survives an encrypt/decrypt round trip, so an
+    incompatible backend version falls back to the next one instead of
+    silently storing keys unencrypted.
+    """
+    for backend in (_RustFernet, _PyFernet):
+        if backend is None:
+            continue
+        try:
+            fernet = _FernetAdapter(backend, key)
+            if fernet.decrypt(fernet.encrypt("ok")) == "ok":
+                return fernet
+        except Exception:
+            continue
+    return None
+
+
+def _get_fernet(config_path: str) -> Optional[_FernetAdapter]:
+    """Return a cached Fernet instance for the configured key.
+
+    Returns None when no Fernet backend is installed or no usable key
+    can be obtained.
+    """
+    if Fernet is None:
+        return None
+    cfg = _load_config(config_path)
+    key = _ensure_encryption_key(cfg, config_path)
+    if not key:
+        return None
+    with _cache_lock:
+        fernet = _fernet_cache.get(key)
+    if fernet is None:
+        fernet = _make_fernet(key)
+        if fernet is None:
+            return None
+        with _cache_lock:
+            _fernet_cache[key] = fernet
+    with _cache_lock:
+        _fernet_by_path[config_path] = fernet
+    return fernet
+
+
 def encrypt_value(value: str, config_path: str) -> str:
     """Encrypt a sensitive value using the configured encryption key.
 
@@ -115,17 +209,12 @@ def encrypt_value(value: str, config_path: str) -> str:
     """
     if not value:
         return ""
-    if Fernet is None:
-        # cryptography not available
-        return value
-    cfg = _load_config(config_path)
-    key = _ensure_encryption_key(cfg, config_path)
-    if not key:
+    fernet = _get_fernet(config_path)
+    if fernet is None:
+        # cryptography not available or no key
         return value
     try:
-        f = Fernet(key.encode("utf-8"))
-        token = f.encrypt(value.encode("utf-8")).decode("utf-8")
-        return "ENC:" + token
+        return _ENC_PREFIX + fernet.encrypt(value)
     except Exception:
         return value
 
@@ -152,18 +241,22 @@ def decrypt_value(value: str, config_path: str) -> str:
     """
     if not value or not isinstance(value, str):
         return value
-    if not value.startswith("ENC:"):
+    if value[:4] != _ENC_PREFIX:
         return value
-    if Fernet is None:
-        return ""
     token = value[4:]
-    cfg = _load_config(config_path)
-    key = _ensure_encryption_key(cfg, config_path)
-    if not key:
+    # Fast path: reuse the instance already resolved for this config
+    # without reading the file again.
+    fernet = _fernet_by_path.get(config_path)
+    if fernet is not None:
+        try:
+            return fernet.decrypt(token)
+        except Exception:
+            with _cache_lock:
+                _fernet_by_path.pop(config_path, None)
+    fernet = _get_fernet(config_path)
+    if fernet is None:
         return ""
     try:
-        f = Fernet(key.encode("utf-8"))
-        decrypted = f.decrypt(token.encode("utf-8")).decode("utf-8")
-        return decrypted
+        return fernet.decrypt(token)
     except Exception:
         return ""
\ No newline at end of file
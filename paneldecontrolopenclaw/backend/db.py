@@ -12,36 +12,279 @@ database file on disk ensures persistence across restarts.
 
 from __future__ import annotations
 
+import functools
+import logging
+import queue
 import sqlite3
 import threading
 import time
+from collections import namedtuple
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Background writer tuning: at most this many queued rows are committed
+# in one transaction, and a batch waits at most this long (seconds) for
+# more rows to arrive once the first one is queued.
+_WRITE_BATCH_SIZE = 256
+_WRITE_BATCH_WINDOW = 0.02
+
+# Rows fetched per round trip by the iterating query methods.
+_ITER_BATCH_SIZE = 500
+
+# INSERT statements used by the background writer, keyed by table name.
+_INSERT_SQL = {
+    "events": "INSERT INTO events (run_id, timestamp, event, details) VALUES (?, ?, ?, ?)",
+    "denied_commands": "INSERT INTO denied_commands (timestamp, run_id, command) VALUES (?, ?, ?)",
+}
+
+
+def _row_getitem(self, key):
+    """Index by position like a tuple, or by column name like ``sqlite3.Row``."""
+    if isinstance(key, str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise IndexError(f"No item with that key: {key!r}") from None
+    return tuple.__getitem__(self, key)
+
+
+def _row_get(self, key: str, default: Any = None) -> Any:
+    """Return the named column, or ``default`` if there is no such column."""
+    return getattr(self, key, default)
+
+
+def _row_type(name: str, fields: str, defaults: Optional[tuple] = None) -> type:
+    """Build a row namedtuple that also supports ``row["col"]`` and ``row.get()``.
+
+    Query results are converted to these once, at fetch time.  Hot
+    loops can use attribute access (``row.start_time``), while existing
+    callers written against ``sqlite3.Row`` keep working unchanged.
+    """
+    base = namedtuple(name, fields, defaults=defaults)
+    return type(name, (base,), {
+        "__slots__": (),
+        "__getitem__": _row_getitem,
+        "get": _row_get,
+        "keys": lambda self: list(self._fields),
+    })
+
+
+# Row types returned by the query methods.  ``Run`` lists the listing
+# columns first so it can be built from either the listing queries or
+# ``get_run``; the remaining columns default to None.
+Run = _row_type(
+    "Run",
+    "id start_time end_time provider model status tokens_in tokens_out "
+    "total_tokens log_file prompt_tokens completion_tokens cost_estimate "
+    "error_message",
+    defaults=(None, None, None, None),
+)
+Event = _row_type("Event", "run_id timestamp event details")
+DeniedCommand = _row_type("DeniedCommand", "timestamp run_id command")
+RunStats = _row_type("RunStats", "runs_total runs_since errors_total avg_duration tokens_total")
+
+
+@functools.lru_cache(maxsize=64)
+def _update_sql(fields: Tuple[str, ...]) -> str:
+    """Return the UPDATE statement setting ``fields`` on one run.
+
+    ``update_run`` is called with only a handful of distinct column
+    combinations, so caching the text means each combination is built
+    once and always reaches SQLite as the same prepared statement.
+    """
+    return "UPDATE runs SET " + ", ".join(f"{f} = ?" for f in fields) + " WHERE id = ?"
 
 
 class Database:
     """Lightweight wrapper around SQLite for storing run metadata."""
 
-    def __init__(self, db_path: str) -> None:
+    # SQL statements are kept as constants so every call passes the
+    # identical string and hits sqlite3's prepared-statement cache.
+    # Listing queries select only the columns the UI uses.
+    _RUN_LIST_COLUMNS = (
+        "id, start_time, end_time, provider, model, status, "
+        "tokens_in, tokens_out, total_tokens, log_file"
+    )
+    _SQL_INSERT_RUN = (
+        "INSERT OR REPLACE INTO runs (id, provider, model, start_time, log_file, status) "
+        "VALUES (?, ?, ?, ?, ?, ?)"
+    )
+    _SQL_GET_EVENTS = (
+        "SELECT run_id, timestamp, event, details FROM events "
+        "WHERE run_id = ? ORDER BY timestamp ASC"
+    )
+    _SQL_GET_DENIED_FOR_RUN = (
+        "SELECT timestamp, run_id, command FROM denied_commands "
+        "WHERE run_id = ? ORDER BY timestamp ASC"
+    )
+    _SQL_GET_DENIED = (
+        "SELECT timestamp, run_id, command FROM denied_commands ORDER BY timestamp DESC"
+    )
+    _SQL_GET_RECENT = (
+        f"SELECT {_RUN_LIST_COLUMNS} FROM runs ORDER BY start_time DESC LIMIT ?"
+    )
+    _SQL_HAS_RUN_SINCE = "SELECT 1 FROM runs WHERE start_time >= ? LIMIT 1"
+    _SQL_GET_ALL = f"SELECT {_RUN_LIST_COLUMNS} FROM runs ORDER BY start_time DESC"
+    # Runs without a status count as errors and runs without both
+    # timestamps are left out of the average, matching the UI's
+    # previous per-row computation.  The recent-run count is a separate
+    # subquery so it is answered from ``idx_runs_start_time``.
+    _SQL_RUN_STATS = (
+        "SELECT COUNT(*), "
+        "(SELECT COUNT(*) FROM runs WHERE start_time > ?), "
+        "COALESCE(SUM(status IS NOT 'success'), 0), "
+        "AVG(CASE WHEN end_time AND start_time THEN end_time - start_time END), "
+        "COALESCE(SUM(tokens_in), 0) + COALESCE(SUM(tokens_out), 0) "
+        "FROM runs"
+    )
+    # Tokens (in + out) per local calendar day; the range is answered
+    # from ``idx_runs_start_time``.
+    _SQL_DAILY_TOKENS = (
+        "SELECT date(start_time, 'unixepoch', 'localtime'), "
+        "COALESCE(SUM(tokens_in), 0) + COALESCE(SUM(tokens_out), 0) "
+        "FROM runs WHERE start_time >= ? GROUP BY 1"
+    )
+    _SQL_GET_RUN = (
+        f"SELECT {_RUN_LIST_COLUMNS}, prompt_tokens, completion_tokens, "
+        "cost_estimate, error_message FROM runs WHERE id = ?"
+    )
+
+    def __init__(self, db_path: str, pool_size: int = 4) -> None:
+        """Open the database.
+
+        Parameters
+        ----------
+        db_path : str
+            Path to the SQLite database file.  Created if missing.
+        pool_size : int, optional
+            Number of read-only connections kept for queries.  Reads
+            use these and never wait on the writer lock.
+        """
         self.db_path = Path(db_path)
-        # Use a lock to guard writes from multiple threads
+        # Single writer connection; the lock serialises writes from
+        # multiple threads.  Reads go through the reader pool below.
         self.lock = threading.Lock()
-        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self._conn.row_factory = sqlite3.Row
+        self._writer = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._writer.row_factory = sqlite3.Row
+        self._configure_conn(self._writer, writer=True)
         self._create_schema()
-        # Perform an initial VACUUM to compact the database and ensure
-        # journal files are cleaned up.  VACUUM can help reclaim
-        # space when logs are purged.  This is safe to run at
-        # startup because no other threads are accessing the DB yet.
+        # Pool of read-only connections.  With WAL enabled these read a
+        # consistent snapshot while the writer is committing.  Each
+        # pooled entry is a long-lived cursor on its own connection, so
+        # queries do not allocate a new cursor every call.
+        self._readers: "queue.Queue[sqlite3.Cursor]" = queue.Queue()
+        uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+        for _ in range(max(1, pool_size)):
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            self._configure_conn(conn, writer=False)
+            self._readers.put(conn.cursor())
+        # High-frequency inserts (timeline events, denied commands) are
+        # queued and committed in batches by a background thread so the
+        # proxy never waits on a commit per event.  Call ``flush`` to
+        # wait until everything queued so far is on disk.
+        self._write_q: "queue.Queue[Tuple[str, tuple]]" = queue.Queue()
+        self._write_thread = threading.Thread(
+            target=self._write_loop, name="db-writer", daemon=True
+        )
+        self._write_thread.start()
+
+    @staticmethod
+    def _configure_conn(conn: sqlite3.Connection, writer: bool) -> None:
+        """Apply the per-connection PRAGMAs used by every connection.
+
+        ``busy_timeout`` lets SQLite retry internally instead of raising
+        ``database is locked`` when a checkpoint or another writer holds
+        the lock briefly.  Write-ahead logging lets the UI read while
+        the proxy writes and NORMAL sync avoids an fsync on every
+        commit (WAL stays consistent; only the last transactions may be
+        lost on power failure).  Settings that persist in the database
+        file are only issued on the writer.  ``auto_vacuum`` must be set
+        before the first table is created, so it only takes effect on
+        new databases; see ``vacuum`` for existing ones.
+        """
+        conn.execute("PRAGMA busy_timeout=5000")
+        if writer:
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA wal_autocheckpoint=1000")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA foreign_keys=ON")
+
+    @contextmanager
+    def _acquire_reader(self) -> Iterator[sqlite3.Cursor]:
+        """Borrow a cursor on a read-only connection from the pool.
+
+        If the caller raises, the cursor is replaced with a fresh one on
+        the same connection before it goes back to the pool.
+        """
+        cur = self._readers.get()
         try:
-            self._conn.execute("VACUUM")
-        except Exception:
-            pass
+            yield cur
+        except BaseException:
+            cur = cur.connection.cursor()
+            raise
+        finally:
+            self._readers.put(cur)
+
+    def _write_loop(self) -> None:
+        """Drain the write queue, committing each batch in one transaction."""
+        q = self._write_q
+        while True:
+            batch = [q.get()]
+            deadline = time.monotonic() + _WRITE_BATCH_WINDOW
+            while len(batch) < _WRITE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(q.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            rows_by_table: Dict[str, List[tuple]] = {}
+            for table, row in batch:
+                rows_by_table.setdefault(table, []).append(row)
+            try:
+                with self.lock, self._writer:
+                    for table, rows in rows_by_table.items():
+                        self._writer.executemany(_INSERT_SQL[table], rows)
+            except Exception:
+                # The transaction was rolled back; commit the rows one by
+                # one so only the offending ones are lost
+                self._write_rows_individually(rows_by_table)
+            finally:
+                for _ in batch:
+                    q.task_done()
+
+    def _write_rows_individually(self, rows_by_table: Dict[str, List[tuple]]) -> None:
+        """Insert each row in its own transaction, logging and skipping failures.
+
+        Used by the background writer when a batch fails, so a single
+        bad row does not take the rest of the batch with it.  Never
+        raises: the writer thread must keep running.
+        """
+        for table, rows in rows_by_table.items():
+            sql = _INSERT_SQL[table]
+            for row in rows:
+                try:
+                    with self.lock, self._writer:
+                        self._writer.execute(sql, row)
+                except Exception:
+                    logger.exception("Dropped a queued %s row that could not be written", table)
+
+    def flush(self) -> None:
+        """Block until all queued writes have been committed."""
+        self._write_q.join()
 
     def _create_schema(self) -> None:
         """Create tables if they do not exist."""
-        with self._conn:
-            self._conn.execute(
+        with self._writer:
+            self._writer.execute(
                 """
                 CREATE TABLE IF NOT EXISTS runs (
                     id TEXT PRIMARY KEY,
@@ -62,7 +305,7 @@ class Database:
                 """
             )
             # Table of timeline events per run
-            self._conn.execute(
+            self._writer.execute(
                 """
                 CREATE TABLE IF NOT EXISTS events (
                     run_id TEXT,
@@ -73,7 +316,7 @@ class Database:
                 """
             )
             # Table of denied commands attempts (for future use)
-            self._conn.execute(
+            self._writer.execute(
                 """
                 CREATE TABLE IF NOT EXISTS denied_commands (
                     timestamp REAL,
@@ -82,6 +325,17 @@ class Database:
                 )
                 """
             )
+            # Indexes for the lookups used by the UI: events per run,
+            # runs by recency and denied commands per run.
+            self._writer.execute(
+                "CREATE INDEX IF NOT EXISTS idx_events_run_ts ON events(run_id, timestamp)"
+            )
+            self._writer.execute(
+                "CREATE INDEX IF NOT EXISTS idx_runs_start_time ON runs(start_time DESC)"
+            )
+            self._writer.execute(
+                "CREATE INDEX IF NOT EXISTS idx_denied_run_ts ON denied_commands(run_id, timestamp)"
+            )
 
     def add_run(
         self,
@@ -106,13 +360,9 @@ class Database:
         log_file : str
             Path to the log file for this run.
         """
-        with self.lock, self._conn:
-            self._conn.execute(
-                """
-                INSERT OR REPLACE INTO runs (
-                    id, provider, model, start_time, log_file, status
-                ) VALUES (?, ?, ?, ?, ?, ?)
-                """,
+        with self.lock, self._writer:
+            self._writer.execute(
+                self._SQL_INSERT_RUN,
                 (run_id, provider, model, start_time, log_file, "running"),
             )
 
@@ -130,45 +380,59 @@ class Database:
             A short string describing the event type.
         details : str, optional
             Additional textual details for the event.
+
+        The insert is queued and committed shortly afterwards by the
+        background writer; use :meth:`flush` to wait for it.
         """
-        with self.lock, self._conn:
-            self._conn.execute(
-                "INSERT INTO events (run_id, timestamp, event, details) VALUES (?, ?, ?, ?)",
-                (run_id, timestamp, event, details),
-            )
+        self._write_q.put(("events", (run_id, timestamp, event, details)))
 
-    def get_events_for_run(self, run_id: str) -> List[sqlite3.Row]:
+    def add_events(self, rows: Iterable[Tuple[str, float, str, Optional[str]]]) -> None:
+        """Record several timeline events in a single transaction.
+
+        Parameters
+        ----------
+        rows : iterable of tuple
+            ``(run_id, timestamp, event, details)`` tuples, as for
+            :meth:`add_event`.  Unlike ``add_event`` the rows are
+            written synchronously.
+        """
+        rows = list(rows)
+        if not rows:
+            return
+        with self.lock, self._writer:
+            self._writer.executemany(_INSERT_SQL["events"], rows)
+
+    def get_events_for_run(self, run_id: str) -> List[Event]:
         """Return all events for a run ordered by timestamp ascending."""
-        cur = self._conn.cursor()
-        cur.execute(
-            "SELECT * FROM events WHERE run_id = ? ORDER BY timestamp ASC",
-            (run_id,),
-        )
-        return cur.fetchall()
+        with self._acquire_reader() as cur:
+            cur.execute(self._SQL_GET_EVENTS, (run_id,))
+            return list(map(Event._make, cur.fetchall()))
 
     # Denied commands logging (for future use)
     def add_denied_command(self, run_id: str, command: str) -> None:
-        """Record a denied command attempt for audit."""
+        """Record a denied command attempt for audit (queued, see ``flush``)."""
+        self._write_q.put(("denied_commands", (time.time(), run_id, command)))
+
+    def add_denied_commands(self, rows: Iterable[Tuple[str, str]]) -> None:
+        """Record a burst of denied command attempts.
+
+        ``rows`` holds ``(run_id, command)`` tuples.  The whole burst is
+        stamped with a single timestamp and handed to the background
+        writer, which commits it in one batch (see ``flush``).
+        """
         ts = time.time()
-        with self.lock, self._conn:
-            self._conn.execute(
-                "INSERT INTO denied_commands (timestamp, run_id, command) VALUES (?, ?, ?)",
-                (ts, run_id, command),
-            )
+        put = self._write_q.put
+        for run_id, command in rows:
+            put(("denied_commands", (ts, run_id, command)))
 
-    def get_denied_commands(self, run_id: Optional[str] = None) -> List[sqlite3.Row]:
+    def get_denied_commands(self, run_id: Optional[str] = None) -> List[DeniedCommand]:
         """Return denied commands, optionally filtered by run."""
-        cur = self._conn.cursor()
-        if run_id:
-            cur.execute(
-                "SELECT * FROM denied_commands WHERE run_id = ? ORDER BY timestamp ASC",
-                (run_id,),
-            )
-        else:
-            cur.execute(
-                "SELECT * FROM denied_commands ORDER BY timestamp DESC"
-            )
-        return cur.fetchall()
+        with self._acquire_reader() as cur:
+            if run_id:
+                cur.execute(self._SQL_GET_DENIED_FOR_RUN, (run_id,))
+            else:
+                cur.execute(self._SQL_GET_DENIED)
+            return list(map(DeniedCommand._make, cur.fetchall()))
 
     # Backup and maintenance
     def backup(self, backup_path: Optional[str] = None) -> str:
@@ -177,11 +441,10 @@ class Database:
         If ``backup_path`` is provided it will be used as the destination
         filename.  Otherwise a new file with a timestamp will be created
         in the same directory as the database.  Returns the path to the
-        backup file.  Note that this method does not lock the database
-        while copying; for robust hot backups consider using the
-        SQLite backup API or copy when the proxy is idle.
+        backup file.  The copy is made with SQLite's online backup API
+        from a pooled read connection, so it is consistent and does not
+        block the proxy's writes while it runs.
         """
-        import shutil
         import datetime
         src = self.db_path
         if backup_path:
@@ -190,12 +453,34 @@ class Database:
             timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
             dest = src.with_name(f"{src.stem}.bak.{timestamp}{src.suffix}")
         try:
-            shutil.copy2(src, dest)
+            dst_conn = sqlite3.connect(dest)
+            try:
+                with self._acquire_reader() as cur:
+                    cur.connection.backup(dst_conn, pages=1024, sleep=0.001)
+            finally:
+                dst_conn.close()
         except Exception:
             # ignore errors silently
             dest = src.with_name(f"{src.stem}.bak.error")
         return str(dest)
 
+    def vacuum(self) -> None:
+        """Reclaim free pages left behind by deleted rows.
+
+        Databases created with ``auto_vacuum=INCREMENTAL`` are compacted
+        with a cheap ``PRAGMA incremental_vacuum``.  Older databases
+        created without it need one full ``VACUUM`` to switch modes;
+        after that the incremental path is used.  Call this during idle
+        periods rather than on startup.
+        """
+        with self.lock:
+            mode = self._writer.execute("PRAGMA auto_vacuum").fetchone()[0]
+            if mode != 2:
+                self._writer.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                self._writer.execute("VACUUM")
+            else:
+                self._writer.execute("PRAGMA incremental_vacuum")
+
     def update_run(
         self,
         run_id: str,
@@ -214,72 +499,102 @@ class Database:
         Any argument that is None will not update the corresponding
         column.  Callers should specify only the fields that changed.
         """
-        # Build dynamic query based on provided arguments
-        fields: List[str] = []
-        values: List[Any] = []
-        if end_time is not None:
-            fields.append("end_time = ?")
-            values.append(end_time)
-        if status is not None:
-            fields.append("status = ?")
-            values.append(status)
-        if tokens_in is not None:
-            fields.append("tokens_in = ?")
-            values.append(tokens_in)
-        if tokens_out is not None:
-            fields.append("tokens_out = ?")
-            values.append(tokens_out)
-        if prompt_tokens is not None:
-            fields.append("prompt_tokens = ?")
-            values.append(prompt_tokens)
-        if completion_tokens is not None:
-            fields.append("completion_tokens = ?")
-            values.append(completion_tokens)
-        if total_tokens is not None:
-            fields.append("total_tokens = ?")
-            values.append(total_tokens)
-        if cost_estimate is not None:
-            fields.append("cost_estimate = ?")
-            values.append(cost_estimate)
-        if error_message is not None:
-            fields.append("error_message = ?")
-            values.append(error_message)
-        if not fields:
+        pairs = (
+            ("end_time", end_time),
+            ("status", status),
+            ("tokens_in", tokens_in),
+            ("tokens_out", tokens_out),
+            ("prompt_tokens", prompt_tokens),
+            ("completion_tokens", completion_tokens),
+            ("total_tokens", total_tokens),
+            ("cost_estimate", cost_estimate),
+            ("error_message", error_message),
+        )
+        names = tuple(name for name, value in pairs if value is not None)
+        if not names:
             return
+        values = [value for _, value in pairs if value is not None]
         values.append(run_id)
-        with self.lock, self._conn:
-            self._conn.execute(
-                f"UPDATE runs SET {', '.join(fields)} WHERE id = ?",
-                values,
-            )
+        with self.lock, self._writer:
+            self._writer.execute(_update_sql(names), values)
 
-    def get_recent_runs(self, limit: int = 100) -> List[sqlite3.Row]:
-        """Return the most recent runs up to the given limit."""
-        cur = self._conn.cursor()
-        cur.execute(
-            """
-            SELECT * FROM runs
-            ORDER BY start_time DESC
-            LIMIT ?
-            """,
-            (limit,),
-        )
-        rows = cur.fetchall()
-        return rows
-
-    def get_all_runs(self) -> List[sqlite3.Row]:
-        """Return all runs, ordered by start time descending."""
-        cur = self._conn.cursor()
-        cur.execute(
-            "SELECT * FROM runs ORDER BY start_time DESC"
-        )
-        return cur.fetchall()
+    def data_version(self) -> Tuple[int, int]:
+        """Return a value that changes whenever the database contents change.
+
+        Combines the rows changed through this object's writer with
+        SQLite's ``data_version``, which moves when another connection
+        (e.g. a separate proxy process) commits.  Callers compare it
+        with a previous result to skip queries when nothing was written.
+        """
+        with self.lock:
+            external = self._writer.execute("PRAGMA data_version").fetchone()[0]
+            return (self._writer.total_changes, external)
+
+    def get_recent_runs(self, limit: int = 100) -> List[Run]:
+        """Return the most recent runs up to the given limit.
+
+        Rows carry the listing columns only (see ``_RUN_LIST_COLUMNS``);
+        the other ``Run`` fields are None.  Use :meth:`get_run` for the
+        full record.
+        """
+        with self._acquire_reader() as cur:
+            cur.execute(self._SQL_GET_RECENT, (limit,))
+            return [Run(*row) for row in cur.fetchall()]
+
+    def has_run_since(self, since: float) -> bool:
+        """Return True if any run started at or after the ``since`` timestamp.
+
+        Answered from the ``runs(start_time)`` index; at most one row is read.
+        """
+        with self._acquire_reader() as cur:
+            cur.execute(self._SQL_HAS_RUN_SINCE, (since,))
+            return cur.fetchone() is not None
+
+    def get_all_runs(self) -> List[Run]:
+        """Return all runs (listing columns), ordered by start time descending."""
+        with self._acquire_reader() as cur:
+            cur.execute(self._SQL_GET_ALL)
+            return [Run(*row) for row in cur.fetchall()]
 
-    def get_run(self, run_id: str) -> Optional[sqlite3.Row]:
+    def iter_all_runs(self) -> Iterator[Run]:
+        """Yield all runs (listing columns), ordered by start time descending.
+
+        Rows are fetched in batches, so memory use does not grow with
+        the size of the table.  A pooled connection is held until the
+        iterator is exhausted or closed.
+        """
+        with self._acquire_reader() as cur:
+            cur.execute(self._SQL_GET_ALL)
+            while True:
+                rows = cur.fetchmany(_ITER_BATCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield Run(*row)
+
+    def get_run_stats(self, since: float) -> RunStats:
+        """Return aggregate run statistics computed in a single query.
+
+        ``runs_since`` counts runs that started after ``since``;
+        ``avg_duration`` is None when no run has finished.
+        """
+        with self._acquire_reader() as cur:
+            cur.execute(self._SQL_RUN_STATS, (since,))
+            return RunStats._make(cur.fetchone())
+
+    def get_daily_tokens(self, since: float) -> Dict[str, int]:
+        """Return tokens (in + out) per day for runs started at or after ``since``.
+
+        Keys are local dates formatted as ``YYYY-MM-DD``; days without
+        runs are absent.
+        """
+        with self._acquire_reader() as cur:
+            cur.execute(self._SQL_DAILY_TOKENS, (since,))
+            return dict(cur.fetchall())
+
+    def get_run(self, run_id: str) -> Optional[Run]:
         """Return a single run by ID, or None if not found."""
-        cur = self._conn.cursor()
-        cur.execute(
-            "SELECT * FROM runs WHERE id = ?",
-            (run_id,),
-        )
-        return cur.fetchone()
+        with self._acquire_reader() as cur:
+            cur.execute(self._SQL_GET_RUN, (run_id,))
+            row = cur.fetchone()
+            return Run._make(row) if row is not None else None
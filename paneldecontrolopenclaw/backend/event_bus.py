@@ -1,13 +1,13 @@
 """Simple in-process event bus for live updates.
 
-This module implements a very simple pub/sub mechanism backed by a
-``queue.Queue``.  The proxy publishes events into the queue as they
-occur (e.g. request sent, token received, request finished).  The
-graphical user interface can subscribe to the queue and process
-events in near real-time without having to poll the database or read
-log files continuously.  Each event is represented as a dictionary
-with the run identifier, event type, optional details and a
-timestamp.
+This module implements a very simple pub/sub mechanism.  Each
+subscriber gets its own bounded ``collections.deque`` and the proxy
+fans every event out to all of them as it occurs (e.g. request sent,
+token received, request finished).  The graphical user interface can
+subscribe and process events in near real-time without having to
+poll the database or read log files continuously.  Each event is
+represented as a dictionary with the run identifier, event type,
+optional details and a timestamp.
 
 This design avoids the complexity of external message brokers.  Since
 both the proxy and the UI run within the same Python process, a
@@ -21,16 +21,74 @@ mechanisms while preserving the same ``publish_event`` and
 from __future__ import annotations
 
 import queue
-from typing import Any, Dict, Iterator, Optional
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
 
-# Internal global queue used for event delivery.  The queue is not
-# bounded because events are relatively infrequent.  Consumers are
-# expected to drain the queue regularly to avoid unbounded growth.
-_event_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
+# Maximum number of undelivered events kept in memory per subscriber.
+# When a consumer falls behind, its oldest events are discarded instead
+# of growing without bound.
+MAX_PENDING_EVENTS = 4096
+
+
+class Subscription:
+    """A consumer's private event buffer, compatible with the ``queue.Queue`` subset used by the UI.
+
+    Each subscriber owns a bounded ``deque``.  ``deque.append`` and
+    ``deque.popleft`` are atomic in CPython, so the producer (proxy
+    threads) and this consumer need no extra locking, and consumers do
+    not steal events from one another.
+    """
+
+    __slots__ = ("_events",)
+
+    def __init__(self, maxlen: int = MAX_PENDING_EVENTS) -> None:
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=maxlen)
+
+    def put_nowait(self, event: Dict[str, Any]) -> None:
+        self._events.append(event)
+
+    def put_many(self, events: Iterable[Dict[str, Any]]) -> None:
+        self._events.extend(events)
+
+    def get_nowait(self) -> Dict[str, Any]:
+        try:
+            return self._events.popleft()
+        except IndexError:
+            raise queue.Empty from None
+
+    def drain(self) -> List[Dict[str, Any]]:
+        """Remove and return all pending events, oldest first."""
+        events: List[Dict[str, Any]] = []
+        popleft = self._events.popleft
+        try:
+            while True:
+                events.append(popleft())
+        except IndexError:
+            pass
+        return events
+
+    def empty(self) -> bool:
+        return not self._events
+
+    def qsize(self) -> int:
+        return len(self._events)
+
+
+# Registered subscribers.  The tuple is replaced (never mutated) under
+# ``_subscribers_lock``, so ``publish_event`` can read it without
+# taking the lock.
+_subscribers: Tuple[Subscription, ...] = ()
+_subscribers_lock = threading.Lock()
+
+# Subscription backing the module-level :func:`drain` helper.  Created
+# lazily so that events are not buffered for a consumer that never
+# exists.
+_default_subscription: Optional[Subscription] = None
 
 
 def publish_event(run_id: str, event_type: str, details: Optional[str] = None, timestamp: Optional[float] = None) -> None:
-    """Publish an event to the global event queue.
+    """Publish an event to every subscriber.
 
     Parameters
     ----------
@@ -46,21 +104,72 @@ def publish_event(run_id: str, event_type: str, details: Optional[str] = None, t
         Timestamp of the event.  If omitted the timestamp will be set
         on the consumer side when the UI receives the event.
     """
-    evt: Dict[str, Any] = {
+    subscribers = _subscribers
+    if not subscribers:
+        return
+    event = {
         "run_id": run_id,
         "event": event_type,
         "details": details,
         "timestamp": timestamp,
     }
-    _event_queue.put(evt)
+    for sub in subscribers:
+        sub.put_nowait(event)
+
+
+def publish_events_bulk(events: Iterable[Tuple[str, float, str, Optional[str]]]) -> None:
+    """Publish a batch of events to every subscriber.
+
+    Parameters
+    ----------
+    events : iterable of tuple
+        ``(run_id, timestamp, event_type, details)`` tuples, in the same
+        order as the rows accepted by ``Database.add_events``.
+    """
+    subscribers = _subscribers
+    if not subscribers:
+        return
+    batch = [
+        {"run_id": run_id, "event": event_type, "details": details, "timestamp": timestamp}
+        for run_id, timestamp, event_type, details in events
+    ]
+    for sub in subscribers:
+        sub.put_many(batch)
+
+
+def subscribe() -> Subscription:
+    """Register a new consumer and return its private event buffer.
+
+    Consumers should call ``get_nowait()`` on the returned object
+    (raising ``queue.Empty`` when no events are pending) or its
+    ``drain()`` method.  Events are dictionaries with the keys
+    ``run_id``, ``event``, ``details`` and ``timestamp``; the same
+    dictionary is shared between subscribers and must not be mutated.
+    """
+    global _subscribers
+    sub = Subscription()
+    with _subscribers_lock:
+        _subscribers = _subscribers + (sub,)
+    return sub
+
+
+def unsubscribe(sub: Subscription) -> None:
+    """Stop delivering events to ``sub``.  Unknown subscriptions are ignored."""
+    global _subscribers
+    with _subscribers_lock:
+        _subscribers = tuple(s for s in _subscribers if s is not sub)
 
 
-def subscribe() -> "queue.Queue[Dict[str, Any]]":
-    """Return the global event queue for consumers.
+def drain() -> List[Dict[str, Any]]:
+    """Remove and return all pending events for the default subscriber, oldest first.
 
-    Consumers should call ``get()`` or ``get_nowait()`` on the
-    returned queue to receive events.  The queue will contain
-    dictionaries with the keys ``run_id``, ``event``, ``details`` and
-    ``timestamp``.
+    The default subscriber is registered on the first call; events
+    published before that are not returned.
     """
-    return _event_queue
\ No newline at end of file
+    global _default_subscription, _subscribers
+    if _default_subscription is None:
+        with _subscribers_lock:
+            if _default_subscription is None:
+                _default_subscription = Subscription()
+                _subscribers = _subscribers + (_default_subscription,)
+    return _default_subscription.drain()
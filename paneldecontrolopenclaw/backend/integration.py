@@ -14,7 +14,32 @@ import os
 import subprocess
 import time
 from pathlib import Path
-from typing import Optional
+from string import Template
+from typing import Dict, Optional, Tuple
+
+# Integration instructions shown in the UI.  Parsed once at import;
+# ``${svc}`` and ``${port}`` are filled in per call.
+_INSTRUCTIONS_TEMPLATE = Template(
+    "Para que OpenClaw utilice el proxy local, debes apuntar su cliente de API al "
+    "proxy y especificar la clave API del proveedor.\n\n"
+    "**Opción A: Servicio systemd**\n"
+    "Si OpenClaw se ejecuta como un servicio systemd, crea o edita un fichero de override\n"
+    "utilizando el comando:\n\n"
+    "    sudo systemctl edit ${svc}.service\n\n"
+    "En el editor, añade:\n\n"
+    "    [Service]\n"
+    "    Environment=OPENAI_BASE_URL=http://127.0.0.1:${port}\n"
+    "    Environment=OPENAI_API_KEY=<tu_clave>\n\n"
+    "Guarda, recarga y reinicia el servicio:\n\n"
+    "    sudo systemctl daemon-reload\n"
+    "    sudo systemctl restart ${svc}.service\n\n"
+    "**Opción B: Ejecución manual**\n"
+    "Si ejecutas OpenClaw manualmente, exporta estas variables antes de lanzarlo:\n\n"
+    "    export OPENAI_BASE_URL=http://127.0.0.1:${port}\n"
+    "    export OPENAI_API_KEY=<tu_clave>\n"
+    "    ./openclaw ...\n\n"
+    "Reemplaza `<tu_clave>` por la clave real del proveedor.\n"
+)
 
 
 class IntegrationHelper:
@@ -24,9 +49,31 @@ class IntegrationHelper:
         self.db = db
         self.proxy_port = proxy_port
         self.service_name = service_name
+        # Last ``systemctl is-active`` result as (monotonic time, state)
+        self._svc_cache: tuple[float, Optional[bool]] = (0.0, None)
+        # Rendered integration instructions keyed by (provider, port, service)
+        self._instr_cache: Dict[Tuple[str, int, str], str] = {}
+
+    # How long (seconds) a service state probe is reused before
+    # ``systemctl`` is invoked again.
+    SERVICE_STATE_TTL = 2.0
 
     def is_service_active(self) -> Optional[bool]:
-        """Return True if a systemd service is active, False if inactive, None if undetermined."""
+        """Return True if a systemd service is active, False if inactive, None if undetermined.
+
+        The result is cached for ``SERVICE_STATE_TTL`` seconds so frequent
+        UI polling does not spawn a ``systemctl`` process each time.
+        """
+        checked_at, state = self._svc_cache
+        now = time.monotonic()
+        if checked_at and now - checked_at < self.SERVICE_STATE_TTL:
+            return state
+        state = self._probe_service_state()
+        self._svc_cache = (now, state)
+        return state
+
+    def _probe_service_state(self) -> Optional[bool]:
+        """Run ``systemctl is-active`` and map its output to True/False/None."""
         try:
             result = subprocess.run(
                 ["systemctl", "is-active", f"{self.service_name}.service"],
@@ -49,12 +96,7 @@ class IntegrationHelper:
 
     def has_recent_runs(self, within_seconds: int = 60) -> bool:
         """Return True if there has been a run in the last `within_seconds` seconds."""
-        now = time.time()
-        runs = self.db.get_recent_runs(limit=10)
-        for r in runs:
-            if r["start_time"] >= now - within_seconds:
-                return True
-        return False
+        return self.db.has_run_since(time.time() - within_seconds)
 
     def get_integration_instructions(self, provider: str, port: int) -> str:
         """Return textual instructions on how to configure OpenClaw to use the local proxy.
@@ -64,27 +106,12 @@ class IntegrationHelper:
         currently used but reserved for future use when per-provider configuration may differ.
         The ``port`` is interpolated into the endpoint URL.
         """
-        return (
-            "Para que OpenClaw utilice el proxy local, debes apuntar su cliente de API al "
-            "proxy y especificar la clave API del proveedor.\n\n"
-            "**Opción A: Servicio systemd**\n"
-            "Si OpenClaw se ejecuta como un servicio systemd, crea o edita un fichero de override\n"
-            "utilizando el comando:\n\n"
-            "    sudo systemctl edit {svc}.service\n\n"
-            "En el editor, añade:\n\n"
-            "    [Service]\n"
-            "    Environment=OPENAI_BASE_URL=http://127.0.0.1:{port}\n"
-            "    Environment=OPENAI_API_KEY=<tu_clave>\n\n"
-            "Guarda, recarga y reinicia el servicio:\n\n"
-            "    sudo systemctl daemon-reload\n"
-            "    sudo systemctl restart {svc}.service\n\n"
-            "**Opción B: Ejecución manual**\n"
-            "Si ejecutas OpenClaw manualmente, exporta estas variables antes de lanzarlo:\n\n"
-            "    export OPENAI_BASE_URL=http://127.0.0.1:{port}\n"
-            "    export OPENAI_API_KEY=<tu_clave>\n"
-            "    ./openclaw ...\n\n"
-            "Reemplaza `<tu_clave>` por la clave real del proveedor.\n"
-        ).format(port=port, svc=self.service_name)
+        key = (provider, port, self.service_name)
+        text = self._instr_cache.get(key)
+        if text is None:
+            text = _INSTRUCTIONS_TEMPLATE.substitute(port=port, svc=self.service_name)
+            self._instr_cache[key] = text
+        return text
 
     def generate_dropin_override(self, api_key_placeholder: str = "<tu_clave>") -> str:
         """Generate the contents of a systemd override file for OpenClaw.
@@ -7,17 +7,101 @@ cumulative size of all log files exceeds the configured limit, the
 oldest logs are deleted automatically.  This prevents uncontrolled
 disk consumption.
 
-The log manager is intentionally simple: it does not compress logs
-(although this could be added in future) and assumes exclusive
-ownership of the log directory.
+Writes go straight to a cached per-run file descriptor opened with
+``O_APPEND``.  A background thread closes idle descriptors and
+compresses old logs and prunes the directory periodically.  The log
+manager assumes exclusive ownership of the log directory; call
+:meth:`LogManager.close` on shutdown to release descriptors and run a
+final maintenance pass.
 """
 
 from __future__ import annotations
 
+import gzip
+import heapq
 import os
+import queue
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
+
+# Optional: zstandard compresses logs much faster and smaller than
+# gzip.  Fall back to gzip if it is not installed.
+try:
+    import zstandard as zstd  # type: ignore
+except ImportError:
+    zstd = None  # type: ignore
+
+# Suffix appended to compressed log files
+COMPRESSED_SUFFIX = ".zst" if zstd is not None else ".gz"
+
+# Chunk size used when streaming a log into the gzip compressor
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# zstd compression level.  Level 3 (the zstd default) is far faster
+# than gzip's default while still compressing text logs better.
+ZSTD_LEVEL = 3
+
+# Seconds between wake-ups of the maintenance thread.
+TICK_INTERVAL = 1.0
+
+# Seconds between compression/pruning passes over the log directory.
+# Passes only run if something was written since the previous one.
+MAINTENANCE_INTERVAL = 10.0
+
+# Descriptors idle for longer than this are closed on the next tick.
+FD_IDLE_TIMEOUT = 30.0
+
+# Number of striped locks used to serialise writes per run.
+WRITE_LOCK_STRIPES = 64
+
+
+# Gather write, used to append multi-part log entries in one call.
+# Not available on Windows, where the parts are joined instead.
+_writev = getattr(os, "writev", None)
+
+
+# Reusable copy buffers for compression workers.  Buffers are created
+# on demand and up to one per CPU is kept for reuse, so concurrent
+# compressions do not allocate a fresh 1 MiB buffer per file.
+_BUFPOOL: "queue.LifoQueue[bytearray]" = queue.LifoQueue(maxsize=os.cpu_count() or 1)
+
+
+def _copy_pooled(f_in, f_out) -> None:
+    """Copy ``f_in`` to ``f_out`` through a pooled buffer filled with ``readinto``."""
+    try:
+        buf = _BUFPOOL.get_nowait()
+    except queue.Empty:
+        buf = bytearray(COPY_BUFFER_SIZE)
+    try:
+        view = memoryview(buf)
+        while True:
+            n = f_in.readinto(buf)
+            if not n:
+                break
+            f_out.write(view[:n])
+    finally:
+        try:
+            _BUFPOOL.put_nowait(buf)
+        except queue.Full:
+            pass
+
+
+def _compress_file(src: str, dst: str, threads: int = -1) -> None:
+    """Compress ``src`` into ``dst`` using zstd, or gzip if unavailable.
+
+    ``threads`` is passed to zstd (-1 uses all CPUs, 0 compresses on
+    the calling thread) and ignored for gzip.
+    """
+    if zstd is not None:
+        cctx = zstd.ZstdCompressor(level=ZSTD_LEVEL, threads=threads)
+        with open(src, "rb") as f_in, open(dst, "wb") as f_out:
+            cctx.copy_stream(f_in, f_out, read_size=131072, write_size=131072)
+    else:
+        with open(src, "rb") as f_in, gzip.open(dst, "wb") as f_out:
+            _copy_pooled(f_in, f_out)
 
 
 class LogManager:
@@ -45,15 +129,44 @@ class LogManager:
             Maximum cumulative size of log files in megabytes.
         compress_days : int, optional
             If provided, logs older than this number of days will be
-            compressed into gzip files to save space.  Set to None
+            compressed (zstd, or gzip if ``zstandard`` is not
+            installed) to save space.  Set to None
             to disable compression.  Compressed logs still count
             towards the size limit.
         """
         self.log_dir = Path(log_dir)
+        # Plain-string form used on the hot paths (scans, per-run file
+        # names) to avoid pathlib overhead per call.
+        self.log_dir_str = str(self.log_dir)
         self.max_bytes = max_size_mb * 1024 * 1024
         self.compress_days = compress_days
-        self.lock = threading.Lock()
+        # Striped per-run write locks: writes to the same log file are
+        # serialised, while runs on different stripes never wait on each
+        # other.  A fixed set avoids creating (and having to safely
+        # discard) a lock for every run id.
+        self._write_locks = [threading.Lock() for _ in range(WRITE_LOCK_STRIPES)]
+        # Guards the directory-wide state: the cached total and the scans
+        # done by compression and pruning.  When both are needed, take
+        # ``_maint_lock`` before a write lock.
+        self._maint_lock = threading.Lock()
         self.ensure_log_dir()
+        # Running total of bytes in the log directory, maintained
+        # incrementally by the maintenance thread so that writes do not
+        # have to rescan the directory.  Resynchronised by full scans.
+        self._cached_total = self._total_size()
+        # Open descriptors keyed by run_id, with the time of their last write
+        self._fds: Dict[str, int] = {}
+        self._last_write: Dict[str, float] = {}
+        # Byte counts of writes not yet accounted for by the maintenance
+        # thread; a non-empty queue also means maintenance is due.
+        self._written: "queue.SimpleQueue[int]" = queue.SimpleQueue()
+        self._dirty = False
+        self._last_maintenance = time.monotonic()
+        # Wall-clock time before which _compress_old_logs skips its scan
+        self._next_compress_check = 0.0
+        self._closed = threading.Event()
+        self._maintainer = threading.Thread(target=self._maintenance_loop, name="log-maintenance", daemon=True)
+        self._maintainer.start()
 
     def ensure_log_dir(self) -> None:
         """Ensure that the log directory exists."""
@@ -62,97 +175,300 @@ class LogManager:
     def _total_size(self) -> int:
         """Calculate the total size of all files in the log directory."""
         total = 0
-        for entry in self.log_dir.iterdir():
-            if entry.is_file():
-                total += entry.stat().st_size
+        with os.scandir(self.log_dir_str) as it:
+            for entry in it:
+                try:
+                    if entry.is_file(follow_symlinks=False):
+                        total += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
         return total
 
+    def invalidate(self) -> None:
+        """Recompute the cached total size from a full directory scan.
+
+        Call this if files in the log directory were changed by
+        something other than this manager.
+        """
+        with self._maint_lock:
+            self._cached_total = self._total_size()
+
     def _prune_if_needed(self) -> None:
-        """Remove oldest log files until the total size is below the limit."""
-        # Acquire the lock to avoid concurrent deletions/writes.
-        with self.lock:
-            total = self._total_size()
-            if total <= self.max_bytes:
-                return
-            # Build list of files with their modification times.
-            files = [(f.stat().st_mtime, f) for f in self.log_dir.iterdir() if f.is_file()]
-            # Sort by modification time ascending (oldest first)
-            files.sort()
-            for mtime, file_path in files:
+        """Remove oldest log files until the total size is below the limit.
+
+        The caller must hold ``self._maint_lock``.  The directory is only
+        scanned when the cached total exceeds the limit.
+        """
+        if self._cached_total <= self.max_bytes:
+            return
+        # Build list of files with their modification times and sizes
+        # in a single directory pass; the total falls out of the same scan.
+        files = []
+        total = 0
+        with os.scandir(self.log_dir_str) as it:
+            for entry in it:
                 try:
-                    size = file_path.stat().st_size
-                    file_path.unlink()
-                    total -= size
-                    if total <= self.max_bytes:
-                        break
-                except Exception:
-                    # Ignore deletion errors but continue processing
+                    if entry.is_file(follow_symlinks=False):
+                        st = entry.stat(follow_symlinks=False)
+                        files.append((st.st_mtime, entry.path, st.st_size, entry.name))
+                        total += st.st_size
+                except OSError:
                     continue
+        self._cached_total = total
+        if total <= self.max_bytes:
+            return
+        # Pop files oldest first.  Usually only a few need deleting, so a
+        # heap avoids sorting the whole directory listing.
+        heapq.heapify(files)
+        while files:
+            mtime, file_path, size, name = heapq.heappop(files)
+            try:
+                if name.endswith(".log"):
+                    # Do not keep appending to a file that is about to vanish
+                    run_id = name[:-4]
+                    with self._write_lock(run_id):
+                        self._close_fd(run_id)
+                        os.unlink(file_path)
+                else:
+                    os.unlink(file_path)
+                total -= size
+                self._cached_total = total
+                if total <= self.max_bytes:
+                    break
+            except Exception:
+                # Ignore deletion errors but continue processing
+                continue
 
-    def write_log(self, run_id: str, data: str) -> str:
+    def log_path(self, run_id: str) -> str:
+        """Return the path of the log file for ``run_id`` without touching disk."""
+        return os.path.join(self.log_dir_str, run_id + ".log")
+
+    def write_log(self, run_id: str, data: Union[str, bytes, Sequence[bytes]]) -> str:
         """Append data to the log file for the given run.
 
+        The data is encoded once and written with ``os.write`` on a
+        cached ``O_APPEND`` descriptor, bypassing Python's text and
+        buffered IO layers; it is visible to readers immediately.  A
+        sequence of byte strings is written with a single ``os.writev``
+        where available, so callers need not concatenate the pieces.  Only
+        the run's own lock is taken (it keeps pruning from closing the
+        descriptor mid-write); compression and pruning run on the
+        background maintenance thread rather than on every write.
+
         Parameters
         ----------
         run_id : str
             Identifier of the run; used to name the log file.
-        data : str
-            Text to append to the log file.
+        data : str, bytes or sequence of bytes
+            Text to append to the log file (UTF-8 encoded if str), or
+            byte strings appended one after the other.
 
         Returns
         -------
         str
             The absolute path of the log file.
         """
-        # Acquire lock around write to prevent race with pruning.
-        with self.lock:
-            log_path = self.log_dir / f"{run_id}.log"
-            with open(log_path, "a", encoding="utf-8") as f:
-                f.write(data)
-            # Optionally compress old logs before pruning
-            self._compress_old_logs()
-            # After writing, prune if necessary.
+        if isinstance(data, str):
+            parts: Sequence[bytes] = (data.encode("utf-8"),)
+        elif isinstance(data, (bytes, bytearray, memoryview)):
+            parts = (data,)
+        elif _writev is None:
+            parts = (b"".join(data),)
+        else:
+            parts = data
+        size = sum(len(part) for part in parts)
+        log_path = self.log_path(run_id)
+        # Lock only this run's file; pruning takes it before deleting.
+        with self._write_lock(run_id):
+            fd = self._fds.get(run_id)
+            if fd is None:
+                fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+                self._fds[run_id] = fd
+            if len(parts) == 1:
+                view = memoryview(parts[0])
+                while view:
+                    view = view[os.write(fd, view):]
+            else:
+                written = _writev(fd, parts)
+                if written < size:
+                    # Short write: finish the remainder with os.write
+                    view = memoryview(b"".join(parts))[written:]
+                    while view:
+                        view = view[os.write(fd, view):]
+            self._last_write[run_id] = time.monotonic()
+        self._written.put(size)
+        return log_path
+
+    def _write_lock(self, run_id: str) -> threading.Lock:
+        """Return the write lock guarding ``run_id``'s log file."""
+        return self._write_locks[hash(run_id) % WRITE_LOCK_STRIPES]
+
+    def _close_fd(self, run_id: str) -> None:
+        """Close the descriptor for ``run_id`` if one is open.
+
+        The caller must hold the run's write lock.
+        """
+        fd = self._fds.pop(run_id, None)
+        self._last_write.pop(run_id, None)
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _close_idle_fds(self) -> None:
+        """Close descriptors of runs that have not written recently."""
+        now = time.monotonic()
+        for run_id in list(self._fds):
+            with self._write_lock(run_id):
+                if now - self._last_write.get(run_id, now) > FD_IDLE_TIMEOUT:
+                    self._close_fd(run_id)
+
+    def _account_writes(self) -> None:
+        """Fold queued write sizes into the cached total.
+
+        The caller must hold ``self._maint_lock``.
+        """
+        get = self._written.get_nowait
+        try:
+            while True:
+                self._cached_total += get()
+                self._dirty = True
+        except queue.Empty:
+            pass
+
+    def _maintenance_loop(self) -> None:
+        """Background loop: close idle descriptors and run periodic maintenance."""
+        while not self._closed.wait(TICK_INTERVAL):
+            try:
+                self._close_idle_fds()
+                self._maybe_maintain()
+            except Exception:
+                # Never let a maintenance failure kill the thread
+                pass
+
+    def _maybe_maintain(self) -> None:
+        """Compress and prune logs if due and anything was written."""
+        now = time.monotonic()
+        with self._maint_lock:
+            self._account_writes()
+            if not self._dirty or now - self._last_maintenance < MAINTENANCE_INTERVAL:
+                return
+            self._dirty = False
+            self._last_maintenance = now
+        # Optionally compress old logs before pruning
+        self._compress_old_logs()
+        # Prune if necessary.
+        with self._maint_lock:
             self._prune_if_needed()
-            return str(log_path)
+
+    def close(self) -> None:
+        """Stop the maintenance thread and close all descriptors."""
+        self._closed.set()
+        self._maintainer.join()
+        for run_id in list(self._fds):
+            with self._write_lock(run_id):
+                self._close_fd(run_id)
+        with self._maint_lock:
+            self._account_writes()
+        self._compress_old_logs()
+        with self._maint_lock:
+            self._prune_if_needed()
+
+    def __enter__(self) -> "LogManager":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
     def _compress_old_logs(self) -> None:
-        """Compress log files older than the configured threshold using gzip.
+        """Compress log files older than the configured threshold.
 
         This method will walk through all files in the log directory and
         compress those that are older than `compress_days`.  It only
         compresses files with the `.log` extension.  Compressed files
-        keep the same name with `.gz` appended and the original file
-        is removed.  If `compress_days` is None this method does
-        nothing.
+        keep the same name with ``COMPRESSED_SUFFIX`` (`.zst`, or `.gz`
+        without zstandard) appended and the original file is removed.
+        If `compress_days` is None this method does nothing.
+
+        Candidates are collected under ``self._maint_lock``, compressed
+        in parallel without holding it, and the originals are removed
+        under the lock again.  The caller must not hold ``self._maint_lock``.  Scans
+        are rate-limited to one per ``compress_days / 24`` (at least an
+        hour).
         """
         if not self.compress_days:
             return
-        import gzip
-        threshold = time.time() - (self.compress_days * 86400)
-        for entry in self.log_dir.iterdir():
-            if not entry.is_file():
-                continue
-            if entry.suffix == ".gz":
-                continue
-            if not entry.name.endswith(".log"):
-                continue
+        now = time.time()
+        if now < self._next_compress_check or not os.path.isdir(self.log_dir_str):
+            return
+        # Files only become eligible by ageing, so there is no point in
+        # rescanning more often than a fraction of the threshold.
+        self._next_compress_check = now + max(3600, self.compress_days * 86400 / 24)
+        threshold = now - (self.compress_days * 86400)
+        # (run_id, source path, compressed path, mtime, original size)
+        candidates: List[Tuple[str, str, str, float, int]] = []
+        with self._maint_lock:
+            with os.scandir(self.log_dir_str) as it:
+                for entry in it:
+                    if not entry.name.endswith(".log"):
+                        continue
+                    run_id = entry.name[:-4]
+                    if run_id in self._fds:
+                        # Still being written to
+                        continue
+                    try:
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if st.st_mtime > threshold:
+                        continue
+                    candidates.append(
+                        (run_id, entry.path, entry.path + COMPRESSED_SUFFIX, st.st_mtime, st.st_size)
+                    )
+        if not candidates:
+            return
+        workers = min(len(candidates), os.cpu_count() or 1)
+        # With several files in flight, parallelism comes from the pool;
+        # a lone file may use zstd's own worker threads instead.
+        threads = -1 if workers == 1 else 0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="log-compress") as pool:
+            results = list(pool.map(lambda c: self._compress_one(c[1], c[2], c[3], threads), candidates))
+        with self._maint_lock:
+            for (run_id, src, dst, _mtime, size), ok in zip(candidates, results):
+                if not ok:
+                    continue
+                with self._write_lock(run_id):
+                    if run_id in self._fds:
+                        # Written to again while compressing: keep the plain log
+                        try:
+                            os.unlink(dst)
+                        except OSError:
+                            pass
+                        continue
+                    try:
+                        os.unlink(src)
+                        self._cached_total += os.stat(dst).st_size - size
+                    except OSError:
+                        continue
+
+    @staticmethod
+    def _compress_one(src: str, dst: str, mtime: float, threads: int) -> bool:
+        """Compress a single log file; return True on success."""
+        try:
+            _compress_file(src, dst, threads)
+            # Preserve modification time on compressed file
+            os.utime(dst, (mtime, mtime))
+            return True
+        except Exception:
+            # If compression fails, leave original file
             try:
-                mtime = entry.stat().st_mtime
+                os.unlink(dst)
             except OSError:
-                continue
-            if mtime > threshold:
-                continue
-            gz_path = entry.with_suffix(entry.suffix + ".gz")
-            # Compress file
-            try:
-                with open(entry, "rb") as f_in, gzip.open(gz_path, "wb") as f_out:
-                    f_out.writelines(f_in)
-                # Preserve modification time on compressed file
-                os.utime(gz_path, (mtime, mtime))
-                entry.unlink()
-            except Exception:
-                # If compression fails, leave original file
-                continue
+                pass
+            return False
 
     def get_stats(self) -> dict[str, int]:
         """Return statistics about the current log storage.
@@ -162,10 +478,18 @@ class LogManager:
         dict[str, int]
             A dictionary with keys `total_bytes` and `file_count`.
         """
-        with self.lock:
-            total = self._total_size()
-            count = sum(1 for f in self.log_dir.iterdir() if f.is_file())
-            return {"total_bytes": total, "file_count": count}
+        total = 0
+        count = 0
+        with self._maint_lock:
+            with os.scandir(self.log_dir_str) as it:
+                for entry in it:
+                    try:
+                        if entry.is_file(follow_symlinks=False):
+                            total += entry.stat(follow_symlinks=False).st_size
+                            count += 1
+                    except OSError:
+                        continue
+        return {"total_bytes": total, "file_count": count}
 
     def get_top_files(self, n: int = 5) -> list[tuple[str, int]]:
         """Return the n largest log files sorted descending by size.
@@ -174,14 +498,15 @@ class LogManager:
         -------
         list of tuple (filename, size_bytes)
         """
-        files = []
-        with self.lock:
-            for f in self.log_dir.iterdir():
-                if f.is_file():
-                    try:
-                        size = f.stat().st_size
-                        files.append((f.name, size))
-                    except OSError:
-                        continue
-        files.sort(key=lambda x: x[1], reverse=True)
-        return files[:n]
+        with self._maint_lock:
+            return heapq.nlargest(n, self._iter_file_sizes(), key=lambda x: x[1])
+
+    def _iter_file_sizes(self) -> Iterator[Tuple[str, int]]:
+        """Yield ``(name, size)`` for each regular file in the log directory."""
+        with os.scandir(self.log_dir_str) as it:
+            for entry in it:
+                try:
+                    if entry.is_file(follow_symlinks=False):
+                        yield entry.name, entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
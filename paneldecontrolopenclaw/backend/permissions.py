@@ -10,9 +10,51 @@ are persisted back to the configuration file.
 
 from __future__ import annotations
 
-import json
+import re
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Pattern
+
+from .config import config_file
+
+
+# Backreferences would point at the wrong group once patterns are
+# combined into one alternation.
+_BACKREF_RE = re.compile(r"\\[1-9]|\(\?P=")
+_DEFAULT_FLAGS = re.compile("").flags
+
+
+def _compile_patterns(patterns: Optional[List[str]]) -> Optional[List[Pattern[str]]]:
+    """Compile argument patterns, skipping any that are not valid regexes.
+
+    The valid patterns are combined into a single alternation so that
+    one ``search`` decides a match.  If they cannot be combined (for
+    example because of backreferences, duplicate group names or inline
+    flags) the individually compiled patterns are returned instead.
+    """
+    if not patterns:
+        return None
+    compiled = []
+    valid = []
+    for pat in patterns:
+        try:
+            compiled.append(re.compile(pat))
+        except re.error:
+            # Invalid regex pattern: ignore pattern
+            continue
+        valid.append(pat)
+    combinable = (
+        len(valid) > 1
+        and not any(_BACKREF_RE.search(pat) for pat in valid)
+        # Global inline flags such as "(?i)" would apply to every branch
+        and all(c.flags == _DEFAULT_FLAGS for c in compiled)
+    )
+    if combinable:
+        try:
+            return [re.compile("|".join(f"(?:{pat})" for pat in valid))]
+        except re.error:
+            pass
+    return compiled
 
 
 class Permissions:
@@ -35,6 +77,12 @@ class Permissions:
 
     def __init__(self, config_path: str) -> None:
         self.config_path = Path(config_path)
+        # Shared cached view of the file; ``_save`` reuses its parse
+        # unless another component (e.g. the UI) has changed the file.
+        self._config = config_file(self.config_path)
+        # Nesting depth of :meth:`batch` and whether a save was deferred
+        self._batch_depth = 0
+        self._save_pending = False
         self._load()
 
     def _load(self) -> None:
@@ -53,12 +101,11 @@ class Permissions:
         """
         self.allowlist = {}
         self.allow_sudo = False
+        self._index()
         if not self.config_path.exists():
             return
-        try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                cfg = json.load(f)
-        except Exception:
+        cfg = self._read_config()
+        if cfg is None:
             return
         raw_cmds = cfg.get("allowed_commands", [])
         # Build structured allowlist
@@ -75,6 +122,7 @@ class Permissions:
                 self.allowlist[cmd] = {
                     "subcommands": subcmd_list,
                     "args_patterns": pattern_list,
+                    "args_patterns_compiled": _compile_patterns(pattern_list),
                 }
             elif isinstance(entry, str):
                 # Simple allow all for this command
@@ -83,6 +131,7 @@ class Permissions:
                     "args_patterns": None,
                 }
         self.allow_sudo = bool(cfg.get("allow_sudo", False))
+        self._index()
 
     def _save(self) -> None:
         """Persist the current allowlist and sudo flag back to the config.
@@ -92,12 +141,8 @@ class Permissions:
         ``subcommands`` and/or ``args_patterns`` keys.  The ordering
         of entries is not preserved.
         """
-        if not self.config_path.exists():
-            return
-        try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                cfg = json.load(f)
-        except Exception:
+        if self._batch_depth:
+            self._save_pending = True
             return
         entries = []
         for cmd, rules in self.allowlist.items():
@@ -115,10 +160,43 @@ class Permissions:
                 if patterns:
                     entry["args_patterns"] = list(patterns)
                 entries.append(entry)
-        cfg["allowed_commands"] = entries
-        cfg["allow_sudo"] = self.allow_sudo
-        with open(self.config_path, "w", encoding="utf-8") as f:
-            json.dump(cfg, f, indent=2)
+        with self._config.lock():
+            # Reuses the cached parse unless the file changed on disk
+            cfg = self._read_config()
+            if cfg is None:
+                return
+            # The cached dict is shared; modify a copy
+            cfg = dict(cfg)
+            cfg["allowed_commands"] = entries
+            cfg["allow_sudo"] = self.allow_sudo
+            self._config.save(cfg)
+
+    def _read_config(self) -> Optional[Dict[str, Any]]:
+        """Return the parsed configuration, or None if it cannot be read.
+
+        The file is only parsed again if it changed on disk.  The result
+        is shared and must not be modified.
+        """
+        return self._config.load()
+
+    @contextmanager
+    def batch(self) -> Iterator["Permissions"]:
+        """Group several changes into a single write of the config file.
+
+        Examples
+        --------
+        >>> with perms.batch():
+        ...     perms.add_command("ls")
+        ...     perms.add_command("cat")
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._save_pending:
+                self._save_pending = False
+                self._save()
 
     def is_sudo_allowed(self) -> bool:
         """Return whether sudo usage is permitted."""
@@ -140,6 +218,10 @@ class Permissions:
         both subcommands and patterns are omitted, any invocation of
         the command is allowed.
 
+        A command run through ``sudo`` is rejected outright unless sudo
+        is allowed, in which case the command following ``sudo`` is
+        checked against the allowlist.
+
         Parameters
         ----------
         command : str
@@ -150,50 +232,76 @@ class Permissions:
         bool
             True if the invocation is permitted; False otherwise.
         """
-        parts = command.strip().split()
+        # Only split off the command; the subcommand and argument
+        # string are derived from the remainder if a rule needs them.
+        parts = command.split(None, 1)
         if not parts:
             return False
         cmd = parts[0]
+        rest = parts[1] if len(parts) > 1 else ""
         # Extract program name (in case of absolute path)
-        base_cmd = cmd.split("/")[-1]
-        subcmd = parts[1] if len(parts) > 1 else None
-        args = parts[1:] if len(parts) > 1 else []
-        # Join args into a single string for pattern matching
-        args_str = " ".join(args)
-        for allowed_cmd, rules in self.allowlist.items():
-            # If allowlist value is None, allow all
-            if rules is None:
-                if base_cmd == allowed_cmd or cmd.endswith("/" + allowed_cmd):
+        base_cmd = cmd.rpartition("/")[2]
+        if base_cmd == "sudo":
+            # Cheapest rejection first; otherwise check the wrapped command
+            if not self.allow_sudo:
+                return False
+            parts = rest.split(None, 1)
+            if not parts:
+                return False
+            cmd = parts[0]
+            rest = parts[1] if len(parts) > 1 else ""
+            base_cmd = cmd.rpartition("/")[2]
+        # Exact name match is a dict lookup; only entries containing a
+        # slash need the suffix comparison against the full path.
+        rules = self.allowlist.get(base_cmd)
+        if base_cmd in self.allowlist and self._rule_allows(rules, rest):
+            return True
+        for allowed_cmd in self._path_rules:
+            if cmd.endswith("/" + allowed_cmd):
+                if self._rule_allows(self.allowlist[allowed_cmd], rest):
                     return True
-                continue
-            # Check command match
-            if base_cmd == allowed_cmd or cmd.endswith("/" + allowed_cmd):
-                subcmds = rules.get("subcommands")
-                patterns = rules.get("args_patterns")
-                # Check subcommand restriction
-                if subcmds:
-                    if not subcmd or subcmd not in subcmds:
-                        # Subcommand missing or not allowed
-                        continue
-                # Check argument patterns
-                if patterns:
-                    import re
-                    matched = False
-                    for pat in patterns:
-                        try:
-                            if re.search(pat, args_str):
-                                matched = True
-                                break
-                        except re.error:
-                            # Invalid regex pattern: ignore pattern
-                            continue
-                    if not matched:
-                        # No patterns matched
-                        continue
-                # If we reach here, command passes restrictions
-                return True
         return False
 
+    @staticmethod
+    def _rule_allows(rules: Optional[dict], rest: str) -> bool:
+        """Return True if an invocation satisfies a single allowlist rule.
+
+        ``rest`` is the command line after the command itself.
+        """
+        # If allowlist value is None, allow all
+        if rules is None:
+            return True
+        subcmds = rules.get("subcommands")
+        patterns = rules.get("args_patterns")
+        # Check subcommand restriction
+        if subcmds:
+            subcmd = rest.split(None, 1)[0] if rest else None
+            if not subcmd or subcmd not in subcmds:
+                # Subcommand missing or not allowed
+                return False
+        # Check argument patterns
+        if patterns:
+            compiled = rules.get("args_patterns_compiled")
+            if compiled is None:
+                compiled = rules["args_patterns_compiled"] = _compile_patterns(patterns)
+            # Arguments joined by single spaces, as matched historically
+            args_str = " ".join(rest.split())
+            for regex in compiled:
+                if regex.search(args_str):
+                    return True
+            # No patterns matched
+            return False
+        # If we reach here, command passes restrictions
+        return True
+
+    def _index(self) -> None:
+        """Rebuild the list of allowlist entries that contain a path.
+
+        ``allowlist`` is already keyed by command name, so plain entries
+        are found with a dict lookup; only these need suffix matching.
+        """
+        self._path_rules = [cmd for cmd in self.allowlist if "/" in cmd]
+
     def add_command(self, prefix: str) -> None:
         """Add a command prefix to the allowlist and persist.
 
@@ -203,12 +311,14 @@ class Permissions:
         """
         if prefix not in self.allowlist:
             self.allowlist[prefix] = {"subcommands": None, "args_patterns": None}
+            self._index()
             self._save()
 
     def remove_command(self, prefix: str) -> None:
         """Remove a command prefix from the allowlist and persist."""
         if prefix in self.allowlist:
             self.allowlist.pop(prefix, None)
+            self._index()
             self._save()
 
     def get_allowlist(self) -> List[str]:
@@ -15,16 +15,315 @@ endpoints and headers accordingly.
 
 from __future__ import annotations
 
+import base64
+import hashlib
 import json
+import os
+import queue
 import re
 import threading
 import time
 import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from http.server import BaseHTTPRequestHandler, HTTPServer
-from socketserver import ThreadingMixIn
-from typing import Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+# In-process event bus used to stream run events to the UI.  Event
+# publishing is simply skipped if it cannot be imported.
+try:
+    from . import event_bus  # type: ignore
+except Exception:
+    event_bus = None  # type: ignore
+
+# orjson parses and serialises request/response bodies several times
+# faster than the stdlib and works on bytes directly; fall back to
+# ``json`` when it is not installed.
+try:
+    import orjson
+except Exception:
+    orjson = None  # type: ignore
+
+# google-re2 scans in guaranteed linear time, which keeps redaction of
+# large response logs cheap; fall back to ``re`` when not installed.
+try:
+    import re2
+except Exception:
+    re2 = None  # type: ignore
+
+# Size of the upstream connection pool.  ``POOL_CONNECTIONS`` bounds the
+# number of distinct hosts kept alive and ``POOL_MAXSIZE`` the number of
+# concurrent keep-alive connections per host.
+POOL_CONNECTIONS = 64
+POOL_MAXSIZE = 256
+
+# Upper bounds on how long one request can occupy a worker thread:
+# ``CLIENT_TIMEOUT`` applies to each socket operation on the client
+# connection, ``UPSTREAM_TIMEOUT`` is the (connect, read) timeout for
+# the provider.  The read timeout is the longest silence tolerated
+# between bytes, not a limit on the whole response.
+CLIENT_TIMEOUT = 60.0
+UPSTREAM_TIMEOUT = (10.0, 300.0)
+
+# Default number of worker threads serving proxy connections, used when
+# the config does not set ``proxy_workers``.  Each provider may occupy
+# at most ``proxy_provider_workers`` of them (default: the whole pool,
+# since only one provider is configured at a time); requests over that
+# limit wait up to ``PROVIDER_SLOT_TIMEOUT`` seconds for a free slot
+# before being answered with 503.
+DEFAULT_WORKERS = 32
+PROVIDER_SLOT_TIMEOUT = 30.0
+
+# Circuit breaker: after ``BREAKER_THRESHOLD`` consecutive failures the
+# proxy refuses requests for ``BREAKER_COOLDOWN`` seconds, then lets a
+# single probe request through before closing again.
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 30.0
+
+# Run identifiers are random UUID4 strings generated this many at a
+# time, from a single ``os.urandom`` call.
+RUN_ID_BATCH = 1024
+
+# Opt-in cache of successful non-streaming responses (config key
+# ``response_cache``), keyed by provider, upstream URL, request headers
+# (including the caller's credentials) and exact upstream body.
+# ``response_cache_size`` and ``response_cache_ttl`` override the
+# defaults below; larger bodies are never cached.
+RESPONSE_CACHE_SIZE = 256
+RESPONSE_CACHE_TTL = 300.0
+RESPONSE_CACHE_MAX_BODY = 1024 * 1024
+
+# Path prefixes with a dedicated handler method, so sub-paths such as
+# ``/v1/models/<id>`` go to the same handler; any other path is treated
+# as a chat completion (streamed or not).
+_ROUTES: Tuple[Tuple[str, str], ...] = (
+    ("/v1/models", "_handle_models"),
+    ("/v1/embeddings", "_handle_embeddings"),
+)
+
+# Streamed ``token_chunk`` events are buffered and written in batches of
+# at most ``EVENT_BATCH_SIZE`` rows, or at least every
+# ``EVENT_BATCH_INTERVAL`` seconds, instead of one insert per chunk.
+EVENT_BATCH_SIZE = 50
+EVENT_BATCH_INTERVAL = 0.1
+
+# Events for the UI are appended to an in-memory ring by request
+# threads and fanned out to subscribers by a single publisher thread,
+# in batches of at most ``EVENT_PUBLISH_BATCH`` every
+# ``EVENT_PUBLISH_INTERVAL`` seconds.  When the ring is full the oldest
+# undelivered events are dropped.
+EVENT_RING_SIZE = 100000
+EVENT_PUBLISH_BATCH = 256
+EVENT_PUBLISH_INTERVAL = 0.005
+
+# Largest single read from a streamed upstream response.
+STREAM_READ_SIZE = 64 * 1024
+
+# Streamed bodies are split into lines to find the generated deltas; a
+# partial line longer than this is dropped rather than buffered.
+STREAM_LINE_LIMIT = 1024 * 1024
+
+# Non-streaming upstream bodies are relayed to the client in pieces of
+# this size instead of being buffered whole; only the first
+# ``RESPONSE_LOG_LIMIT`` bytes are kept for the run log.
+RELAY_CHUNK_SIZE = 64 * 1024
+RESPONSE_LOG_LIMIT = 20000
+
+# Maximum number of request body bytes copied into the run log.
+REQUEST_LOG_LIMIT = 2048
+
+# Secrets masked before request/response bodies are written to the run
+# log.  The alternatives are fused into one pattern so a single scan
+# replaces every match.  The case-insensitive flag is inline so the
+# same pattern compiles under both ``re2`` and ``re``.  Log bodies are
+# redacted as raw bytes and never decoded.
+_REDACT_RE = (re2 if re2 is not None else re).compile(
+    rb"(?i)sk-[A-Za-z0-9]{20,}"
+    rb"|Bearer [A-Za-z0-9\-_=]+"
+    rb'|"api_key"\s*:\s*"[^"]+"'
+)
+
+
+def _loads(data: bytes) -> Any:
+    """Parse a JSON document from UTF-8 ``data``."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialise ``obj`` to UTF-8 JSON bytes, optionally indented by two spaces."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            # e.g. integers wider than 64 bits; let the stdlib handle them
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+
+def _delta_text(line: bytes) -> Optional[str]:
+    """Return the generated text carried by one line of a streamed response.
+
+    Handles OpenAI-style server-sent events (``data: {...}``) as well as
+    bare JSON lines.  Returns None for comments, ``[DONE]``, keep-alives
+    and lines without text.
+    """
+    if line.startswith(b"data:"):
+        line = line[5:]
+    line = line.strip()
+    if not line.startswith(b"{"):
+        return None
+    try:
+        obj = _loads(line)
+        choices = obj.get("choices")
+        if choices:
+            choice = choices[0]
+            delta = choice.get("delta")
+            text = delta.get("content") if delta else choice.get("text")
+        else:
+            message = obj.get("message")
+            text = message.get("content") if message else obj.get("response")
+    except Exception:
+        return None
+    return text if isinstance(text, str) and text else None
+
+
+# Flat ``"usage": {...}`` object in a response body.  Providers put it
+# at the top level, normally after the (possibly very large) payload,
+# so it is looked up from the last ``"usage"`` key; see ``_usage_from``.
+_USAGE_RE = re.compile(rb'"usage"\s*:\s*(\{[^{}]*\})')
+
+
+def _usage_from(body: bytes) -> Optional[Dict[str, Any]]:
+    """Return the ``usage`` object of a JSON response body, if any.
+
+    Only the ``usage`` object is parsed when it can be located; the full
+    body is parsed only as a fallback (e.g. when ``usage`` contains
+    nested objects).
+    """
+    pos = body.rfind(b'"usage"')
+    if pos < 0:
+        return None
+    m = _USAGE_RE.match(body, pos)
+    if m:
+        try:
+            usage = _loads(m.group(1))
+            if isinstance(usage, dict):
+                return usage
+        except Exception:
+            pass
+    try:
+        usage = _loads(body).get("usage")
+    except Exception:
+        return None
+    return usage if isinstance(usage, dict) else None
+
+
+def _redact(data: bytes) -> bytes:
+    """Replace API keys and bearer tokens in ``data`` with a placeholder."""
+    return _REDACT_RE.sub(b"[REDACTED]", data)
+
+
+def _response_cache_key(ex: "_Exchange") -> bytes:
+    """Return the response cache key for an exchange.
+
+    Besides the body, the key covers everything that decides which
+    upstream answers and on whose account: the configured provider, the
+    target URL (base URL and path) and the outgoing headers, which carry
+    the caller's ``Authorization`` or the provider's API key.  A caller
+    with a different or revoked key, or a config pointing elsewhere,
+    therefore never receives another request's cached answer.
+    """
+    h = hashlib.sha256()
+    provider = ex.config.get("provider", "openai") or "openai"
+    h.update(provider.encode("utf-8") + b"\0" + ex.target_url.encode("utf-8") + b"\0")
+    for name, value in sorted(ex.headers.items()):
+        h.update(f"{name}:{value}".encode("utf-8") + b"\0")
+    h.update(ex.upstream_body)
+    return h.digest()
+
+
+class _Exchange:
+    """Per-request state shared between ``do_POST`` and the route handlers."""
+
+    __slots__ = ("run_id", "path", "target_url", "headers", "upstream_body", "config", "status", "log_head", "usage")
+
+    def __init__(self, run_id: str, path: str, target_url: str, headers: Dict[str, str], upstream_body: bytes, config: Dict) -> None:
+        self.run_id = run_id
+        self.path = path
+        self.target_url = target_url
+        self.headers = headers
+        self.upstream_body = upstream_body
+        self.config = config
+        # Filled in by the handler: upstream status, raw prefix of the
+        # response body for the log and the provider's ``usage`` object
+        self.status = 500
+        self.log_head: bytes = b""
+        self.usage: Dict[str, int] = {}
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of upstream responses whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE, ttl: float = RESPONSE_CACHE_TTL) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, Tuple[int, bytes]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> Optional[Tuple[int, bytes]]:
+        """Return the cached ``(status, body)`` for ``key``, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: bytes, value: Tuple[int, bytes]) -> None:
+        """Store ``(status, body)`` under ``key``, evicting the least recently used entry."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTP server that handles connections on a bounded thread pool.
+
+    ``ThreadingMixIn`` starts one thread per connection, so a burst of
+    clients or a slow upstream can create threads without limit.  Here
+    connections are queued to a fixed ``ThreadPoolExecutor`` instead.
+    """
+
+    def __init__(self, server_address, handler_class, max_workers: int) -> None:
+        # Created first: HTTPServer calls server_close() if binding fails
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="proxy-worker")
+        super().__init__(server_address, handler_class)
+
+    def process_request(self, request, client_address) -> None:
+        self._pool.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._pool.shutdown(wait=False)
 
 
 class ProxyServer(threading.Thread):
@@ -47,17 +346,213 @@ class ProxyServer(threading.Thread):
         self.server: Optional[HTTPServer] = None
         # Circuit breaker state.  If consecutive errors exceed a threshold,
         # the proxy will temporarily refuse requests for a cooldown
-        # interval to prevent overwhelming external providers.  These
-        # values are updated in the request handler below.  See
-        # ``_handle_response`` for details.
+        # interval to prevent overwhelming external providers.  The state
+        # is "closed", "open" or "half_open" and is only read or changed
+        # under ``_breaker_lock``; see ``_breaker_admit`` and
+        # ``_breaker_record``.
+        self._breaker_lock = threading.Lock()
+        self._breaker_state: str = "closed"
         self._error_count: int = 0
         self._breaker_until: float = 0.0
+        # Shared HTTP session so upstream TCP/TLS connections are kept
+        # alive and reused across requests instead of being re-established
+        # for every proxied call.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        # Database and log-file writes are handed to a single background
+        # worker so request threads never wait on disk I/O.  The worker
+        # runs them in submission order; ``None`` stops it.
+        self._io_queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._io_thread = threading.Thread(target=self._io_worker, name="proxy-io", daemon=True)
+        self._io_thread.start()
+        # UI events waiting for the publisher thread, as
+        # ``(run_id, timestamp, event_type, details)`` tuples; see
+        # ``_publish`` and ``_event_publisher``.
+        self._event_ring: "deque[Tuple[str, float, str, Optional[str]]]" = deque(maxlen=EVENT_RING_SIZE)
+        self._publisher_stop = threading.Event()
+        self._publisher_thread = threading.Thread(target=self._event_publisher, name="proxy-events", daemon=True)
+        self._publisher_thread.start()
+        # Per-provider bulkheads limiting concurrent upstream calls; see
+        # ``_provider_slot``.  The limit is read from the config in run().
+        self._provider_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._provider_slots_lock = threading.Lock()
+        self._provider_limit: int = DEFAULT_WORKERS
+        # Last provider key settings and the upstream headers built from
+        # them, so the ``ENC:`` key is not decoded on every request.  The
+        # pair is replaced as a whole, never mutated.
+        self._headers_cache: Tuple[Optional[tuple], Dict[str, str]] = (None, {})
+        # Used only when the config enables ``response_cache``; sized
+        # from the config in run().
+        self._response_cache = ResponseCache()
+        # Pre-formatted run identifiers; see ``_new_run_id``
+        self._run_ids: "deque[str]" = deque()
+
+    def _new_run_id(self) -> str:
+        """Return a fresh random UUID4 string for a run.
+
+        Identifiers are produced ``RUN_ID_BATCH`` at a time, so the
+        ``os.urandom`` call and the string formatting are amortised
+        across requests.  ``deque.pop`` and ``extend`` are atomic, so
+        concurrent handlers never receive the same identifier.
+        """
+        try:
+            return self._run_ids.pop()
+        except IndexError:
+            pass
+        raw = os.urandom(16 * RUN_ID_BATCH)
+        ids = [str(uuid.UUID(bytes=raw[i:i + 16], version=4)) for i in range(0, len(raw), 16)]
+        run_id = ids.pop()
+        self._run_ids.extend(ids)
+        return run_id
+
+    def _breaker_admit(self) -> Tuple[bool, bool]:
+        """Decide whether a request may be forwarded.
+
+        Returns
+        -------
+        tuple of bool
+            ``(allowed, probe)``.  ``probe`` is true for the single
+            request let through once the cooldown has elapsed; its
+            outcome decides whether the breaker closes or re-opens.
+        """
+        with self._breaker_lock:
+            if self._breaker_state == "closed":
+                return True, False
+            now = time.monotonic()
+            if now < self._breaker_until:
+                return False, False
+            # Cooldown over (or a previous probe never reported back):
+            # admit one probe and keep refusing the rest until it does.
+            self._breaker_state = "half_open"
+            self._breaker_until = now + BREAKER_COOLDOWN
+            return True, True
+
+    def _breaker_record(self, success: Optional[bool], probe: bool) -> None:
+        """Update the breaker with a request outcome.
+
+        ``success`` is None when the request never reached the
+        provider; it is not counted, but a probe is released so the next
+        request can probe instead.
+        """
+        with self._breaker_lock:
+            if probe:
+                if success is None:
+                    self._breaker_state = "open"
+                    self._breaker_until = 0.0
+                elif success:
+                    self._breaker_state = "closed"
+                    self._error_count = 0
+                else:
+                    self._breaker_state = "open"
+                    self._breaker_until = time.monotonic() + BREAKER_COOLDOWN
+                return
+            if success is None or self._breaker_state != "closed":
+                # Requests admitted before the breaker tripped do not
+                # influence the probe.
+                return
+            if success:
+                self._error_count = 0
+                return
+            self._error_count += 1
+            if self._error_count >= BREAKER_THRESHOLD:
+                self._breaker_state = "open"
+                self._breaker_until = time.monotonic() + BREAKER_COOLDOWN
+                self._error_count = 0
+
+    def _provider_slot(self, provider: str) -> threading.BoundedSemaphore:
+        """Return the semaphore bounding concurrent requests to ``provider``."""
+        slot = self._provider_slots.get(provider)
+        if slot is None:
+            with self._provider_slots_lock:
+                slot = self._provider_slots.get(provider)
+                if slot is None:
+                    slot = threading.BoundedSemaphore(self._provider_limit)
+                    self._provider_slots[provider] = slot
+        return slot
+
+    def _provider_headers(self, provider_cfg: Dict[str, str]) -> Dict[str, str]:
+        """Return upstream headers carrying the provider's configured API key.
+
+        The result is cached and shared between requests; callers must
+        not mutate it.
+        """
+        key = (
+            provider_cfg.get("api_key"),
+            provider_cfg.get("api_key_header", "Authorization"),
+            provider_cfg.get("api_key_prefix", ""),
+        )
+        cached_key, headers = self._headers_cache
+        if cached_key == key:
+            return headers
+        api_key, api_header, api_prefix = key
+        # Decode API key if encoded with prefix ENC:
+        if isinstance(api_key, str) and api_key.startswith("ENC:"):
+            try:
+                api_key = base64.b64decode(api_key[4:]).decode("utf-8")
+            except Exception:
+                api_key = None
+        headers = {"Content-Type": "application/json"}
+        if api_key:
+            headers[api_header] = f"{api_prefix}{api_key}"
+        self._headers_cache = (key, headers)
+        return headers
+
+    def _submit_io(self, func: Callable, *args, **kwargs) -> None:
+        """Queue ``func(*args, **kwargs)`` for the background I/O worker."""
+        self._io_queue.put((func, args, kwargs))
+
+    def _io_worker(self) -> None:
+        """Run queued database and log writes until the ``None`` sentinel."""
+        q = self._io_queue
+        while True:
+            item = q.get()
+            if item is None:
+                break
+            func, args, kwargs = item
+            try:
+                func(*args, **kwargs)
+            except Exception:
+                # A failed write must not stop the worker
+                pass
+
+    def _publish(self, run_id: str, ts: float, event: str, details: Optional[str] = None) -> None:
+        """Queue an event for the UI without touching subscriber buffers."""
+        if event_bus is not None:
+            self._event_ring.append((run_id, ts, event, details))
+
+    def _event_publisher(self) -> None:
+        """Fan queued events out to the event bus until shutdown."""
+        ring = self._event_ring
+        stopping = False
+        while not stopping:
+            stopping = self._publisher_stop.wait(EVENT_PUBLISH_INTERVAL)
+            while ring:
+                batch = []
+                try:
+                    while len(batch) < EVENT_PUBLISH_BATCH:
+                        batch.append(ring.popleft())
+                except IndexError:
+                    pass
+                try:
+                    event_bus.publish_events_bulk(batch)
+                except Exception:
+                    pass
 
     def run(self) -> None:
         """Start the HTTP server and serve requests until shutdown."""
-
-        class ThreadedHTTPServer(ThreadingMixIn, HTTPServer):
-            daemon_threads = True
+        try:
+            cfg = self.get_config()
+            workers = max(1, int(cfg.get("proxy_workers", DEFAULT_WORKERS)))
+            self._provider_limit = max(1, int(cfg.get("proxy_provider_workers", workers)))
+            self._response_cache = ResponseCache(
+                max(1, int(cfg.get("response_cache_size", RESPONSE_CACHE_SIZE))),
+                float(cfg.get("response_cache_ttl", RESPONSE_CACHE_TTL)),
+            )
+        except Exception:
+            workers = DEFAULT_WORKERS
+            self._provider_limit = workers
 
         # Capture outer variables for use in handler
         get_config = self.get_config
@@ -66,11 +561,226 @@ class ProxyServer(threading.Thread):
         outer = self
 
         class Handler(BaseHTTPRequestHandler):
+            # Socket timeout for reads from and writes to the client, so
+            # a stalled client cannot hold a pool worker indefinitely
+            timeout = CLIENT_TIMEOUT
+            # Set TCP_NODELAY on accepted sockets so small SSE frames
+            # (and the first token in particular) are not held back by
+            # Nagle's algorithm
+            disable_nagle_algorithm = True
+
             def _set_headers(self, code: int = 200, content_type: str = "application/json") -> None:
                 self.send_response(code)
                 self.send_header("Content-Type", content_type)
                 self.end_headers()
 
+            def _flush_events(self, pending: List[Tuple[str, float, str, Optional[str]]]) -> None:
+                """Write buffered events in one transaction and publish them to the UI."""
+                if not pending:
+                    return
+                try:
+                    outer._submit_io(db.add_events, list(pending))
+                    if event_bus is not None:
+                        outer._event_ring.extend(pending)
+                except Exception:
+                    pass
+                pending.clear()
+
+            def _now(self) -> float:
+                """Return a wall-clock timestamp for the current request.
+
+                It is the request's start time plus the elapsed monotonic
+                time, so event timestamps stay ordered even if the system
+                clock is adjusted mid-request.
+                """
+                return self._wall_start + (time.monotonic() - self._mono_start)
+
+            def _relay(self, resp, collect: bool) -> Tuple[List[bytes], bytearray]:
+                """Stream an upstream response body to the client as it arrives.
+
+                Returns the body chunks when ``collect`` is true (so usage can
+                be parsed afterwards) and the first ``RESPONSE_LOG_LIMIT``
+                bytes for the run log.  The upstream connection is always
+                returned to the pool.
+
+                The body deliberately passes through user space: the
+                upstream socket usually carries TLS and chunked or
+                compressed framing, so ``sendfile``/``splice`` would
+                forward ciphertext, and the proxy needs the decoded bytes
+                for the log and for usage accounting anyway.
+                """
+                chunks: List[bytes] = []
+                log_head = bytearray()
+                client_gone = False
+                try:
+                    for chunk in resp.iter_content(chunk_size=RELAY_CHUNK_SIZE):
+                        if not chunk:
+                            continue
+                        if collect:
+                            chunks.append(chunk)
+                        # One byte past the limit marks the log as truncated
+                        if len(log_head) <= RESPONSE_LOG_LIMIT:
+                            log_head += chunk[:RESPONSE_LOG_LIMIT + 1 - len(log_head)]
+                        if client_gone:
+                            continue
+                        try:
+                            self.wfile.write(chunk)
+                        except BrokenPipeError:
+                            # Keep reading only if the body is still needed
+                            client_gone = True
+                            if not collect:
+                                break
+                finally:
+                    resp.close()
+                return chunks, log_head
+
+            def _event(self, ex: "_Exchange", event: str, details: Optional[str] = None) -> None:
+                """Record a timeline event for the current run and publish it to the UI."""
+                try:
+                    ts = self._now()
+                    db.add_event(ex.run_id, ts, event, details)
+                    outer._publish(ex.run_id, ts, event, details)
+                except Exception:
+                    pass
+
+            def _set_usage(self, ex: "_Exchange", body: bytes) -> None:
+                """Take token usage from a JSON response body, if present."""
+                usage = _usage_from(body)
+                if usage is not None:
+                    ex.usage = usage
+
+            def _handle_models(self, ex: "_Exchange") -> None:
+                """Forward a model listing request (no JSON body required)."""
+                resp = outer._session.get(ex.target_url, headers=ex.headers, stream=True, timeout=UPSTREAM_TIMEOUT)
+                ex.status = resp.status_code
+                self._set_headers(ex.status)
+                _, log_head = self._relay(resp, collect=False)
+                ex.log_head = log_head
+
+            def _handle_embeddings(self, ex: "_Exchange") -> None:
+                """Forward an embeddings request and record its usage."""
+                resp = outer._session.post(ex.target_url, headers=ex.headers, data=ex.upstream_body, stream=True, timeout=UPSTREAM_TIMEOUT)
+                ex.status = resp.status_code
+                self._set_headers(ex.status)
+                chunks, log_head = self._relay(resp, collect=ex.status < 500)
+                ex.log_head = log_head
+                # Embeddings return the full response at once
+                self._event(ex, "first_token")
+                if chunks:
+                    self._set_usage(ex, b"".join(chunks))
+
+            def _handle_chat_sync(self, ex: "_Exchange") -> None:
+                """Forward a non-streaming completion, using the response cache when enabled."""
+                cache_key = None
+                if ex.config.get("response_cache"):
+                    cache_key = _response_cache_key(ex)
+                    cached = outer._response_cache.get(cache_key)
+                    if cached is not None:
+                        ex.status, body = cached
+                        self._set_headers(ex.status)
+                        try:
+                            self.wfile.write(body)
+                        except BrokenPipeError:
+                            pass
+                        ex.log_head = body[:RESPONSE_LOG_LIMIT + 1]
+                        self._event(ex, "cache_hit")
+                        return
+                resp = outer._session.post(ex.target_url, headers=ex.headers, data=ex.upstream_body, stream=True, timeout=UPSTREAM_TIMEOUT)
+                ex.status = resp.status_code
+                self._set_headers(ex.status)
+                chunks, log_head = self._relay(resp, collect=ex.status < 500)
+                ex.log_head = log_head
+                self._event(ex, "first_token")
+                if chunks:
+                    body = b"".join(chunks)
+                    if cache_key is not None and ex.status == 200 and len(body) <= RESPONSE_CACHE_MAX_BODY:
+                        outer._response_cache.put(cache_key, (ex.status, body))
+                    self._set_usage(ex, body)
+
+            def _handle_chat_stream(self, ex: "_Exchange") -> None:
+                """Relay a streamed completion, emitting one event per generated delta."""
+                run_id = ex.run_id
+                # Per-delta events are skipped entirely with minimal logging
+                track_deltas = ex.config.get("log_level") != "minimal"
+                resp = outer._session.post(ex.target_url, headers=ex.headers, data=ex.upstream_body, stream=True, timeout=UPSTREAM_TIMEOUT)
+                ex.status = resp.status_code
+                self._set_headers(ex.status)
+                first_token_recorded = False
+                pending_events: List[Tuple[str, float, str, Optional[str]]] = []
+                last_flush = self._now()
+                # Raw bytes for the log, decoded once after the stream
+                log_head = bytearray()
+                # Incomplete trailing line of the event stream
+                line_buf = b""
+                # Read straight from the urllib3 response.  ``read1``
+                # returns whatever has arrived (up to STREAM_READ_SIZE)
+                # without waiting to fill the buffer, so tokens are not
+                # delayed while several SSE frames can still coalesce.
+                raw = resp.raw
+                raw.decode_content = True
+                read = getattr(raw, "read1", None)
+                if read is None:
+                    # urllib3 < 2 has no read1
+                    pieces = resp.iter_content(chunk_size=1024)
+
+                    def read(_size: int) -> bytes:
+                        return next(pieces, b"")
+                try:
+                    while True:
+                        chunk = read(STREAM_READ_SIZE)
+                        if not chunk:
+                            break
+                        try:
+                            # ``wfile`` is unbuffered (wbufsize = 0), so each
+                            # write is already a single send of everything
+                            # read1 returned; no per-chunk flush is needed.
+                            self.wfile.write(chunk)
+                            # Limit accumulation (one byte past the limit marks truncation)
+                            if len(log_head) <= RESPONSE_LOG_LIMIT:
+                                log_head += chunk[:RESPONSE_LOG_LIMIT + 1 - len(log_head)]
+                            ts_tc = self._now()
+                            if track_deltas:
+                                # Buffer one token chunk event per streamed delta
+                                # (truncate details); the bytes are forwarded
+                                # unchanged above.
+                                lines = (line_buf + chunk).split(b"\n")
+                                line_buf = lines.pop()
+                                if len(line_buf) > STREAM_LINE_LIMIT:
+                                    line_buf = b""
+                                for line in lines:
+                                    text = _delta_text(line)
+                                    if text is not None:
+                                        pending_events.append((run_id, ts_tc, "token_chunk", text[:100]))
+                                if len(pending_events) >= EVENT_BATCH_SIZE or ts_tc - last_flush >= EVENT_BATCH_INTERVAL:
+                                    self._flush_events(pending_events)
+                                    last_flush = ts_tc
+                            # Record first token event
+                            if not first_token_recorded:
+                                try:
+                                    db.add_event(run_id, ts_tc, "first_token")
+                                    outer._publish(run_id, ts_tc, "first_token")
+                                except Exception:
+                                    pass
+                                first_token_recorded = True
+                        except BrokenPipeError:
+                            break
+                finally:
+                    self._flush_events(pending_events)
+                    # Return the connection to the pool even when the
+                    # client disconnects mid-stream.
+                    resp.close()
+                    ex.log_head = log_head
+                self._event(ex, "stream_finished")
+                # Try to extract usage from headers
+                try:
+                    usage = resp.headers.get("OpenAI-Usage")
+                    if usage:
+                        usage_data = _loads(usage)
+                        if isinstance(usage_data, dict):
+                            ex.usage = usage_data
+                except Exception:
+                    pass
+
             def do_GET(self) -> None:
                 if self.path == "/health":
                     self._set_headers(200)
@@ -84,12 +794,16 @@ class ProxyServer(threading.Thread):
                 path = self.path
                 content_length = int(self.headers.get("Content-Length", 0))
                 body_bytes = self.rfile.read(content_length) if content_length else b""
-                run_id = str(uuid.uuid4())
-                start_time = time.time()
+                run_id = outer._new_run_id()
+                # Wall-clock start for the DB; later timestamps are derived
+                # from the monotonic clock (see ``_now``).
+                self._wall_start = start_time = time.time()
+                self._mono_start = time.monotonic()
                 # Check circuit breaker state.  If the proxy is in a
                 # cooldown period due to repeated errors, refuse early
                 # with a 503 status and do not attempt to call the provider.
-                if outer._breaker_until > 0 and time.time() < outer._breaker_until:
+                admitted, probe = outer._breaker_admit()
+                if not admitted:
                     self.send_response(503)
                     self.send_header("Content-Type", "application/json")
                     self.end_headers()
@@ -112,239 +826,106 @@ class ProxyServer(threading.Thread):
                 target_url = f"{base_url}{path}"
                 # Parse JSON body
                 try:
-                    payload = json.loads(body_bytes.decode("utf-8")) if body_bytes else {}
+                    payload = _loads(body_bytes) if body_bytes else {}
                 except Exception:
+                    outer._breaker_record(None, probe)
                     self._set_headers(400)
-                    self.wfile.write(json.dumps({"error": "invalid JSON"}).encode("utf-8"))
+                    self.wfile.write(_dumps({"error": "invalid JSON"}))
                     return
                 # Overwrite model
                 if model:
                     payload["model"] = model
                 # Determine if streaming is requested
                 stream_requested = bool(payload.get("stream"))
+                # Serialise the (possibly rewritten) payload once for the
+                # upstream request
+                upstream_body = _dumps(payload)
                 # Prepare headers.  Always set content type and propagate
                 # inbound authentication header if provided.  If no inbound
                 # header exists, use the API key from the provider
                 # configuration.  Provider configuration may include
                 # ``api_key``, ``api_key_header`` and ``api_key_prefix`` for
                 # flexibility across different providers.
-                headers = {"Content-Type": "application/json"}
                 inbound_auth = self.headers.get("Authorization")
                 if inbound_auth:
-                    headers["Authorization"] = inbound_auth
+                    headers = {"Content-Type": "application/json", "Authorization": inbound_auth}
                 else:
-                    # Use configured API key if present
-                    api_key = provider_cfg.get("api_key") if provider_cfg else None
-                    # Decode API key if encoded with prefix ENC:
-                    if isinstance(api_key, str) and api_key.startswith("ENC:"):
-                        try:
-                            import base64
-                            decoded_key = base64.b64decode(api_key[4:]).decode("utf-8")
-                            api_key = decoded_key
-                        except Exception:
-                            api_key = None
-                    api_header = provider_cfg.get("api_key_header", "Authorization") if provider_cfg else "Authorization"
-                    api_prefix = provider_cfg.get("api_key_prefix", "") if provider_cfg else ""
-                    if api_key:
-                        headers[api_header] = f"{api_prefix}{api_key}"
+                    # Shared, must not be mutated
+                    headers = outer._provider_headers(provider_cfg)
                 # Record run start in DB with placeholder log file.  Also write initial
                 # request payload to the log for auditability (truncated to avoid excessive size).
-                # Build a friendly representation of the JSON payload if possible.
-                req_log = ""
-                try:
-                    # Try to pretty print the request payload
-                    req_log = json.dumps(payload, ensure_ascii=False, indent=2)
-                except Exception:
-                    req_log = str(payload)
-                # Truncate extremely long requests to 2000 characters
-                if len(req_log) > 2000:
-                    req_log = req_log[:2000] + "... [truncated]"
-                # Redact potential sensitive values before logging
-                def _redact(text: str) -> str:
-                    # Replace API keys and tokens with placeholder
-                    patterns = [
-                        r"sk-[a-zA-Z0-9]{20,}",
-                        r"Bearer [A-Za-z0-9\-_=]+",
-                        r"api_key"\s*:\s*"[^"]+",
-                    ]
-                    for pat in patterns:
+                # Only a prefix of the body sent upstream (with the model
+                # override applied) is logged; it is already serialised, so
+                # a large prompt is never re-serialised just to be cut off.
+                # Operators can opt into a pretty-printed copy with
+                # ``pretty_request_logs`` or turn body logging off with
+                # ``"log_level": "minimal"``.
+                minimal_logs = config.get("log_level") == "minimal"
+                if minimal_logs:
+                    req_log = b"[omitted]"
+                else:
+                    req_log = upstream_body
+                    if config.get("pretty_request_logs"):
                         try:
-                            text = re.sub(pat, "[REDACTED]", text, flags=re.IGNORECASE)
+                            req_log = _dumps(payload, indent=True)
                         except Exception:
-                            pass
-                    return text
-                req_log = _redact(req_log)
-                initial_log = f"=== REQUEST ===\n{req_log}\n\n"
-                log_file_path = log_manager.write_log(run_id, initial_log)
-                db.add_run(run_id, provider, model or "", start_time, log_file_path)
+                            req_log = str(payload).encode("utf-8", "replace")
+                    truncated = len(req_log) > REQUEST_LOG_LIMIT
+                    # Redact potential sensitive values before logging
+                    req_log = _redact(req_log[:REQUEST_LOG_LIMIT])
+                    if truncated:
+                        req_log += b"... [truncated]"
+                # Written as parts with one writev call, without
+                # joining them on the request thread
+                initial_log = (b"=== REQUEST ===\n", req_log, b"\n\n")
+                log_file_path = log_manager.log_path(run_id)
+                outer._submit_io(log_manager.write_log, run_id, initial_log)
+                outer._submit_io(db.add_run, run_id, provider, model or "", start_time, log_file_path)
                 # Record first event: request received
                 try:
                     db.add_event(run_id, start_time, "request_received", self.path)
                     # Publish event to in-memory bus for UI
-                    if event_bus is not None:
-                        event_bus.publish_event(run_id, "request_received", self.path, start_time)
+                    outer._publish(run_id, start_time, "request_received", self.path)
                 except Exception:
                     pass
                 # Forward to provider (handle chat, embeddings, models)
-                tokens_in = tokens_out = prompt_tokens = completion_tokens = total_tokens = None
+                ex = _Exchange(run_id, path, target_url, headers, upstream_body, config)
+                for prefix, route in _ROUTES:
+                    if path.startswith(prefix):
+                        break
+                else:
+                    # Chat completions or other POST endpoints
+                    route = "_handle_chat_stream" if stream_requested else "_handle_chat_sync"
                 error_message = None
-                response_status = 500
-                end_time = start_time
-                response_body_for_log = ""
+                # Bulkhead: wait for a slot while this provider holds its
+                # share of the worker pool, and give up after a while.
+                slot = outer._provider_slot(provider)
+                acquired = slot.acquire(timeout=PROVIDER_SLOT_TIMEOUT)
                 try:
-                    # Generic event: request sent
-                    try:
-                        ts_rs = time.time()
-                        db.add_event(run_id, ts_rs, "request_sent", target_url)
-                        if event_bus is not None:
-                            event_bus.publish_event(run_id, "request_sent", target_url, ts_rs)
-                    except Exception:
-                        pass
-                    # Determine if this is a models list request (no JSON body required)
-                    if path.startswith("/v1/models"):
-                        # Simple GET forward
-                        resp = requests.get(target_url, headers=headers)
-                        response_status = resp.status_code
-                        # Write response
-                        self._set_headers(response_status)
+                    if not acquired:
+                        ex.status = 503
+                        error_message = "provider busy"
+                        self._set_headers(503)
                         try:
-                            self.wfile.write(resp.content)
-                            if len(response_body_for_log) < 20000:
-                                response_body_for_log += resp.text
+                            self.wfile.write(b'{"error": "provider busy"}')
                         except BrokenPipeError:
                             pass
-                        end_time = time.time()
-                    elif path.startswith("/v1/embeddings"):
-                        # Embeddings endpoint
-                        resp = requests.post(target_url, headers=headers, json=payload)
-                        response_status = resp.status_code
-                        # Extract usage tokens if present
-                        if resp.status_code < 500:
-                            try:
-                                resp_json = resp.json()
-                                usage = resp_json.get("usage", {})
-                                prompt_tokens = usage.get("prompt_tokens")
-                                completion_tokens = usage.get("completion_tokens")
-                                total_tokens = usage.get("total_tokens")
-                                tokens_in = prompt_tokens
-                                tokens_out = completion_tokens
-                            except Exception:
-                                pass
-                        # Write response
-                        self._set_headers(response_status)
+                    else:
+                        # Generic event: request sent
                         try:
-                            self.wfile.write(resp.content)
-                            if len(response_body_for_log) < 20000:
-                                response_body_for_log += resp.text
-                            # Emit first_token event (embeddings returns full response at once)
-                            try:
-                                ts_ft = time.time()
-                                db.add_event(run_id, ts_ft, "first_token")
-                                if event_bus is not None:
-                                    event_bus.publish_event(run_id, "first_token", None, ts_ft)
-                            except Exception:
-                                pass
-                        except BrokenPipeError:
+                            ts_rs = self._now()
+                            db.add_event(run_id, ts_rs, "request_sent", target_url)
+                            outer._publish(run_id, ts_rs, "request_sent", target_url)
+                        except Exception:
                             pass
-                        end_time = time.time()
-                    else:
-                        # Chat completions or other POST endpoints
-                        if stream_requested:
-                            resp = requests.post(target_url, headers=headers, json=payload, stream=True)
-                            response_status = resp.status_code
-                            self._set_headers(response_status)
-                            first_token_recorded = False
-                            for chunk in resp.iter_content(chunk_size=1024):
-                                if not chunk:
-                                    continue
-                                try:
-                                    self.wfile.write(chunk)
-                                    self.wfile.flush()
-                                    # Limit accumulation
-                                    if len(response_body_for_log) < 20000:
-                                        response_body_for_log += chunk.decode("utf-8", errors="replace")
-                                    # Record token chunk event (truncate details)
-                                    try:
-                                        token_text = chunk.decode("utf-8", errors="replace")
-                                        trimmed = token_text[:100]
-                                        # Record token chunk event
-                                        ts_tc = time.time()
-                                        db.add_event(run_id, ts_tc, "token_chunk", trimmed)
-                                        if event_bus is not None:
-                                            event_bus.publish_event(run_id, "token_chunk", trimmed, ts_tc)
-                                    except Exception:
-                                        pass
-                                    # Record first token event
-                                    if not first_token_recorded:
-                                        try:
-                                            ts_ft2 = time.time()
-                                            db.add_event(run_id, ts_ft2, "first_token")
-                                            if event_bus is not None:
-                                                event_bus.publish_event(run_id, "first_token", None, ts_ft2)
-                                        except Exception:
-                                            pass
-                                        first_token_recorded = True
-                                except BrokenPipeError:
-                                    break
-                            # Record stream finished event
-                            try:
-                                ts_sf = time.time()
-                                db.add_event(run_id, ts_sf, "stream_finished")
-                                if event_bus is not None:
-                                    event_bus.publish_event(run_id, "stream_finished", None, ts_sf)
-                            except Exception:
-                                pass
-                            # Try to extract usage from headers
-                            try:
-                                usage = resp.headers.get("OpenAI-Usage")
-                                if usage:
-                                    usage_data = json.loads(usage)
-                                    prompt_tokens = usage_data.get("prompt_tokens")
-                                    completion_tokens = usage_data.get("completion_tokens")
-                                    total_tokens = usage_data.get("total_tokens")
-                                    tokens_in = prompt_tokens
-                                    tokens_out = completion_tokens
-                            except Exception:
-                                pass
-                            end_time = time.time()
-                        else:
-                            resp = requests.post(target_url, headers=headers, json=payload)
-                            response_status = resp.status_code
-                            # Extract usage tokens if present
-                            if resp.status_code < 500:
-                                try:
-                                    resp_json = resp.json()
-                                    usage = resp_json.get("usage", {})
-                                    prompt_tokens = usage.get("prompt_tokens")
-                                    completion_tokens = usage.get("completion_tokens")
-                                    total_tokens = usage.get("total_tokens")
-                                    tokens_in = prompt_tokens
-                                    tokens_out = completion_tokens
-                                except Exception:
-                                    pass
-                            self._set_headers(response_status)
-                            try:
-                                self.wfile.write(resp.content)
-                                if len(response_body_for_log) < 20000:
-                                    response_body_for_log += resp.text
-                                # Record first token/event for non-stream
-                                try:
-                                    ts_ft3 = time.time()
-                                    db.add_event(run_id, ts_ft3, "first_token")
-                                    if event_bus is not None:
-                                        event_bus.publish_event(run_id, "first_token", None, ts_ft3)
-                                except Exception:
-                                    pass
-                            except BrokenPipeError:
-                                pass
-                            end_time = time.time()
-                    # End of try block
+                        getattr(self, route)(ex)
+                    end_time = self._now()
                 except Exception as exc:
                     error_message = str(exc)
-                    end_time = time.time()
+                    end_time = self._now()
                     self._set_headers(500)
                     try:
-                        self.wfile.write(json.dumps({"error": str(exc)}).encode("utf-8"))
+                        self.wfile.write(_dumps({"error": str(exc)}))
                     except BrokenPipeError:
                         pass
                     # Record error event
@@ -352,38 +933,30 @@ class ProxyServer(threading.Thread):
                         db.add_event(run_id, end_time, "error", str(exc))
                     except Exception:
                         pass
+                finally:
+                    if acquired:
+                        slot.release()
+                response_status = ex.status
                 # Append response to log.  Truncate long responses for safety.
-                if response_body_for_log:
-                    # Limit to 20000 characters
-                    resp_log = response_body_for_log
-                    if len(resp_log) > 20000:
-                        resp_log = resp_log[:20000] + "... [truncated]"
-                    # Redact sensitive values before writing the response log
-                    def _redact(text: str) -> str:
-                        patterns = [
-                            r"sk-[a-zA-Z0-9]{20,}",
-                            r"Bearer [A-Za-z0-9\-_=]+",
-                            r"api_key"\s*:\s*"[^"]+",
-                        ]
-                        for pat in patterns:
-                            try:
-                                text = re.sub(pat, "[REDACTED]", text, flags=re.IGNORECASE)
-                            except Exception:
-                                pass
-                        return text
-                    resp_log = _redact(resp_log)
-                    final_log = f"=== RESPONSE ===\n{resp_log}\n\n"
-                    log_manager.write_log(run_id, final_log)
+                if ex.log_head and not minimal_logs:
+                    # Limit to RESPONSE_LOG_LIMIT bytes; redact sensitive
+                    # values before writing the response log
+                    resp_log = _redact(ex.log_head[:RESPONSE_LOG_LIMIT])
+                    truncated = b"... [truncated]" if len(ex.log_head) > RESPONSE_LOG_LIMIT else b""
+                    final_log = (b"=== RESPONSE ===\n", resp_log, truncated, b"\n\n")
+                    outer._submit_io(log_manager.write_log, run_id, final_log)
                 # Update run in DB
-                db.update_run(
+                usage = ex.usage
+                outer._submit_io(
+                    db.update_run,
                     run_id,
                     end_time=end_time,
                     status="success" if error_message is None and response_status < 500 else "error",
-                    tokens_in=tokens_in,
-                    tokens_out=tokens_out,
-                    prompt_tokens=prompt_tokens,
-                    completion_tokens=completion_tokens,
-                    total_tokens=total_tokens,
+                    tokens_in=usage.get("prompt_tokens"),
+                    tokens_out=usage.get("completion_tokens"),
+                    prompt_tokens=usage.get("prompt_tokens"),
+                    completion_tokens=usage.get("completion_tokens"),
+                    total_tokens=usage.get("total_tokens"),
                     error_message=error_message,
                 )
                 # Record finish event
@@ -391,41 +964,40 @@ class ProxyServer(threading.Thread):
                     db.add_event(run_id, end_time, "request_finished", str(response_status))
                 except Exception:
                     pass
-                # Circuit breaker: update error count and cooldown.  If the
-                # response indicates a server-side error (>= 500) or an
-                # exception occurred, increment the error counter.  On
-                # success reset the counter.  When the counter exceeds
-                # the threshold, activate the breaker for a cooldown
-                # period to prevent hammering the provider during
-                # outages.  Both the threshold and cooldown duration
-                # could be configurable in future via config.
-                try:
-                    is_err = (error_message is not None) or (response_status >= 500)
-                    if is_err:
-                        outer._error_count += 1
-                    else:
-                        outer._error_count = 0
-                    # If error count reaches 5 consecutive errors, trip the breaker
-                    # for 30 seconds.  Reset error count after tripping.
-                    if outer._error_count >= 5:
-                        outer._breaker_until = time.time() + 30.0
-                        outer._error_count = 0
-                except Exception:
-                    pass
+                # Circuit breaker: a server-side error (>= 500) or an
+                # exception counts as a failure, anything else resets the
+                # counter.  Bulkhead rejections never reached the provider
+                # and are not counted.
+                if acquired:
+                    outer._breaker_record(error_message is None and response_status < 500, probe)
+                else:
+                    outer._breaker_record(None, probe)
 
             # Silence default logging from BaseHTTPRequestHandler
             def log_message(self, format: str, *args: str) -> None:
                 return
 
         # Create and start server
-        self.server = ThreadedHTTPServer((self.host, self.port), Handler)
+        self.server = PooledHTTPServer((self.host, self.port), Handler, workers)
         try:
             self.server.serve_forever()
         except Exception:
             # Server terminated
             pass
+        finally:
+            self.server.server_close()
 
     def shutdown(self) -> None:
         """Shut down the proxy server."""
         if self.server:
             self.server.shutdown()
+        # Let the I/O worker finish the writes queued so far
+        self._io_queue.put(None)
+        self._io_thread.join(timeout=10.0)
+        # Deliver the events still in the ring
+        self._publisher_stop.set()
+        self._publisher_thread.join(timeout=10.0)
+        try:
+            self._session.close()
+        except Exception:
+            pass
@@ -13,32 +13,100 @@ immediately.
 
 from __future__ import annotations
 
+import codecs
 import json
 import os
+import queue
 import threading
 import time
+import types
 from datetime import datetime
-from functools import partial
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 import tkinter as tk
 from tkinter import messagebox
 from tkinter import ttk
 
+# Period of the UI refresh loop in milliseconds.  Only the visible tab
+# is refreshed; the history and stats tabs every ``HISTORY_EVERY`` and
+# ``STATS_EVERY`` ticks respectively, since they read many rows.
+REFRESH_INTERVAL_MS = 2000
+HISTORY_EVERY = 3
+STATS_EVERY = 15
+
+# Characters and lines kept in the live log view; older text is
+# trimmed as new output is appended.
+LIVE_LOG_MAX_CHARS = 200000
+LIVE_LOG_MAX_LINES = 5000
+
+# Options for read-only log views: no undo stack is kept for text that
+# is only ever inserted programmatically.
+LOG_TEXT_OPTIONS = {"undo": False, "maxundo": 0, "autoseparators": False}
+
+# Interval in milliseconds at which log data read by the background
+# reader is applied to the live view.
+LIVE_DRAIN_MS = 50
+
+# Characters read from a log file and inserted into a view at a time.
+LOG_READ_CHUNK = 256 * 1024
+
+# Delay in milliseconds used to coalesce bursts of UI events (provider
+# changes, "Mostrar todo" toggles) into a single update.
+DEBOUNCE_MS = 50
+
+# Seconds a run listing fetched for the history tab is reused, e.g. by
+# an export right after a refresh.
+RUNS_CACHE_TTL = 2.0
+
+# Inserting more than this many history rows at once (first load,
+# "Mostrar todo") hides the Treeview columns during the insert, so the
+# geometry is computed once at the end rather than per row.
+HISTORY_BULK_INSERT = 50
+
+
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
 
 def _human_bytes(n: int) -> str:
     """Return a human readable representation of a byte count."""
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if n < 1024.0:
-            return f"{n:3.1f} {unit}"
-        n /= 1024.0
-    return f"{n:.1f} PB"
+    n = int(n)
+    # Each unit spans 10 bits; pick it from the bit length in one step
+    i = min(max(n.bit_length() - 1, 0) // 10, len(_BYTE_UNITS) - 1)
+    return f"{n / (1 << (10 * i)):.1f} {_BYTE_UNITS[i]}"
+
+# Providers and their models offered in the selectors (could be fetched
+# from the API).  Immutable, so every load shares the same objects and
+# the model combobox can compare value tuples by identity.
+_PROVIDERS = ("openai", "anthropic", "gemini")
+_MODELS_MAP = types.MappingProxyType({
+    "openai": (
+        "gpt-3.5-turbo",
+        "gpt-3.5-turbo-0125",
+        "gpt-3.5-turbo-1106",
+        "gpt-4",
+        "gpt-4-turbo",
+        "text-embedding-ada-002",
+    ),
+    "anthropic": ("claude-3-sonnet", "claude-3-haiku", "claude-3-opus"),
+    "gemini": ("gemini-pro", "gemini-vision-pro"),
+})
+
+
+@lru_cache(maxsize=4096)
+def _fmt_ts(ts: int) -> str:
+    """Format a Unix timestamp (whole seconds) for the history views."""
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
 
 
 class MainWindow:
     """Top level GUI for the control panel."""
 
+    # Scaled header images keyed by (icon path, Tk interpreter), shared
+    # by every window created in the same interpreter; see _header_image
+    _icon_cache: Dict[tuple, tk.PhotoImage] = {}
+
     def __init__(
         self,
         root: tk.Tk,
@@ -61,6 +129,13 @@ class MainWindow:
         self.update_config_callback = update_config_callback
         self.integration_helper = integration_helper
         self.icon_path = icon_path
+        # Parsed config file and the mtime it was read at; see _read_cfg
+        self._cfg_cache: Optional[dict] = None
+        self._cfg_mtime: int = -1
+        # Last run listing as (monotonic time, show_all, rows); see _list_runs
+        self._runs_cache: Optional[tuple] = None
+        # Pending ``root.after`` ids of debounced callbacks; see _debounce
+        self._pending_after: Dict[str, str] = {}
         # Load current config to populate UI
         self._load_config()
         # Build UI
@@ -68,32 +143,32 @@ class MainWindow:
         # Periodic updates for stats and history
         self._schedule_periodic_updates()
 
+    def _read_cfg(self) -> dict:
+        """Return the parsed config file, re-reading it only when its mtime changes.
+
+        The returned dict is the cached object itself and must not be
+        mutated.
+        """
+        mtime = self.config_path.stat().st_mtime_ns
+        if self._cfg_cache is None or mtime != self._cfg_mtime:
+            with open(self.config_path, "r", encoding="utf-8") as f:
+                self._cfg_cache = json.load(f)
+            self._cfg_mtime = mtime
+        return self._cfg_cache
+
     def _load_config(self) -> None:
         """Load configuration from file into local variables."""
         if self.config_path.exists():
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                cfg = json.load(f)
+            cfg = self._read_cfg()
             self.current_provider = cfg.get("provider", "openai")
             self.current_model = cfg.get("model", "")
-            # Predefine provider->models map (could be fetched from API)
-            self.available_providers = ["openai", "anthropic", "gemini"]
-            self.available_models_map = {
-                "openai": [
-                    "gpt-3.5-turbo",
-                    "gpt-3.5-turbo-0125",
-                    "gpt-3.5-turbo-1106",
-                    "gpt-4",
-                    "gpt-4-turbo",
-                    "text-embedding-ada-002"
-                ],
-                "anthropic": ["claude-3-sonnet", "claude-3-haiku", "claude-3-opus"],
-                "gemini": ["gemini-pro", "gemini-vision-pro"]
-            }
+            self.available_providers = _PROVIDERS
+            self.available_models_map = _MODELS_MAP
         else:
             self.current_provider = "openai"
             self.current_model = "gpt-3.5-turbo"
-            self.available_providers = ["openai"]
-            self.available_models_map = {"openai": [self.current_model]}
+            self.available_providers = ("openai",)
+            self.available_models_map = {"openai": (self.current_model,)}
 
     def _create_widgets(self) -> None:
         """Create all widgets in the main window."""
@@ -123,15 +198,8 @@ class MainWindow:
         header.pack(fill=tk.X)
         if self.icon_path:
             try:
-                img = tk.PhotoImage(file=self.icon_path)
-                # Resize image to 48px height for header if larger
-                # Determine subsample factor
-                h = img.height()
-                factor = max(h // 48, 1)
-                img_small = img.subsample(factor, factor)
-                # Keep references to avoid GC
-                self._header_img_orig = img
-                self._header_img = img_small
+                # Keep a reference to avoid GC
+                self._header_img = self._header_image()
                 icon_label = ttk.Label(header, image=self._header_img)
                 icon_label.pack(side=tk.LEFT, padx=(0, 8))
             except Exception:
@@ -156,11 +224,13 @@ class MainWindow:
         self.model_combo = ttk.Combobox(
             top_frame,
             textvariable=self.model_var,
-            values=self.available_models_map.get(self.current_provider, []),
+            values=self.available_models_map.get(self.current_provider, ()),
             state="readonly",
             width=30,
         )
         self.model_combo.pack(side=tk.LEFT, padx=5)
+        # Values currently assigned to the model combobox
+        self._current_model_values: tuple = self.available_models_map.get(self.current_provider, ())
 
         self.apply_button = ttk.Button(top_frame, text="Aplicar", command=self._apply_provider_model)
         self.apply_button.pack(side=tk.LEFT, padx=10)
@@ -168,8 +238,12 @@ class MainWindow:
         # Notebook for tabs
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        # Builders of the tabs whose contents have not been created yet,
+        # keyed by frame; each runs the first time its tab is selected
+        self._pending_tabs: Dict[str, callable] = {}
 
-        # Live tab
+        # Live tab (shown first, so built immediately)
         self.live_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.live_frame, text="En vivo")
         self._build_live_tab(self.live_frame)
@@ -177,30 +251,70 @@ class MainWindow:
         # History tab
         self.history_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.history_frame, text="Historial")
-        self._build_history_tab(self.history_frame)
+        self._pending_tabs[str(self.history_frame)] = self._build_history_tab
 
         # Permissions tab
         self.permissions_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.permissions_frame, text="Permisos")
-        self._build_permissions_tab(self.permissions_frame)
+        self._pending_tabs[str(self.permissions_frame)] = self._build_permissions_tab
 
         # Stats tab
         self.stats_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.stats_frame, text="Estadísticas")
-        self._build_stats_tab(self.stats_frame)
+        self._pending_tabs[str(self.stats_frame)] = self._build_stats_tab
 
         # Integration tab, if helper provided
         if self.integration_helper is not None:
             self.integration_frame = ttk.Frame(self.notebook)
             self.notebook.add(self.integration_frame, text="Integración")
-            self._build_integration_tab(self.integration_frame)
+            self._pending_tabs[str(self.integration_frame)] = self._build_integration_tab
+
+    def _on_tab_changed(self, event: tk.Event) -> None:
+        """Build the selected tab on first use and refresh it right away."""
+        current = self.notebook.select()
+        build = self._pending_tabs.pop(current, None)
+        if build is not None:
+            build(self.notebook.nametowidget(current))
+        # Refresh a tab as soon as it is shown, not on the next tick
+        self._refresh_visible_tab()
+
+    def _debounce(self, key: str, func: callable) -> None:
+        """Run ``func`` once, ``DEBOUNCE_MS`` after the last call with the same ``key``."""
+        pending = self._pending_after.pop(key, None)
+        if pending is not None:
+            self.root.after_cancel(pending)
+
+        def run():
+            self._pending_after.pop(key, None)
+            func()
+        self._pending_after[key] = self.root.after(DEBOUNCE_MS, run)
+
+    def _header_image(self) -> tk.PhotoImage:
+        """Return the header icon scaled to at most about 48px high, decoding it once."""
+        key = (self.icon_path, self.root.tk)
+        img = MainWindow._icon_cache.get(key)
+        if img is None:
+            full = tk.PhotoImage(file=self.icon_path)
+            # Resize image to 48px height for header if larger
+            # Determine subsample factor
+            factor = max(full.height() // 48, 1)
+            img = full.subsample(factor, factor)
+            MainWindow._icon_cache[key] = img
+        return img
 
     # Provider/model selection handlers
     def _on_provider_changed(self, event: tk.Event) -> None:
-        """Update model list when provider selection changes."""
+        """Schedule a model list update; rapid changes are coalesced."""
+        self._debounce("provider", self._do_provider_changed)
+
+    def _do_provider_changed(self) -> None:
+        """Update model list for the selected provider."""
         provider = self.provider_var.get()
-        models = self.available_models_map.get(provider, [])
+        models = self.available_models_map.get(provider, ())
+        if models is self._current_model_values:
+            return
         self.model_combo["values"] = models
+        self._current_model_values = models
         # If current model not in list, reset to first
         if self.model_var.get() not in models:
             self.model_var.set(models[0] if models else "")
@@ -211,12 +325,17 @@ class MainWindow:
         model = self.model_var.get()
         # Write to config
         try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                cfg = json.load(f)
+            # Copy of the cached parse, so a failed write leaves the cache intact
+            cfg = dict(self._read_cfg())
             cfg["provider"] = provider
             cfg["model"] = model
-            with open(self.config_path, "w", encoding="utf-8") as f:
-                json.dump(cfg, f, indent=2)
+            # Write to a temporary file and rename it over the config so a
+            # crash mid-write cannot leave a truncated file behind.
+            tmp_path = self.config_path.with_suffix(self.config_path.suffix + ".tmp")
+            tmp_path.write_text(json.dumps(cfg, indent=2), encoding="utf-8")
+            os.replace(tmp_path, self.config_path)
+            self._cfg_cache = cfg
+            self._cfg_mtime = self.config_path.stat().st_mtime_ns
             # update runtime config via callback
             self.update_config_callback()
             messagebox.showinfo("Configuración aplicada", f"Proveedor: {provider}\nModelo: {model}")
@@ -229,7 +348,9 @@ class MainWindow:
         controls_frame = ttk.Frame(frame, padding=5)
         controls_frame.pack(fill=tk.X)
         ttk.Button(controls_frame, text="Actualizar", command=self._refresh_live_log).pack(side=tk.LEFT)
-        self.live_log_text = tk.Text(frame, wrap=tk.NONE, height=20, bg='#1e1e1e', fg='#f2f2f2', insertbackground='#f2f2f2')
+        self.live_log_text = tk.Text(
+            frame, wrap=tk.NONE, height=20, bg='#1e1e1e', fg='#f2f2f2', insertbackground='#f2f2f2', **LOG_TEXT_OPTIONS
+        )
         # Add scrollbars
         yscroll = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.live_log_text.yview)
         xscroll = ttk.Scrollbar(frame, orient=tk.HORIZONTAL, command=self.live_log_text.xview)
@@ -240,6 +361,15 @@ class MainWindow:
         # Label for current run id and status
         self.live_run_label = ttk.Label(controls_frame, text="No hay ejecución en curso")
         self.live_run_label.pack(side=tk.LEFT, padx=10)
+        # File shown in the live view and how far it has been read.  Only
+        # the "live-log" reader thread touches it; see _read_live_log.
+        self._live_tail: Dict[str, object] = {"path": None, "ino": None, "pos": 0, "decoder": None}
+        # Log files to read (None forgets the current one) and the
+        # ``(kind, text)`` results for the Tk thread; see _live_log_worker
+        self._live_requests: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._live_results: "queue.Queue[tuple]" = queue.Queue()
+        threading.Thread(target=self._live_log_worker, name="live-log", daemon=True).start()
+        self.root.after(LIVE_DRAIN_MS, self._drain_live_results)
 
     def _refresh_live_log(self) -> None:
         """Refresh the live log view with the most recent run's log."""
@@ -247,20 +377,87 @@ class MainWindow:
         if not runs:
             self.live_run_label.config(text="No hay ejecuciones recientes")
             self.live_log_text.delete("1.0", tk.END)
+            self._live_requests.put(None)
             return
         run = runs[0]
         run_id = run["id"]
         status = run["status"]
         self.live_run_label.config(text=f"Run {run_id[:8]}... estado: {status}")
-        # Read log file if exists
-        log_file = run["log_file"]
+        # The log file is read by the background reader; the result is
+        # applied by _drain_live_results
+        self._live_requests.put(run["log_file"])
+
+    def _live_log_worker(self) -> None:
+        """Read live log updates off the Tk thread, keeping only the latest request."""
+        pending = self._live_requests
+        while True:
+            log_file = pending.get()
+            try:
+                while True:
+                    log_file = pending.get_nowait()
+            except queue.Empty:
+                pass
+            if log_file is None:
+                self._live_tail["path"] = None
+                continue
+            try:
+                result = self._read_live_log(log_file)
+            except Exception:
+                self._live_tail["path"] = None
+                result = ("error", "No se pudo leer el archivo de log")
+            if result is not None:
+                self._live_results.put(result)
+
+    def _read_live_log(self, log_file: str) -> Optional[tuple]:
+        """Return what changed in ``log_file`` since the last call, or None.
+
+        Returns ``("append", text)`` with the data written since the last
+        read, or ``("reset", text)`` when the view must be reloaded: the
+        run's log changed, the file was replaced or truncated, or only a
+        compressed copy exists (compressed logs are complete, so they are
+        read once).  Runs on the reader thread; no Tk calls are made.
+        """
+        tail = self._live_tail
+        if not log_file or not os.path.exists(log_file):
+            if tail["path"] == log_file and tail["ino"] is None:
+                return None
+            data = "".join(self._iter_log_file(log_file))
+            tail.update(path=log_file, ino=None, pos=0, decoder=None)
+            return ("reset", data[-LIVE_LOG_MAX_CHARS:])
+        st = os.stat(log_file)
+        kind = "append"
+        if tail["path"] != log_file or tail["ino"] != st.st_ino or st.st_size < tail["pos"]:
+            kind = "reset"
+            tail.update(
+                path=log_file,
+                ino=st.st_ino,
+                pos=0,
+                decoder=codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            )
+        if st.st_size == tail["pos"] and kind == "append":
+            return None
+        with open(log_file, "rb") as f:
+            f.seek(tail["pos"])
+            data = f.read()
+            tail["pos"] = f.tell()
+        return (kind, tail["decoder"].decode(data)[-LIVE_LOG_MAX_CHARS:])
+
+    def _drain_live_results(self) -> None:
+        """Apply log data from the reader thread to the live view (Tk thread)."""
+        text = self.live_log_text
         try:
-            data = self._read_log_file(log_file)
-            self.live_log_text.delete("1.0", tk.END)
-            self.live_log_text.insert(tk.END, data)
-        except Exception:
-            self.live_log_text.delete("1.0", tk.END)
-            self.live_log_text.insert(tk.END, "No se pudo leer el archivo de log")
+            while True:
+                kind, data = self._live_results.get_nowait()
+                if kind != "append":
+                    text.delete("1.0", tk.END)
+                text.insert(tk.END, data)
+                # Keep only the last LIVE_LOG_MAX_CHARS characters and
+                # LIVE_LOG_MAX_LINES lines
+                text.delete("1.0", f"end-{LIVE_LOG_MAX_CHARS}c")
+                text.delete("1.0", f"end-{LIVE_LOG_MAX_LINES}lines")
+        except queue.Empty:
+            pass
+        self.root.after(LIVE_DRAIN_MS, self._drain_live_results)
 
     # History tab
     def _build_history_tab(self, frame: ttk.Frame) -> None:
@@ -272,7 +469,7 @@ class MainWindow:
             controls_frame,
             text="Mostrar todo",
             variable=self.show_all_var,
-            command=self._refresh_history,
+            command=lambda: self._debounce("history", self._refresh_history),
         ).pack(side=tk.LEFT, padx=10)
         ttk.Button(controls_frame, text="Exportar CSV", command=self._export_history_csv).pack(side=tk.LEFT, padx=5)
 
@@ -290,53 +487,92 @@ class MainWindow:
         self.history_tree.configure(yscrollcommand=vscroll.set)
         vscroll.pack(side=tk.RIGHT, fill=tk.Y)
         self.history_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        # Rows currently shown (iid -> values) and the mode they were
+        # loaded with; see _refresh_history
+        self._history_seen: Dict[str, tuple] = {}
+        self._history_show_all: Optional[bool] = None
         # Bind double click to open log
         self.history_tree.bind("<Double-1>", self._on_history_double_click)
 
     def _export_history_csv(self) -> None:
         """Export the current history view to a CSV file."""
         import csv
-        if self.show_all_var.get():
-            runs = self.db.get_all_runs()
-        else:
-            runs = self.db.get_recent_runs(limit=100)
         export_path = Path(self.config_path).parent / "history_export.csv"
         try:
-            with open(export_path, "w", newline="", encoding="utf-8") as f:
+            # Rows are streamed from the database and written through a
+            # large buffer, so the full history is never held in memory
+            show_all = bool(self.show_all_var.get())
+            runs = self._list_runs(show_all, fetch=False)
+            if runs is None:
+                runs = self.db.iter_all_runs() if show_all else self._list_runs(False)
+            with open(export_path, "w", buffering=1 << 20, newline="", encoding="utf-8") as f:
                 writer = csv.writer(f)
                 writer.writerow(["id", "start_time", "provider", "model", "status", "log_file"])
                 for r in runs:
-                    dt = datetime.fromtimestamp(r["start_time"]).strftime("%Y-%m-%d %H:%M:%S")
-                    writer.writerow([
-                        r["id"],
-                        dt,
-                        r["provider"],
-                        r["model"],
-                        r["status"],
-                        r["log_file"],
-                    ])
+                    # Attribute access on the row namedtuples avoids the
+                    # by-name lookup of ``r["col"]``
+                    ts = r.start_time
+                    dt = _fmt_ts(int(ts)) if ts is not None else ""
+                    writer.writerow((r.id, dt, r.provider, r.model, r.status, r.log_file))
             messagebox.showinfo("Exportación", f"Historial exportado a {export_path}")
         except Exception as exc:
             messagebox.showerror("Error", f"No se pudo exportar: {exc}")
 
+    def _list_runs(self, show_all: bool, fetch: bool = True) -> Optional[list]:
+        """Return the history listing, reusing one fetched in the last ``RUNS_CACHE_TTL`` seconds.
+
+        With ``fetch`` false, returns None instead of querying when there
+        is no fresh listing.
+        """
+        now = time.monotonic()
+        cached = self._runs_cache
+        if cached is not None and cached[1] == show_all and now - cached[0] < RUNS_CACHE_TTL:
+            return cached[2]
+        if not fetch:
+            return None
+        runs = self.db.get_all_runs() if show_all else self.db.get_recent_runs(limit=100)
+        self._runs_cache = (now, show_all, runs)
+        return runs
+
     def _refresh_history(self) -> None:
-        """Reload the history list from the database."""
-        self.history_tree.delete(*self.history_tree.get_children())
-        if self.show_all_var.get():
-            runs = self.db.get_all_runs()
-        else:
-            runs = self.db.get_recent_runs(limit=100)
-        for row in runs:
+        """Reload the history list from the database.
+
+        Only rows that are new, changed or gone are touched in the
+        Treeview, so a refresh with no new runs costs no widget calls.
+        """
+        tree = self.history_tree
+        seen = self._history_seen
+        show_all = bool(self.show_all_var.get())
+        if show_all != self._history_show_all:
+            tree.delete(*tree.get_children())
+            seen.clear()
+            self._history_show_all = show_all
+        runs = self._list_runs(show_all)
+        current = set()
+        bulk = sum(1 for row in runs if row.id not in seen) > HISTORY_BULK_INSERT
+        if bulk:
+            shown_columns = tree.cget("displaycolumns")
+            tree.configure(displaycolumns=())
+        # Rows come newest first, so a new run is inserted at its index
+        for index, row in enumerate(runs):
+            iid = row.id
+            current.add(iid)
             # Convert start_time to readable format
-            ts = row["start_time"]
-            dt = datetime.fromtimestamp(ts)
-            ts_str = dt.strftime("%Y-%m-%d %H:%M:%S")
-            self.history_tree.insert(
-                "",
-                tk.END,
-                iid=row["id"],
-                values=(ts_str, row["provider"], row["model"], row["status"]),
-            )
+            values = (_fmt_ts(int(row.start_time)), row.provider, row.model, row.status)
+            old = seen.get(iid)
+            if old is None:
+                tree.insert("", index, iid=iid, values=values)
+            elif old != values:
+                tree.item(iid, values=values)
+            seen[iid] = values
+        if bulk:
+            tree.configure(displaycolumns=shown_columns)
+        # Drop runs that fell out of the listing
+        gone = [iid for iid in seen if iid not in current]
+        if gone:
+            tree.delete(*gone)
+            for iid in gone:
+                del seen[iid]
 
     def _on_history_double_click(self, event) -> None:
         """Open the log for the selected run in a new window."""
@@ -347,22 +583,22 @@ class MainWindow:
         if not run:
             return
         log_path = run["log_file"]
-        try:
-            data = self._read_log_file(log_path)
-        except Exception:
-            data = "No se pudo leer el log"
         # Create new window
         win = tk.Toplevel(self.root)
         win.title(f"Log de {item_id[:8]}")
-        text = tk.Text(win, wrap=tk.NONE, bg='#1e1e1e', fg='#f2f2f2', insertbackground='#f2f2f2')
+        text = tk.Text(win, wrap=tk.NONE, bg='#1e1e1e', fg='#f2f2f2', insertbackground='#f2f2f2', **LOG_TEXT_OPTIONS)
         text.pack(fill=tk.BOTH, expand=True)
-        text.insert(tk.END, data)
         # Add scrollbars
         yscroll = ttk.Scrollbar(win, orient=tk.VERTICAL, command=text.yview)
         xscroll = ttk.Scrollbar(win, orient=tk.HORIZONTAL, command=text.xview)
         text.configure(yscrollcommand=yscroll.set, xscrollcommand=xscroll.set)
         yscroll.pack(side=tk.RIGHT, fill=tk.Y)
         xscroll.pack(side=tk.BOTTOM, fill=tk.X)
+        try:
+            self._insert_log_file(text, log_path)
+        except Exception:
+            text.delete("1.0", tk.END)
+            text.insert(tk.END, "No se pudo leer el log")
 
     # Permissions tab
     def _build_permissions_tab(self, frame: ttk.Frame) -> None:
@@ -448,30 +684,17 @@ class MainWindow:
 
     def _refresh_stats(self) -> None:
         """Calculate and update statistics on the stats tab."""
-        # Total runs
-        all_runs = self.db.get_all_runs()
-        self.stats_vars["runs_total"].set(str(len(all_runs)))
-        # Runs last 24h
-        now = time.time()
-        runs_24h = [r for r in all_runs if r["start_time"] > now - 86400]
-        self.stats_vars["runs_last_24h"].set(str(len(runs_24h)))
-        # Errors
-        errors = [r for r in all_runs if r["status"] != "success"]
-        self.stats_vars["errors_total"].set(str(len(errors)))
-        # Average duration
-        durations = [r["end_time"] - r["start_time"] for r in all_runs if r["end_time"] and r["start_time"]]
-        if durations:
-            avg = sum(durations) / len(durations)
-            self.stats_vars["avg_duration"].set(f"{avg:.2f}")
+        # Run counts, average duration and tokens (in + out), aggregated
+        # by the database; the 24h window starts 86400 s ago
+        agg = self.db.get_run_stats(time.time() - 86400)
+        self.stats_vars["runs_total"].set(str(agg.runs_total))
+        self.stats_vars["runs_last_24h"].set(str(agg.runs_since))
+        self.stats_vars["errors_total"].set(str(agg.errors_total))
+        if agg.avg_duration is not None:
+            self.stats_vars["avg_duration"].set(f"{agg.avg_duration:.2f}")
         else:
             self.stats_vars["avg_duration"].set("-")
-        # Tokens total (in + out)
-        tokens = 0
-        for r in all_runs:
-            if r["tokens_in"]:
-                tokens += r["tokens_in"]
-            if r["tokens_out"]:
-                tokens += r["tokens_out"]
+        tokens = agg.tokens_total
         self.stats_vars["tokens_total"].set(str(tokens) if tokens else "-")
         # Log usage
         stats = self.log_manager.get_stats()
@@ -505,11 +728,17 @@ class MainWindow:
         instr_button = ttk.Button(frame, text="Mostrar instrucciones", command=self._toggle_instructions)
         instr_button.pack(pady=5)
         self.instructions_visible = False
-        self.instructions_text = tk.Text(frame, height=12, wrap=tk.WORD, bg='#1e1e1e', fg='#f2f2f2', insertbackground='#f2f2f2')
-        self.instructions_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        # The text is gridded inside its own container, so toggling it
+        # with grid()/grid_remove() only re-lays out that container
+        instr_frame = ttk.Frame(frame)
+        instr_frame.pack(fill=tk.BOTH, expand=True)
+        instr_frame.rowconfigure(0, weight=1)
+        instr_frame.columnconfigure(0, weight=1)
+        self.instructions_text = tk.Text(instr_frame, height=12, wrap=tk.WORD, bg='#1e1e1e', fg='#f2f2f2', insertbackground='#f2f2f2')
+        self.instructions_text.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
         self.instructions_text.insert(tk.END, self.integration_helper.get_integration_instructions(self.current_provider, self.integration_helper.proxy_port))
         self.instructions_text.configure(state=tk.DISABLED)
-        self.instructions_text.pack_forget()  # hidden by default
+        self.instructions_text.grid_remove()  # hidden by default
         # Immediately update status
         self._update_integration_status()
 
@@ -533,31 +762,71 @@ class MainWindow:
     def _toggle_instructions(self) -> None:
         """Show or hide the integration instructions text."""
         if self.instructions_visible:
-            self.instructions_text.pack_forget()
+            self.instructions_text.grid_remove()
             self.instructions_visible = False
         else:
-            self.instructions_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+            # grid() restores the options remembered by grid_remove()
+            self.instructions_text.grid()
             self.instructions_visible = True
 
-    # Helper to read plain or compressed log files
-    def _read_log_file(self, path: str) -> str:
-        """Return the contents of a log file, decompressing if gzipped."""
+    # Helpers to read plain or compressed log files
+    def _iter_log_file(self, path: str) -> Iterator[str]:
+        """Yield the contents of a log file in chunks, decompressing zstd or gzip logs."""
         if not path:
-            return ""
+            return
+        if not os.path.exists(path):
+            # The log may have been compressed since the run was recorded
+            for suffix in (".zst", ".gz"):
+                if os.path.exists(path + suffix):
+                    path += suffix
+                    break
+        if path.endswith(".zst"):
+            import zstandard
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            with open(path, "rb") as raw, zstandard.ZstdDecompressor().stream_reader(raw) as f:
+                while True:
+                    data = f.read(LOG_READ_CHUNK)
+                    if not data:
+                        break
+                    yield decoder.decode(data)
+                yield decoder.decode(b"", final=True)
+            return
         if path.endswith(".gz"):
             import gzip
-            with gzip.open(path, "rt", encoding="utf-8", errors="replace") as f:
-                return f.read()
+            f = gzip.open(path, "rt", encoding="utf-8", errors="replace")
         else:
-            with open(path, "r", encoding="utf-8", errors="replace") as f:
-                return f.read()
+            f = open(path, "r", encoding="utf-8", errors="replace")
+        with f:
+            while True:
+                data = f.read(LOG_READ_CHUNK)
+                if not data:
+                    break
+                yield data
+
+    def _insert_log_file(self, widget: tk.Text, path: str) -> None:
+        """Append a log file to ``widget`` chunk by chunk, redrawing between chunks."""
+        for chunk in self._iter_log_file(path):
+            widget.insert(tk.END, chunk)
+            self.root.update_idletasks()
 
     # Periodic update scheduling
+    def _refresh_visible_tab(self, tick: Optional[int] = None) -> None:
+        """Refresh the selected tab; on a periodic ``tick``, only if that tab is due."""
+        current = self.notebook.select()
+        if current == str(self.live_frame):
+            self._refresh_live_log()
+        elif current == str(self.history_frame):
+            if tick is None or tick % HISTORY_EVERY == 0:
+                self._refresh_history()
+        elif current == str(self.stats_frame):
+            if tick is None or tick % STATS_EVERY == 0:
+                self._refresh_stats()
+
     def _schedule_periodic_updates(self) -> None:
+        self._tick = 0
+
         def update():
-            self._refresh_stats()
-            self._refresh_history()
-            self._refresh_live_log()
-            # Reschedule after 5 seconds
-            self.root.after(5000, update)
-        self.root.after(5000, update)
+            self._tick += 1
+            self._refresh_visible_tab(self._tick)
+            self.root.after(REFRESH_INTERVAL_MS, update)
+        self.root.after(REFRESH_INTERVAL_MS, update)
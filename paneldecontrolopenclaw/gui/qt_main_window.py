@@ -22,17 +22,24 @@ directory.
 
 from __future__ import annotations
 
-import json
+import codecs
+import csv
+import gzip
+import hashlib
 import os
+import socket
 import time
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable, Optional, Dict
+from typing import Callable, Optional, Dict, List, Sequence
 
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QIcon, QFont, QPalette, QColor, QPainter
+from PySide6.QtCore import QFileSystemWatcher, QRunnable, QSignalBlocker, QThreadPool, Qt, QTimer, QUrl, Signal
+from PySide6.QtGui import QIcon, QFont, QPalette, QColor, QPainter, QPixmap, QTextCursor
 from PySide6.QtWidgets import (
     QApplication,
+    QButtonGroup,
     QCheckBox,
     QComboBox,
     QDialog,
@@ -51,27 +58,46 @@ from PySide6.QtWidgets import (
     QTableWidget,
     QTableWidgetItem,
     QTabWidget,
-    QTextEdit,
     QVBoxLayout,
     QWidget,
     QSplitter,
     QHeaderView,
 )
+from PySide6.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
 
 # Import the simple in-process event bus.  This allows the UI to
 # subscribe to events emitted by the proxy in real time.  If the
 # import fails (for example when running outside of the packaged
 # environment), event streaming will simply be disabled and the UI
-# will fall back to periodic refreshes.
+# will fall back to periodic refreshes.  Under main.py ``backend`` is
+# a top-level package and the relative import is not available.
 try:
-    from ..backend import event_bus  # type: ignore
+    try:
+        from ..backend import event_bus  # type: ignore
+    except ImportError:
+        from backend import event_bus  # type: ignore
 except Exception:
     event_bus = None  # type: ignore
 
+# JSON helpers shared with the backend for reading/writing config.json.
+# main.py runs with the package directory on sys.path, where the
+# relative import is not available.
+try:
+    from ..backend.config import config_file, load_json  # type: ignore
+except ImportError:
+    from backend.config import config_file, load_json  # type: ignore
+
+# Optional: zstandard, needed to read logs the log manager compressed
+# with zstd.  Without it such logs cannot be shown.
+try:
+    import zstandard as zstd  # type: ignore
+except ImportError:
+    zstd = None  # type: ignore
+
 # Import QtCharts for simple graphs
 try:
     from PySide6.QtCharts import QChart, QChartView, QLineSeries, QDateTimeAxis, QValueAxis
-    from PySide6.QtCore import QDateTime
+    from PySide6.QtCore import QDateTime, QPointF
     _QTCHARTS_AVAILABLE = True
 except Exception:
     # Charts unavailable if QtCharts is not present
@@ -81,23 +107,286 @@ import base64
 
 # Import encryption helpers
 try:
-    from ..backend import crypto_utils  # type: ignore
+    try:
+        from ..backend import crypto_utils  # type: ignore
+    except ImportError:
+        from backend import crypto_utils  # type: ignore
 except Exception:
     crypto_utils = None  # type: ignore
 
+# Time budget in milliseconds for appending live events in one go.  A
+# larger backlog is continued on the next event-loop iteration so a
+# burst of events cannot stall repaints.
+MAX_DRAIN_MS = 8
+
+# Delay in milliseconds after the last history search/filter change
+# before the table is refreshed, so typing triggers a single query.
+HISTORY_DEBOUNCE_MS = 200
+
+# Initial widths of the time and event columns of the timeline tables.
+# The columns are user-resizable and fitted to their contents once per
+# bulk load instead of on every inserted row.
+TIMELINE_COLUMN_WIDTHS = (90, 140)
+
+# Seconds a run listing fetched for the history tab is reused, e.g. by
+# the detail view or an export right after a refresh.
+RUNS_CACHE_TTL = 2.0
+
+# Seconds the provider and internet probe results of the stats tab are
+# reused before probing again.  The local proxy probe runs every time.
+HEALTH_PROBE_TTL = 30.0
+
+# Number of lines kept in the live log view.  New output is appended
+# to the view and the oldest lines are dropped beyond this limit.
+LIVE_LOG_MAX_LINES = 5000
+
+# Seconds after which the database-backed parts of the stats and
+# history tabs are refreshed even if nothing was written, so the 24h
+# counters and the per-day chart follow the clock.
+DB_REFRESH_MAX_AGE = 60.0
+
+# Bytes read from the end of a log when the live view is (re)loaded.
+# Older output would be dropped by LIVE_LOG_MAX_LINES anyway, so large
+# logs are not read in full.
+LIVE_LOG_TAIL_BYTES = 256 * 1024
+
+
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
 
 def _human_bytes(n: int) -> str:
     """Return a human readable representation of a byte count."""
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if n < 1024.0:
-            return f"{n:3.1f} {unit}"
-        n /= 1024.0
-    return f"{n:.1f} PB"
+    n = int(n)
+    # Each unit spans 10 bits; pick it from the bit length in one step
+    i = min(max(n.bit_length() - 1, 0) // 10, len(_BYTE_UNITS) - 1)
+    return f"{n / (1 << (10 * i)):3.1f} {_BYTE_UNITS[i]}"
+
+
+@lru_cache(maxsize=4096)
+def _fmt_ts(ts: int) -> str:
+    """Format a Unix timestamp (whole seconds) for the history views."""
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _merge_config(current: Optional[dict], base: Optional[dict], cfg: dict) -> dict:
+    """Apply the changes made from ``base`` to ``cfg`` on top of ``current``.
+
+    Keys ``cfg`` leaves as they were in ``base`` keep their value from
+    ``current``, so changes another component saved meanwhile survive.
+    """
+    if current is None or base is None:
+        return cfg
+    merged = dict(current)
+    for key, value in cfg.items():
+        if key not in base or base[key] != value:
+            merged[key] = value
+    for key in base:
+        if key not in cfg:
+            merged.pop(key, None)
+    return merged
+
+
+class _ConfigWriteTask(QRunnable):
+    """Save config changes to the window's config file on a pool thread.
+
+    ``cfg`` is the config as edited from ``base``, the version it was
+    copied from.  Under the config file's lock (shared with
+    :class:`Permissions`) the file is re-read and the edits are applied
+    on top of it, then written with :meth:`ConfigFile.save`.  If that
+    changes nothing, the file is left alone.  The outcome is reported
+    through the window's ``config_saved`` / ``config_write_failed``
+    signals, which Qt delivers on the UI thread.
+    """
+
+    def __init__(self, window: "QtMainWindow", cfg: dict, base: Optional[dict], applied: Optional[tuple]) -> None:
+        super().__init__()
+        self._window = window
+        self._cfg = cfg
+        self._base = base
+        self._applied = applied
+
+    def run(self) -> None:
+        window = self._window
+        config = config_file(window.config_path)
+        try:
+            with config.lock():
+                current = config.load()
+                merged = _merge_config(current, self._base, self._cfg)
+                if current is None or merged != current:
+                    config.save(merged)
+                mtime = os.stat(config.path).st_mtime_ns
+        except Exception as exc:
+            window.config_write_failed.emit(str(exc))
+            return
+        window.config_saved.emit((merged, mtime, self._applied))
+
+
+class _CsvExportTask(QRunnable):
+    """Write the history export CSV on a pool thread.
+
+    Reports through the window's ``export_done`` / ``export_failed``
+    signals, which Qt delivers on the UI thread.
+    """
+
+    def __init__(self, window: "QtMainWindow", path: str, runs: list) -> None:
+        super().__init__()
+        self._window = window
+        self._path = path
+        self._runs = runs
+
+    def run(self) -> None:
+        try:
+            # One writerows() call over a generator, through a large
+            # buffer, so the rows are formatted and written in bulk
+            with open(self._path, "w", buffering=1 << 20, newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["id", "start_time", "provider", "model", "status", "log_file"])
+                writer.writerows(
+                    (r.id, _fmt_ts(int(r.start_time)), r.provider, r.model, r.status, r.log_file)
+                    for r in self._runs
+                )
+        except Exception as exc:
+            self._window.export_failed.emit(str(exc))
+            return
+        self._window.export_done.emit(self._path)
+
+
+class _HealthProbeTask(QRunnable):
+    """Run the stats tab's service, proxy, provider and internet probes.
+
+    The results are delivered as ``{stat label key: text}`` through the
+    window's ``health_ready`` signal.  Only one task runs at a time (see
+    ``_refresh_stats``), so the window's HTTP session is never shared
+    between threads.
+    """
+
+    def __init__(self, window: "QtMainWindow", config: dict) -> None:
+        super().__init__()
+        self._window = window
+        self._config = config
+
+    def _cached(self, key: str, ident: object) -> Optional[str]:
+        """Return the fresh cached result for ``key`` probed with ``ident``, or None."""
+        entry = self._window._probe_cache.get(key)
+        if entry is not None and entry[1] == ident and time.monotonic() - entry[0] < HEALTH_PROBE_TTL:
+            return entry[2]
+        return None
+
+    def _store(self, key: str, ident: object, text: str) -> str:
+        self._window._probe_cache[key] = (time.monotonic(), ident, text)
+        return text
+
+    def run(self) -> None:
+        window = self._window
+        results: Dict[str, str] = {}
+        try:
+            import requests
+            session = window._health_session
+            if session is None:
+                session = window._health_session = requests.Session()
+            helper = window.integration_helper
+            # Service status via integration helper
+            if helper is not None:
+                try:
+                    svc_state = helper.is_service_active()
+                    if svc_state is True:
+                        results["service_status"] = "activo"
+                    elif svc_state is False:
+                        results["service_status"] = "inactivo"
+                    else:
+                        results["service_status"] = "desconocido"
+                except Exception:
+                    results["service_status"] = "error"
+            # Proxy status: call local /health endpoint
+            proxy_stat = "-"
+            proxy_port = getattr(helper, "proxy_port", None) if helper else None
+            if proxy_port:
+                try:
+                    resp = session.get(f"http://127.0.0.1:{proxy_port}/health", timeout=2)
+                    if resp.ok:
+                        proxy_stat = "activo"
+                    else:
+                        proxy_stat = f"{resp.status_code}"
+                except Exception:
+                    proxy_stat = "inactivo"
+            results["proxy_status"] = proxy_stat
+            # Provider status: attempt to call models endpoint for selected provider
+            try:
+                config = self._config
+                provider = config.get("provider", "openai")
+                providers_cfg = config.get("providers", {}) if isinstance(config.get("providers"), dict) else {}
+                provider_cfg = providers_cfg.get(provider, {}) if providers_cfg else {}
+                base_url = provider_cfg.get("base_url") or "https://api.openai.com"
+                api_key = provider_cfg.get("api_key") or None
+                api_header = provider_cfg.get("api_key_header") or "Authorization"
+                api_prefix = provider_cfg.get("api_key_prefix") or ""
+                # A cached result only applies to the same endpoint and
+                # key; the key is kept only as a short fingerprint
+                fingerprint = hashlib.sha1(api_key.encode("utf-8")).digest()[:8] if api_key else None
+                ident = (base_url, api_header, api_prefix, fingerprint)
+                prov_stat = self._cached("provider_status", ident)
+                if prov_stat is None and not api_key:
+                    # Without a key the request can only be rejected
+                    prov_stat = "sin clave"
+                elif prov_stat is None:
+                    headers = {}
+                    if api_key:
+                        headers[api_header] = f"{api_prefix}{api_key}"
+                    resp = session.get(f"{base_url}/v1/models", headers=headers, timeout=4)
+                    prov_stat = self._store(
+                        "provider_status", ident, "ok" if resp.status_code < 400 else str(resp.status_code)
+                    )
+            except Exception:
+                prov_stat = "error"
+            results["provider_status"] = prov_stat
+            # Internet status: try to connect to a well-known DNS (google DNS)
+            inet_stat = self._cached("internet_status", None)
+            if inet_stat is None:
+                try:
+                    sock = socket.create_connection(("8.8.8.8", 53), timeout=2)
+                    sock.close()
+                    inet_stat = "ok"
+                except Exception:
+                    inet_stat = "sin red"
+                self._store("internet_status", None, inet_stat)
+            results["internet_status"] = inet_stat
+        finally:
+            # Always report back, so the in-flight flag is cleared
+            window.health_ready.emit(results)
 
 
 class QtMainWindow(QMainWindow):
     """Main application window using Qt widgets."""
 
+    # Emitted (on the UI thread) when a queued config write completes
+    # or fails; see _write_cfg.  config_saved carries (written config,
+    # file mtime, settings state) for _config_saved, which then emits
+    # config_written.
+    config_written = Signal()
+    config_saved = Signal(object)
+    config_write_failed = Signal(str)
+    # Emitted (on the UI thread) with the results of a _HealthProbeTask
+    health_ready = Signal(dict)
+    # Emitted (on the UI thread) when a _CsvExportTask finishes or fails
+    export_done = Signal(str)
+    export_failed = Signal(str)
+
+    # Application palettes keyed by theme name, built on first use; see
+    # _build_palette.  QPalette is implicitly shared, so handing the
+    # same instance to setPalette() repeatedly is cheap and safe.
+    _PALETTES: Dict[str, QPalette] = {}
+    # Sidebar stylesheets keyed by theme name; see _nav_stylesheet
+    _NAV_QSS: Dict[str, str] = {}
+    # Monospace font shared by the log views; created on first use
+    # because a QFont needs the QApplication to exist.  See _mono_font
+    _MONO_FONT: Optional[QFont] = None
+    # Window icons keyed by file path (None when the file is missing),
+    # so switching the icon variant does not touch the disk again
+    _ICONS: Dict[str, Optional[QIcon]] = {}
+    # Status indicator dots keyed by run status ("success", "error",
+    # anything else); drawn on first use.  See _status_dot
+    _STATUS_DOTS: Dict[str, QPixmap] = {}
+
     def __init__(
         self,
         config_path: str,
@@ -118,6 +407,50 @@ class QtMainWindow(QMainWindow):
         self.update_config_callback = update_config_callback
         self.integration_helper = integration_helper
         self.resources_dir = Path(resources_dir or Path(config_path).parent / "resources")
+        # Parsed config file and the mtime it was read at; see _read_cfg
+        self._cfg: Optional[dict] = None
+        self._cfg_mtime: int = -1
+        # Change notifications for the config file.  While it is being
+        # watched, _read_cfg trusts the cache without stat'ing the file
+        # until fileChanged clears _cfg_watched.
+        self._cfg_watcher = QFileSystemWatcher(self)
+        self._cfg_watcher.fileChanged.connect(self._config_file_changed)
+        self._cfg_watched = False
+        # ((theme, icon, key texts), config dict) as of the last
+        # successful _apply_settings, to recognise a save with nothing
+        # changed
+        self._applied_state: Optional[tuple] = None
+        # Config writes queued and not yet reported back; while any are
+        # pending, _read_cfg returns the edited config in _cfg
+        self._cfg_pending = 0
+        # Stored ("ENC:...") form of each API key seen in plain text; see _encode_key
+        self._encoded_keys: Dict[str, str] = {}
+        # And the reverse: plain text of each "ENC:..." value decoded or
+        # produced so far; see _decode_key
+        self._decoded_keys: Dict[str, str] = {}
+        # Health probes: whether a _HealthProbeTask is running, and the
+        # HTTP session it reuses across rounds
+        self._health_inflight = False
+        self._health_session = None
+        # Network manager for API key tests, created on the first test;
+        # requests run on the event loop and reuse its connections
+        self._nam: Optional[QNetworkAccessManager] = None
+        # Probe results reused for HEALTH_PROBE_TTL seconds:
+        # {label key: (monotonic time, probe identity, text)}
+        self._probe_cache: Dict[str, tuple] = {}
+        self.health_ready.connect(self._apply_health)
+        self.export_done.connect(
+            lambda path: self.statusBar().showMessage(f"Historial exportado a {path}", 3000)
+        )
+        self.export_failed.connect(
+            lambda msg: self.statusBar().showMessage(f"Error al exportar: {msg}", 5000)
+        )
+        # Config writes run here, one at a time and in submission order
+        self._config_pool = QThreadPool(self)
+        self._config_pool.setMaxThreadCount(1)
+        self.config_written.connect(self.update_config_callback)
+        self.config_saved.connect(self._config_saved)
+        self.config_write_failed.connect(self._config_write_failed)
         # Load configuration (provider, model, theme, icon variant)
         self._load_config()
         # Apply theme and icon
@@ -125,8 +458,6 @@ class QtMainWindow(QMainWindow):
         self._apply_window_icon()
         # Build UI
         self._init_ui()
-        # Schedule periodic updates
-        self._setup_timers()
         # If the in-process event bus is available, subscribe to live
         # events.  The event queue will be drained regularly by a
         # timer to update the timeline in real time.  We set
@@ -148,12 +479,102 @@ class QtMainWindow(QMainWindow):
         # live view refreshes.
         self._live_run_id: Optional[str] = None
         self._live_start_ts: Optional[float] = None
+        # Events for the live run not yet added to the timeline, and
+        # whether _drain_events is already scheduled to continue
+        self._event_backlog: deque = deque()
+        self._drain_scheduled = False
+        # (fetched_at, show_all, runs) for _list_runs, and the runs shown
+        # in the history table, in row order
+        self._runs_cache: Optional[tuple] = None
+        self._history_runs: list = []
+        # (filters, runs) the history table was last filled from
+        self._history_shown: tuple = (None, None)
+        # Position reached in the live run's log; see _read_live_log
+        self._live_tail = {"path": None, "ino": None, "pos": 0, "decoder": None}
+        # (run ID, event count) last shown in the live timeline; see
+        # _refresh_live_events
+        self._live_events_sig: Optional[tuple] = None
+        # (run ID, status, event times) behind the live run label; the
+        # label text is only rebuilt when they change
+        self._live_label_sig: Optional[tuple] = None
+        # (database version, refresh period) seen by the last tick; see
+        # _tick
+        self._tick_db_sig: Optional[tuple] = None
+        # Schedule periodic updates.  Last, so the timers see the event
+        # queue and the state above (the live-event timer is only
+        # started when event_queue is set).
+        self._setup_timers()
+
+    def _read_cfg(self) -> dict:
+        """Return the parsed config file, re-reading it only when its mtime changes.
+
+        Other components (e.g. the permissions editor) write the same
+        file, so the cache is checked against the file's mtime.  While
+        the file is watched and unchanged, not even that check is made.
+        Until queued writes are reported back, the edited config passed
+        to _write_cfg is returned.  The returned dict is the cached
+        object itself and must not be mutated; callers modify a copy and
+        pass it to _write_cfg.
+        """
+        if self._cfg is not None and (self._cfg_watched or self._cfg_pending):
+            return self._cfg
+        # Watch before stat'ing, so a change made while reading is
+        # still reported
+        path = str(self.config_path)
+        watched = path in self._cfg_watcher.files() or self._cfg_watcher.addPath(path)
+        mtime = self.config_path.stat().st_mtime_ns
+        if self._cfg is None or mtime != self._cfg_mtime:
+            self._cfg = load_json(self.config_path.read_bytes())
+            self._cfg_mtime = mtime
+        self._cfg_watched = watched
+        return self._cfg
+
+    def _config_file_changed(self, _path: str) -> None:
+        """Make the next _read_cfg check the config file again.
+
+        Replacing the file (as _ConfigWriteTask does) drops it from the
+        watcher; _read_cfg adds it back.
+        """
+        self._cfg_watched = False
+
+    def _write_cfg(self, cfg: dict, applied: Optional[tuple] = None) -> None:
+        """Make ``cfg`` the cached config and queue it to be written to disk.
+
+        ``cfg`` must be an edited copy of the dict returned by _read_cfg
+        and must not be mutated afterwards.  Returns immediately;
+        ``update_config_callback`` runs once the file has been replaced.
+        ``applied`` is the settings form state to record in
+        ``_applied_state`` once the write succeeds.
+        """
+        base = self._cfg
+        self._cfg = cfg
+        self._cfg_pending += 1
+        self._config_pool.start(_ConfigWriteTask(self, cfg, base, applied))
+
+    def _config_saved(self, result: tuple) -> None:
+        """Adopt the config a _ConfigWriteTask wrote and notify other components."""
+        cfg, mtime, applied = result
+        self._cfg_pending -= 1
+        # A later write still in flight holds newer edits; keep those
+        if not self._cfg_pending:
+            self._cfg = cfg
+            self._cfg_mtime = mtime
+            if applied is not None:
+                self._applied_state = (applied, cfg)
+        self.config_written.emit()
+
+    def _config_write_failed(self, msg: str) -> None:
+        """Drop the unwritten edits from the cache and report the error."""
+        self._cfg_pending -= 1
+        self._cfg = None
+        self._cfg_watched = False
+        self._applied_state = None
+        self.statusBar().showMessage(f"Error al guardar la configuración: {msg}", 5000)
 
     def _load_config(self) -> None:
         """Load user configuration from JSON file."""
         if self.config_path.exists():
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                cfg = json.load(f)
+            cfg = self._read_cfg()
             self.provider = cfg.get("provider", "openai")
             self.model = cfg.get("model", "")
             self.theme = cfg.get("theme", "dark")
@@ -195,21 +616,27 @@ class QtMainWindow(QMainWindow):
         encryption helpers are unavailable, falls back to base64
         encoding prefixed with ``"ENC:"``.  A falsy input returns an
         empty string.
+
+        Fernet encryption is randomised, so a key that was already
+        stored is returned in its stored form instead of being
+        encrypted again; otherwise every save would look like a change.
         """
         if not key:
             return ""
-        # Use crypto_utils if available
+        encoded = self._encoded_keys.get(key)
+        if encoded is not None:
+            return encoded
+        encoded = None
+        # Use crypto_utils if available.  It handles its own failures
+        # (returning the value unchanged), so no guard is needed here.
         if crypto_utils is not None:
-            try:
-                return crypto_utils.encrypt_value(key, str(self.config_path))
-            except Exception:
-                pass
-        # Fallback: base64 encode
-        try:
-            encoded = base64.b64encode(key.encode("utf-8")).decode("utf-8")
-            return "ENC:" + encoded
-        except Exception:
-            return key
+            encoded = crypto_utils.encrypt_value(key, str(self.config_path))
+        if encoded is None:
+            # Fallback: base64 encode
+            encoded = "ENC:" + base64.b64encode(key.encode("utf-8")).decode("ascii")
+        self._encoded_keys[key] = encoded
+        self._decoded_keys[encoded] = key
+        return encoded
 
     def _decode_key(self, key: str) -> str:
         """Decode a key previously encrypted or encoded.
@@ -225,25 +652,29 @@ class QtMainWindow(QMainWindow):
         if not isinstance(key, str):
             return key
         if key.startswith("ENC:"):
-            # Try cryptography-based decryption first
+            # A given ciphertext always decrypts to the same text, so
+            # successful decryptions are remembered
+            dec = self._decoded_keys.get(key)
+            if dec is not None:
+                return dec
+            # Try cryptography-based decryption first; crypto_utils
+            # returns "" instead of raising when it cannot decrypt
             if crypto_utils is not None:
-                try:
-                    dec = crypto_utils.decrypt_value(key, str(self.config_path))
-                    if dec:
-                        return dec
-                except Exception:
-                    pass
-            # Fallback: base64 decode
+                dec = crypto_utils.decrypt_value(key, str(self.config_path))
+                if dec:
+                    self._decoded_keys[key] = dec
+                    return dec
+            # Fallback: base64 decode (binascii.Error and
+            # UnicodeDecodeError are both ValueErrors)
             try:
-                data = base64.b64decode(key[4:])
-                return data.decode("utf-8")
-            except Exception:
+                return base64.b64decode(key[4:]).decode("utf-8")
+            except ValueError:
                 return ""
         return key
 
-    def _apply_theme(self, theme: str) -> None:
-        """Apply a light or dark colour palette to the application."""
-        app = QApplication.instance()
+    @staticmethod
+    def _build_palette(theme: str) -> QPalette:
+        """Return a new light or dark colour palette."""
         palette = QPalette()
         if theme == "dark":
             # Dark colours
@@ -273,6 +704,14 @@ class QtMainWindow(QMainWindow):
             palette.setColor(QPalette.BrightText, QColor(255, 0, 0))
             palette.setColor(QPalette.Highlight, QColor(30, 144, 255))
             palette.setColor(QPalette.HighlightedText, QColor(255, 255, 255))
+        return palette
+
+    def _apply_theme(self, theme: str) -> None:
+        """Apply a light or dark colour palette to the application."""
+        app = QApplication.instance()
+        palette = self._PALETTES.get(theme)
+        if palette is None:
+            palette = self._PALETTES.setdefault(theme, self._build_palette(theme))
         app.setPalette(palette)
         self.theme = theme
 
@@ -280,24 +719,26 @@ class QtMainWindow(QMainWindow):
         """Set the window icon based on the selected variant."""
         variant = self.icon_variant or "full"
         icon_name = "icon_full.png" if variant == "full" else "icon_simple.png"
-        icon_path = self.resources_dir / icon_name
-        if icon_path.exists():
-            self.setWindowIcon(QIcon(str(icon_path)))
+        icon_path = str(self.resources_dir / icon_name)
+        try:
+            icon = self._ICONS[icon_path]
+        except KeyError:
+            icon = QIcon(icon_path) if os.path.exists(icon_path) else None
+            self._ICONS[icon_path] = icon
+        if icon is not None:
+            self.setWindowIcon(icon)
 
     def _save_config(self) -> None:
         """Persist current configuration to disk."""
         if not self.config_path.exists():
             return
-        with open(self.config_path, "r", encoding="utf-8") as f:
-            cfg = json.load(f)
+        cfg = dict(self._read_cfg())
         cfg["provider"] = self.provider
         cfg["model"] = self.model
         cfg["theme"] = self.theme
         cfg["icon_variant"] = self.icon_variant
-        with open(self.config_path, "w", encoding="utf-8") as f:
-            json.dump(cfg, f, indent=2)
-        # Notify other components if needed
-        self.update_config_callback()
+        # Other components are notified through config_written
+        self._write_cfg(cfg)
 
     # UI construction
     def _init_ui(self) -> None:
@@ -328,19 +769,18 @@ class QtMainWindow(QMainWindow):
         nav_layout.setContentsMargins(0, 0, 0, 0)
         nav_layout.setSpacing(0)
         self.nav_buttons = []
+        # Exclusive group; each button's id is its page index
+        self._nav_group = QButtonGroup(self)
         # Helper to create nav buttons
         def add_nav_button(text: str, icon_name: Optional[str] = None) -> QPushButton:
             btn = QPushButton(text)
             btn.setCheckable(True)
-            btn.setAutoExclusive(True)
             btn.setCursor(Qt.PointingHandCursor)
-            btn.setStyleSheet(
-                "QPushButton {padding: 12px 16px; border: none; text-align: left; color: %s;} "
-                "QPushButton:checked {background-color: %s; color: white;}" % (
-                    self.palette().color(QPalette.ButtonText).name(), self.accent_color.name()
-                )
-            )
+            # Styled by the sidebar's stylesheet (see _nav_stylesheet)
+            btn.setObjectName("navButton")
+            btn.setProperty("nav", True)
             nav_layout.addWidget(btn)
+            self._nav_group.addButton(btn, len(self.nav_buttons))
             self.nav_buttons.append(btn)
             return btn
         # Create nav buttons (order matches stack pages)
@@ -355,6 +795,9 @@ class QtMainWindow(QMainWindow):
         self.settings_btn = add_nav_button("Ajustes")
         # Add stretch to push items to top
         nav_layout.addStretch()
+        # One stylesheet for all nav buttons, so the sidebar is polished
+        # once rather than once per button
+        self.nav_container.setStyleSheet(self._nav_stylesheet())
         # Main area
         self.main_container = QWidget()
         v_layout = QVBoxLayout(self.main_container)
@@ -383,6 +826,8 @@ class QtMainWindow(QMainWindow):
         apply_btn.clicked.connect(self._apply_provider_model)
         # Status indicator (placeholder; updated in live refresh)
         self.status_indicator = QLabel()
+        # Status key of the dot currently shown; see _update_status_indicator
+        self._status_shown: Optional[str] = None
         self._update_status_indicator(None)
         top_bar.addWidget(provider_label)
         top_bar.addWidget(self.provider_combo)
@@ -397,52 +842,89 @@ class QtMainWindow(QMainWindow):
         # Stacked pages
         self.stack = QStackedWidget()
         v_layout.addWidget(self.stack, 1)
-        # Build pages and add to stack
-        # Live page
-        self.live_widget = QWidget()
-        self._build_live_tab()
-        self.stack.addWidget(self.live_widget)
-        # History page
-        self.history_widget = QWidget()
-        self._build_history_tab()
-        self.stack.addWidget(self.history_widget)
-        # Permissions page
-        self.permissions_widget = QWidget()
-        self._build_permissions_tab()
-        self.stack.addWidget(self.permissions_widget)
-        # Stats page
-        self.stats_widget = QWidget()
-        self._build_stats_tab()
-        self.stack.addWidget(self.stats_widget)
+        # Add an empty widget per page; its contents are built by
+        # _ensure_page the first time the page is shown
+        self._page_builders: Dict[int, Callable[[], None]] = {}
+        self._pages_built: set = set()
+
+        def add_page(builder: Callable[[], None]) -> int:
+            idx = self.stack.addWidget(QWidget())
+            self._page_builders[idx] = builder
+            return idx
+
+        self.live_widget = self.stack.widget(add_page(self._build_live_tab))
+        self._history_page = add_page(self._build_history_tab)
+        self.history_widget = self.stack.widget(self._history_page)
+        self.permissions_widget = self.stack.widget(add_page(self._build_permissions_tab))
+        self._stats_page = add_page(self._build_stats_tab)
+        self.stats_widget = self.stack.widget(self._stats_page)
         # Integration page (optional)
+        self._integration_page: Optional[int] = None
         if self.integration_helper is not None:
-            self.integration_widget = QWidget()
-            self._build_integration_tab()
-            self.stack.addWidget(self.integration_widget)
-        # Settings page
-        self.settings_widget = QWidget()
-        self._build_settings_tab()
-        self.stack.addWidget(self.settings_widget)
+            self._integration_page = add_page(self._build_integration_tab)
+            self.integration_widget = self.stack.widget(self._integration_page)
+        self.settings_widget = self.stack.widget(add_page(self._build_settings_tab))
         # Add nav and main area to main layout
         h_layout.addWidget(self.nav_container)
         h_layout.addWidget(self.main_container, 1)
-        # Connect nav buttons to change page
-        # Connect nav buttons to switch pages. Use enumerate to capture index
-        for i, btn in enumerate(self.nav_buttons):
-            btn.clicked.connect(lambda checked, idx=i: self._switch_page(idx))
-        # Default page is the first one
+        # Connect nav buttons to switch pages; the group reports the
+        # clicked button's id, which is its page index
+        self._nav_group.idClicked.connect(self._switch_page)
+        # Default page is the first one.  The live page is always built:
+        # its refresh also drives the status indicator in the top bar.
+        self._ensure_page(0)
         if self.nav_buttons:
             self.nav_buttons[0].setChecked(True)
             self.stack.setCurrentIndex(0)
         # Global font size for comfortable reading
         central.setStyleSheet("QWidget { font-size: 13px; }")
 
+    @classmethod
+    def _mono_font(cls) -> QFont:
+        """Return the monospace font of the log views, resolving it once."""
+        if cls._MONO_FONT is None:
+            cls._MONO_FONT = QFont("Courier New")
+        return cls._MONO_FONT
+
+    def _nav_stylesheet(self) -> str:
+        """Return the sidebar QSS for the current theme, building it once per theme."""
+        qss = self._NAV_QSS.get(self.theme)
+        if qss is None:
+            # Resolve the colour names once; they are the only per-theme parts
+            button_text = self.palette().color(QPalette.ButtonText).name()
+            accent = self.accent_color.name()
+            qss = (
+                f'QPushButton[nav="true"] {{padding: 12px 16px; border: none; text-align: left; color: {button_text};}} '
+                f'QPushButton[nav="true"]:checked {{background-color: {accent}; color: white;}}'
+            )
+            self._NAV_QSS[self.theme] = qss
+        return qss
+
+    def _ensure_page(self, index: int) -> bool:
+        """Build the page at ``index`` if needed; return True if it was just built."""
+        if index in self._pages_built:
+            return False
+        self._pages_built.add(index)
+        self._page_builders[index]()
+        return True
+
     def _switch_page(self, index: int) -> None:
         """Switch to the given page index in the stacked widget."""
+        if self._ensure_page(index):
+            # Fill a freshly built page now rather than on the next tick
+            if index == self._history_page:
+                self._refresh_history()
+            elif index == self._stats_page:
+                self._refresh_stats()
+            elif index == self._integration_page:
+                self._update_integration_status()
         self.stack.setCurrentIndex(index)
-        # Ensure the corresponding nav button is checked
-        for i, btn in enumerate(self.nav_buttons):
-            btn.setChecked(i == index)
+        self._sync_event_timer()
+        # Ensure the corresponding nav button is checked (the group
+        # unchecks the others)
+        btn = self._nav_group.button(index)
+        if btn is not None:
+            btn.setChecked(True)
 
     # Helpers to build each tab
     def _build_live_tab(self) -> None:
@@ -450,7 +932,7 @@ class QtMainWindow(QMainWindow):
         # Top controls bar
         controls = QHBoxLayout()
         self.live_refresh_btn = QPushButton("Actualizar")
-        self.live_refresh_btn.clicked.connect(self._refresh_live_log)
+        self.live_refresh_btn.clicked.connect(lambda: self._refresh_live_log())
         self.live_run_label = QLabel("No hay ejecución en curso")
         controls.addWidget(self.live_refresh_btn)
         controls.addSpacing(10)
@@ -463,19 +945,17 @@ class QtMainWindow(QMainWindow):
         self.live_log_text = QPlainTextEdit()
         self.live_log_text.setReadOnly(True)
         self.live_log_text.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.live_log_text.setMaximumBlockCount(LIVE_LOG_MAX_LINES)
+        # Text is only appended programmatically; keep no undo history
+        self.live_log_text.setUndoRedoEnabled(False)
         # Use monospace font for log
-        font = QFont("Courier New")
-        self.live_log_text.setFont(font)
+        self.live_log_text.setFont(self._mono_font())
         split_layout.addWidget(self.live_log_text, 2)
         # Timeline table (right)
-        from PySide6.QtWidgets import QHeaderView
         self.events_table = QTableWidget()
         self.events_table.setColumnCount(3)
         self.events_table.setHorizontalHeaderLabels(["Tiempo", "Evento", "Detalles"])
-        header = self.events_table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
-        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
-        header.setSectionResizeMode(2, QHeaderView.Stretch)
+        self._setup_timeline_header(self.events_table)
         self.events_table.verticalHeader().setVisible(False)
         self.events_table.setEditTriggers(QTableWidget.NoEditTriggers)
         split_layout.addWidget(self.events_table, 1)
@@ -483,6 +963,13 @@ class QtMainWindow(QMainWindow):
 
     def _build_history_tab(self) -> None:
         layout = QVBoxLayout(self.history_widget)
+        # Search/filter changes restart this timer; the refresh runs
+        # once they stop for HISTORY_DEBOUNCE_MS
+        self._history_refresh_timer = QTimer(self)
+        self._history_refresh_timer.setSingleShot(True)
+        self._history_refresh_timer.setInterval(HISTORY_DEBOUNCE_MS)
+        self._history_refresh_timer.timeout.connect(self._refresh_history)
+        schedule_refresh = self._history_refresh_timer.start
         # Top controls: refresh, show all, search/filter and export
         ctrl_layout = QHBoxLayout()
         self.history_refresh_btn = QPushButton("Actualizar")
@@ -491,32 +978,29 @@ class QtMainWindow(QMainWindow):
         ctrl_layout.addSpacing(10)
         # Show all checkbox
         self.show_all_checkbox = QCheckBox("Mostrar todo")
-        self.show_all_checkbox.stateChanged.connect(self._refresh_history)
+        self.show_all_checkbox.stateChanged.connect(lambda _state: schedule_refresh())
         ctrl_layout.addWidget(self.show_all_checkbox)
         ctrl_layout.addSpacing(20)
         # Search box
         ctrl_layout.addWidget(QLabel("Buscar:"))
         self.history_search_input = QLineEdit()
         self.history_search_input.setPlaceholderText("Texto a buscar")
-        self.history_search_input.textChanged.connect(self._refresh_history)
+        self.history_search_input.textChanged.connect(lambda _text: schedule_refresh())
         ctrl_layout.addWidget(self.history_search_input)
         ctrl_layout.addSpacing(10)
         # Provider filter
         ctrl_layout.addWidget(QLabel("Proveedor:"))
         self.history_provider_filter = QComboBox()
-        # Populate with available providers plus 'Todos'
-        providers = list(self.available_providers)
-        self.history_provider_filter.addItem("Todos")
-        for p in providers:
-            self.history_provider_filter.addItem(p)
-        self.history_provider_filter.currentIndexChanged.connect(self._refresh_history)
+        # Populate with available providers plus 'Todos', in one call
+        self.history_provider_filter.addItems(["Todos", *self.available_providers])
+        self.history_provider_filter.currentIndexChanged.connect(lambda _idx: schedule_refresh())
         ctrl_layout.addWidget(self.history_provider_filter)
         ctrl_layout.addSpacing(10)
         # Status filter
         ctrl_layout.addWidget(QLabel("Estado:"))
         self.history_status_filter = QComboBox()
         self.history_status_filter.addItems(["Todos", "success", "error"])
-        self.history_status_filter.currentIndexChanged.connect(self._refresh_history)
+        self.history_status_filter.currentIndexChanged.connect(lambda _idx: schedule_refresh())
         ctrl_layout.addWidget(self.history_status_filter)
         ctrl_layout.addSpacing(20)
         # Export button
@@ -560,10 +1044,7 @@ class QtMainWindow(QMainWindow):
         self.history_detail_events = QTableWidget()
         self.history_detail_events.setColumnCount(3)
         self.history_detail_events.setHorizontalHeaderLabels(["Tiempo", "Evento", "Detalles"])
-        header = self.history_detail_events.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
-        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
-        header.setSectionResizeMode(2, QHeaderView.Stretch)
+        self._setup_timeline_header(self.history_detail_events)
         self.history_detail_events.verticalHeader().setVisible(False)
         self.history_detail_events.setEditTriggers(QTableWidget.NoEditTriggers)
         detail_layout.addWidget(self.history_detail_events)
@@ -571,8 +1052,8 @@ class QtMainWindow(QMainWindow):
         self.history_detail_log = QPlainTextEdit()
         self.history_detail_log.setReadOnly(True)
         self.history_detail_log.setLineWrapMode(QPlainTextEdit.NoWrap)
-        font = QFont("Courier New")
-        self.history_detail_log.setFont(font)
+        self.history_detail_log.setUndoRedoEnabled(False)
+        self.history_detail_log.setFont(self._mono_font())
         detail_layout.addWidget(self.history_detail_log, 1)
         # Action buttons for selected run
         action_layout = QHBoxLayout()
@@ -591,6 +1072,26 @@ class QtMainWindow(QMainWindow):
         splitter.setSizes([400, 400])
         layout.addWidget(splitter, 1)
 
+    @staticmethod
+    def _setup_timeline_header(table: QTableWidget) -> None:
+        """Size the columns of a (time, event, details) timeline table.
+
+        ``ResizeToContents`` would re-measure every row on each insert,
+        so the first two columns are interactive with default widths and
+        the details column stretches.
+        """
+        header = table.horizontalHeader()
+        for col, width in enumerate(TIMELINE_COLUMN_WIDTHS):
+            header.setSectionResizeMode(col, QHeaderView.Interactive)
+            header.resizeSection(col, width)
+        header.setSectionResizeMode(2, QHeaderView.Stretch)
+
+    @staticmethod
+    def _fit_timeline_columns(table: QTableWidget) -> None:
+        """Fit the time and event columns to their contents after a bulk load."""
+        for col in range(len(TIMELINE_COLUMN_WIDTHS)):
+            table.resizeColumnToContents(col)
+
     def _build_permissions_tab(self) -> None:
         layout = QVBoxLayout(self.permissions_widget)
         # Sudo toggle
@@ -628,6 +1129,12 @@ class QtMainWindow(QMainWindow):
         layout = QVBoxLayout(self.stats_widget)
         # Create labels for metrics
         self.stat_labels = {}
+        # Contents last shown in the top-logs label and the denied list;
+        # see _refresh_stats
+        self._top_logs_sig: Optional[tuple] = None
+        self._denied_sig: Optional[tuple] = None
+        # (total bytes, limit) last shown in the log usage label
+        self._log_usage_sig: Optional[tuple] = None
         metrics = [
             ("runs_total", "Ejecuciones totales:"),
             ("runs_24h", "Ejecuciones últimas 24h:"),
@@ -653,7 +1160,6 @@ class QtMainWindow(QMainWindow):
         layout.addSpacing(20)
         denied_label = QLabel("Comandos denegados recientes:")
         layout.addWidget(denied_label)
-        from PySide6.QtWidgets import QListWidget
         self.denied_list = QListWidget()
         layout.addWidget(self.denied_list, 1)
         # Button to allow selected denied command
@@ -667,7 +1173,27 @@ class QtMainWindow(QMainWindow):
 
         # If QtCharts is available, add a chart view for tokens per day
         if _QTCHARTS_AVAILABLE:
-            self.chart_view = QChartView()
+            # The chart, series and axes are created once; refreshes only
+            # replace the points and adjust the axis ranges
+            chart = QChart()
+            chart.setTitle("Tokens por día (últimos 30 días)")
+            self._tokens_series = QLineSeries()
+            chart.addSeries(self._tokens_series)
+            self._tokens_axis_x = QDateTimeAxis()
+            self._tokens_axis_x.setFormat("dd/MM")
+            self._tokens_axis_x.setTickCount(7)
+            chart.addAxis(self._tokens_axis_x, Qt.AlignBottom)
+            self._tokens_series.attachAxis(self._tokens_axis_x)
+            self._tokens_axis_y = QValueAxis()
+            self._tokens_axis_y.setLabelFormat("%i")
+            self._tokens_axis_y.setMin(0)
+            chart.addAxis(self._tokens_axis_y, Qt.AlignLeft)
+            self._tokens_series.attachAxis(self._tokens_axis_y)
+            # (today, query bound, date keys, point x values) for the
+            # 30-day window; rebuilt only when the date rolls over
+            self._tokens_days: Optional[tuple] = None
+            chart.legend().hide()
+            self.chart_view = QChartView(chart)
             # Enable anti-aliasing for smoother lines
             try:
                 self.chart_view.setRenderHint(QPainter.Antialiasing)
@@ -709,7 +1235,7 @@ class QtMainWindow(QMainWindow):
             self.apply_override_btn.clicked.connect(self._apply_override_systemd)
             layout.addWidget(self.apply_override_btn)
         # Text area for instructions
-        self.instructions_text = QTextEdit()
+        self.instructions_text = QPlainTextEdit()
         self.instructions_text.setReadOnly(True)
         self.instructions_text.setVisible(False)
         # Load instructions text
@@ -743,6 +1269,11 @@ class QtMainWindow(QMainWindow):
         layout.addSpacing(20)
         layout.addWidget(QLabel("Claves API por proveedor:"))
         self.provider_key_edits = {}
+        # Read the config once for all providers
+        try:
+            providers_cfg = self._read_cfg().get("providers", {})
+        except Exception:
+            providers_cfg = {}
         for prov in self.available_providers:
             h = QHBoxLayout()
             h.addWidget(QLabel(prov))
@@ -750,12 +1281,14 @@ class QtMainWindow(QMainWindow):
             line.setEchoMode(QLineEdit.Password)
             # Load existing key from config if present
             try:
-                with open(self.config_path, "r", encoding="utf-8") as f:
-                    cfg = json.load(f)
-            key = cfg.get("providers", {}).get(prov, {}).get("api_key", "")
-            # Decode encoded key if necessary
-            if key:
-                key = self._decode_key(key)
+                key = providers_cfg.get(prov, {}).get("api_key", "")
+                # Decode encoded key if necessary, remembering the stored
+                # form so an unchanged key is not re-encrypted on save
+                if key:
+                    stored = key
+                    key = self._decode_key(stored)
+                    if stored.startswith("ENC:"):
+                        self._encoded_keys[key] = stored
             except Exception:
                 key = ""
             line.setText(key)
@@ -777,20 +1310,24 @@ class QtMainWindow(QMainWindow):
     # Provider/model selection handlers
     def _provider_changed(self, idx: int) -> None:
         self.provider = self.available_providers[idx]
-        self._update_model_combo()
-        # Set default model for provider
-        models = self.available_models_map.get(self.provider, [])
-        if models:
-            self.model_combo.setCurrentIndex(0)
-            self.model = models[0]
-        else:
-            self.model_combo.clear()
-            self.model = ""
+        # The refilled combo selects the provider's first model
+        models = self._update_model_combo()
+        self.model = models[0] if models else ""
+
+    def _update_model_combo(self) -> list:
+        """Refill the model selector for the current provider and return its models.
 
-    def _update_model_combo(self) -> None:
+        The combo's signals are blocked while it is cleared and refilled,
+        so listeners see neither the emptied list nor each added item.
+        """
         models = self.available_models_map.get(self.provider, [])
-        self.model_combo.clear()
-        self.model_combo.addItems(models)
+        blocker = QSignalBlocker(self.model_combo)
+        try:
+            self.model_combo.clear()
+            self.model_combo.addItems(models)
+        finally:
+            blocker.unblock()
+        return models
 
     def _apply_provider_model(self) -> None:
         # Update provider/model selection
@@ -809,25 +1346,55 @@ class QtMainWindow(QMainWindow):
           error a red dot.  The indicator also shows a tooltip with the
           last run ID if available (set when refreshing live log).
         """
-        if status == "success":
-            colour = QColor(76, 175, 80)  # green
-        elif status == "error":
-            colour = QColor(211, 47, 47)  # red
-        else:
-            colour = QColor(189, 189, 189)  # grey
-        # Create a small coloured circle using HTML in QLabel
-        self.status_indicator.setText(
-            f"<span style='display:inline-block; width:14px; height:14px; border-radius:7px; background:{colour.name()};'></span>"
-        )
+        key = status if status in ("success", "error") else ""
+        if key == self._status_shown:
+            return
+        self._status_shown = key
+        self.status_indicator.setPixmap(self._status_dot(key))
+
+    @classmethod
+    def _status_dot(cls, key: str) -> QPixmap:
+        """Return the 14x14 coloured circle for a status key, drawing it once."""
+        pixmap = cls._STATUS_DOTS.get(key)
+        if pixmap is None:
+            if key == "success":
+                colour = QColor(76, 175, 80)  # green
+            elif key == "error":
+                colour = QColor(211, 47, 47)  # red
+            else:
+                colour = QColor(189, 189, 189)  # grey
+            pixmap = QPixmap(14, 14)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(colour)
+            painter.drawEllipse(0, 0, 14, 14)
+            painter.end()
+            cls._STATUS_DOTS[key] = pixmap
+        return pixmap
 
     # Live tab updates
-    def _refresh_live_log(self) -> None:
+    def _refresh_live_log(self, db_changed: bool = True) -> None:
+        """Refresh the live tab from the most recent run.
+
+        With ``db_changed`` False the run, its label and its timeline
+        cannot have changed, so only the tail of the run's log is read
+        (and nothing at all if the file has not grown).
+        """
+        log_file = self._live_tail["path"]
+        if not db_changed and log_file is not None:
+            self._update_live_log_view(log_file)
+            return
         runs = self.db.get_recent_runs(limit=1)
         if not runs:
             self.live_run_label.setText("No hay ejecuciones recientes")
+            self._live_label_sig = None
             self.live_log_text.setPlainText("")
+            self._live_tail["path"] = None
             # Clear timeline as well
             self.events_table.setRowCount(0)
+            self._live_events_sig = None
             return
         run = runs[0]
         run_id = run["id"]
@@ -839,34 +1406,33 @@ class QtMainWindow(QMainWindow):
         except Exception:
             events = []
         request_sent_time = first_token_time = finish_time = None
-        for ev in events:
-            if ev["event"] == "request_sent" and request_sent_time is None:
-                request_sent_time = ev["timestamp"]
-            elif ev["event"] == "first_token" and first_token_time is None:
-                first_token_time = ev["timestamp"]
-            elif ev["event"] == "request_finished" and finish_time is None:
-                finish_time = ev["timestamp"]
-        ttft_str = duration_str = ""
-        if request_sent_time and first_token_time:
-            ttft = first_token_time - request_sent_time
-            ttft_str = f", TTFT {ttft:.2f}s"
-        if request_sent_time and finish_time:
-            dur = finish_time - request_sent_time
-            duration_str = f", Duración {dur:.2f}s"
-        self.live_run_label.setText(
-            f"Run {run_id[:8]}… estado: {status}{ttft_str}{duration_str}"
-        )
-        # Update status indicator in top bar
-        self._update_status_indicator(status)
-        self.status_indicator.setToolTip(f"Último run: {run_id[:8]}")
-        log_file = run["log_file"]
-        try:
-            data = self._read_log_file(log_file)
-            self.live_log_text.setPlainText(data)
-        except Exception:
-            self.live_log_text.setPlainText("No se pudo leer el archivo de log")
-        # Refresh timeline events for this run
-        self._refresh_live_events(run_id)
+        for _, ts, event_name, _ in events:
+            if event_name == "request_sent" and request_sent_time is None:
+                request_sent_time = ts
+            elif event_name == "first_token" and first_token_time is None:
+                first_token_time = ts
+            elif event_name == "request_finished" and finish_time is None:
+                finish_time = ts
+        label_sig = (run_id, status, request_sent_time, first_token_time, finish_time)
+        if label_sig != self._live_label_sig:
+            self._live_label_sig = label_sig
+            ttft_str = duration_str = ""
+            if request_sent_time and first_token_time:
+                ttft = first_token_time - request_sent_time
+                ttft_str = f", TTFT {ttft:.2f}s"
+            if request_sent_time and finish_time:
+                dur = finish_time - request_sent_time
+                duration_str = f", Duración {dur:.2f}s"
+            self.live_run_label.setText(
+                f"Run {run_id[:8]}… estado: {status}{ttft_str}{duration_str}"
+            )
+            # Update status indicator in top bar
+            self._update_status_indicator(status)
+            self.status_indicator.setToolTip(f"Último run: {run_id[:8]}")
+        self._update_live_log_view(run["log_file"])
+        # Refresh timeline events for this run, reusing the events
+        # fetched above
+        self._refresh_live_events(run_id, events)
 
         # Update live run tracking information.  Compute the
         # approximate start timestamp based on the first event for
@@ -879,34 +1445,98 @@ class QtMainWindow(QMainWindow):
             start_ts = events[0]["timestamp"]
         self._live_start_ts = start_ts
 
-    def _refresh_live_events(self, run_id: str) -> None:
-        """Populate the timeline table for the given run ID."""
-        # Clear table
-        self.events_table.setRowCount(0)
-        events = []
+    def _update_live_log_view(self, log_file: str) -> None:
+        """Show what was added to ``log_file`` since the last refresh."""
         try:
-            events = self.db.get_events_for_run(run_id)
+            result = self._read_live_log(log_file)
         except Exception:
+            self._live_tail["path"] = None
+            result = ("reset", "No se pudo leer el archivo de log")
+        if result is not None:
+            kind, data = result
+            if kind == "reset":
+                self.live_log_text.setPlainText(data)
+            else:
+                # Insert at the end of the document in one call, without
+                # moving the user's cursor or selection
+                cursor = QTextCursor(self.live_log_text.document())
+                cursor.movePosition(QTextCursor.End)
+                cursor.insertText(data)
+
+    def _read_live_log(self, log_file: str) -> Optional[tuple]:
+        """Return what changed in ``log_file`` since the last call, or None.
+
+        Returns ``("append", text)`` with the data written since the last
+        read, or ``("reset", text)`` when the view must be reloaded: the
+        run's log changed, the file was replaced or truncated, or only a
+        compressed copy exists (compressed logs are complete, so they are
+        read once).
+        """
+        tail = self._live_tail
+        if not log_file or not os.path.exists(log_file):
+            if tail["path"] == log_file and tail["ino"] is None:
+                return None
+            data = self._read_log_file(log_file, LIVE_LOG_TAIL_BYTES)
+            tail.update(path=log_file, ino=None, pos=0, decoder=None)
+            return ("reset", data)
+        st = os.stat(log_file)
+        kind = "append"
+        if tail["path"] != log_file or tail["ino"] != st.st_ino or st.st_size < tail["pos"]:
+            kind = "reset"
+            # Start from the last LIVE_LOG_TAIL_BYTES of the file
+            tail.update(
+                path=log_file,
+                ino=st.st_ino,
+                pos=max(0, st.st_size - LIVE_LOG_TAIL_BYTES),
+                decoder=codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            )
+        if st.st_size == tail["pos"] and kind == "append":
+            return None
+        skipped = kind == "reset" and tail["pos"] > 0
+        with open(log_file, "rb") as f:
+            f.seek(tail["pos"])
+            data = f.read()
+            tail["pos"] = f.tell()
+        text = tail["decoder"].decode(data)
+        if skipped:
+            # Drop the partial line the tail starts in
+            text = text[text.find("\n") + 1:]
+        return (kind, text)
+
+    def _refresh_live_events(self, run_id: str, events: Optional[list] = None) -> None:
+        """Populate the timeline table for the given run ID.
+
+        Events are only ever added to a run, so the table is left alone
+        when the run and its event count are the same as last time.
+        """
+        if events is None:
+            try:
+                events = self.db.get_events_for_run(run_id)
+            except Exception:
+                self.events_table.setRowCount(0)
+                self._live_events_sig = None
+                return
+        sig = (run_id, len(events))
+        if sig == self._live_events_sig:
             return
+        self._live_events_sig = sig
         # Determine start time to compute relative times
         start_ts = None
         if events:
-            start_ts = events[0]["timestamp"]
-        for ev in events:
-            row = self.events_table.rowCount()
-            self.events_table.insertRow(row)
-            ts = ev["timestamp"]
+            start_ts = events[0].timestamp
+        rows = []
+        # Rows are Event namedtuples: unpack them instead of looking
+        # columns up by name
+        for _, ts, event_name, details in events:
             # Compute relative time if possible
             if start_ts is not None:
                 rel = ts - start_ts
                 time_str = f"{rel:.2f}s"
             else:
                 time_str = time.strftime("%H:%M:%S", time.localtime(ts))
-            event_name = ev["event"]
-            details = ev["details"] or ""
-            self.events_table.setItem(row, 0, QTableWidgetItem(time_str))
-            self.events_table.setItem(row, 1, QTableWidgetItem(event_name))
-            self.events_table.setItem(row, 2, QTableWidgetItem(details))
+            rows.append((time_str, event_name, details or ""))
+        self._fill_table(self.events_table, rows)
+        self._fit_timeline_columns(self.events_table)
 
     def _process_event_queue(self) -> None:
         """Drain the in-memory event queue and update the live timeline.
@@ -922,104 +1552,163 @@ class QtMainWindow(QMainWindow):
         """
         if self.event_queue is None:
             return
-        # If no live run is currently being displayed, do nothing.
+        # Take everything pending in one call; the table is then updated
+        # once per batch rather than once per event.
+        try:
+            pending = self.event_queue.drain()
+        except Exception:
+            return
+        # A finished run changes the history listing
+        if any(evt is not None and evt.get("event") == "request_finished" for evt in pending):
+            self._runs_cache = None
+        # If no live run is currently being displayed, the events are
+        # simply discarded.
         run_id = self._live_run_id
-        start_ts = self._live_start_ts
         if not run_id:
-            # Drain queue but ignore events
-            try:
-                while True:
-                    self.event_queue.get_nowait()
-            except Exception:
-                pass
             return
-        # Process all events currently in the queue
-        updated = False
+        # Only process events for the current live run
+        self._event_backlog.extend(
+            evt for evt in pending if evt is not None and evt.get("run_id") == run_id
+        )
+        if self._event_backlog and not self._drain_scheduled:
+            self._drain_events()
+
+    def _drain_events(self) -> None:
+        """Append backlogged live events to the timeline within ``MAX_DRAIN_MS``.
+
+        Whatever does not fit in the budget is left in the backlog and
+        this method is rescheduled with a zero-delay single-shot timer,
+        so the event loop can repaint in between.
+        """
+        self._drain_scheduled = False
+        backlog = self._event_backlog
+        run_id = self._live_run_id
+        start_ts = self._live_start_ts
+        t0 = time.perf_counter()
+        rows = []
+        while backlog:
+            if (time.perf_counter() - t0) * 1000 > MAX_DRAIN_MS:
+                self._drain_scheduled = True
+                QTimer.singleShot(0, self._drain_events)
+                break
+            evt = backlog.popleft()
+            # The live view may have moved to another run meanwhile
+            if evt.get("run_id") != run_id:
+                continue
+            ts = evt.get("timestamp")
+            # Fallback: if timestamp is missing, use current time
+            if ts is None:
+                ts = time.time()
+            if start_ts is not None:
+                rel = ts - start_ts
+                time_str = f"{rel:.2f}s"
+            else:
+                # Without a start timestamp we cannot compute a
+                # relative offset; use absolute time
+                time_str = time.strftime("%H:%M:%S", time.localtime(ts))
+            rows.append((time_str, evt.get("event", ""), evt.get("details") or ""))
+        if not rows:
+            return
+        table = self.events_table
+        # Follow new entries only if the user has not scrolled up
+        bar = table.verticalScrollBar()
+        follow = bar.value() >= bar.maximum() - 1
+        self._fill_table(table, rows, append=True)
+        if follow:
+            table.scrollToBottom()
+
+    @staticmethod
+    def _fill_table(table: QTableWidget, rows: List[Sequence[str]], append: bool = False) -> None:
+        """Write ``rows`` of cell texts into ``table`` in one batch.
+
+        The row count is set once and sorting, repaints and the table's
+        own signals (``itemChanged``, ``cellChanged``, ...) are suspended
+        while the items are placed, instead of paying for an
+        ``insertRow`` and a sort pass per row.  Without ``append`` the
+        existing rows are replaced.
+        """
+        table.setUpdatesEnabled(False)
+        sorting = table.isSortingEnabled()
+        table.setSortingEnabled(False)
+        # Only the widget's signals: the view itself relies on the model's
+        blocker = QSignalBlocker(table)
         try:
-            while True:
-                evt = self.event_queue.get_nowait()
-                if evt is None:
-                    continue
-                # Only process events for the current live run
-                if evt.get("run_id") != run_id:
-                    continue
-                # Append row to events table
-                ts = evt.get("timestamp")
-                # Fallback: if timestamp is missing, use current time
-                if ts is None:
-                    ts = time.time()
-                if start_ts is not None:
-                    rel = ts - start_ts
-                    time_str = f"{rel:.2f}s"
-                else:
-                    # Without a start timestamp we cannot compute a
-                    # relative offset; use absolute time
-                    time_str = time.strftime("%H:%M:%S", time.localtime(ts))
-                event_name = evt.get("event", "")
-                details = evt.get("details") or ""
-                row_idx = self.events_table.rowCount()
-                self.events_table.insertRow(row_idx)
-                self.events_table.setItem(row_idx, 0, QTableWidgetItem(time_str))
-                self.events_table.setItem(row_idx, 1, QTableWidgetItem(event_name))
-                self.events_table.setItem(row_idx, 2, QTableWidgetItem(details))
-                updated = True
-        except Exception:
-            pass
-        # If we appended any events, optionally scroll to bottom to
-        # ensure the newest entry is visible.  This can be tuned to
-        # preserve manual scroll position if desired.
-        if updated:
-            self.events_table.scrollToBottom()
+            row0 = table.rowCount() if append else 0
+            table.setRowCount(row0 + len(rows))
+            for offset, values in enumerate(rows):
+                for col, val in enumerate(values):
+                    table.setItem(row0 + offset, col, QTableWidgetItem(val))
+        finally:
+            blocker.unblock()
+            table.setSortingEnabled(sorting)
+            table.setUpdatesEnabled(True)
 
     # History updates
+    def _list_runs(self, show_all: bool) -> list:
+        """Return the history listing, reusing one fetched in the last ``RUNS_CACHE_TTL`` seconds."""
+        now = time.monotonic()
+        cached = self._runs_cache
+        if cached is not None and cached[1] == show_all and now - cached[0] < RUNS_CACHE_TTL:
+            return cached[2]
+        runs = self.db.get_all_runs() if show_all else self.db.get_recent_runs(limit=100)
+        self._runs_cache = (now, show_all, runs)
+        return runs
+
     def _refresh_history(self) -> None:
-        # Clear table
-        self.history_table.setRowCount(0)
         show_all = self.show_all_checkbox.isChecked()
-        runs = self.db.get_all_runs() if show_all else self.db.get_recent_runs(limit=100)
-        # Apply filters
-        search_text = self.history_search_input.text().strip().lower() if hasattr(self, "history_search_input") else ""
-        provider_filter = self.history_provider_filter.currentText() if hasattr(self, "history_provider_filter") else "Todos"
-        status_filter = self.history_status_filter.currentText() if hasattr(self, "history_status_filter") else "Todos"
+        runs = self._list_runs(show_all)
+        filters = (
+            self.history_search_input.text().strip().lower(),
+            self.history_provider_filter.currentText(),
+            self.history_status_filter.currentText(),
+        )
+        # Most ticks find the same runs under the same filters (often the
+        # very list cached by _list_runs); the table is then left as is
+        if filters == self._history_shown[0] and runs == self._history_shown[1]:
+            return
+        self._history_shown = (filters, runs)
+        filtered_runs = self._filter_history(runs, *filters)
+        rows = []
+        for r in filtered_runs:
+            st = r.start_time
+            et = r.end_time
+            ts_str = _fmt_ts(int(st))
+            # Compute duration if available
+            dur = "-"
+            if st and et:
+                dur_val = et - st
+                if dur_val >= 0:
+                    dur = f"{dur_val:.2f}"
+            rows.append((ts_str, r.provider, r.model, r.status, dur))
+        self._fill_table(self.history_table, rows)
+        # Row i of the table shows run i; see _open_selected_history_log
+        self._history_runs = filtered_runs
+
+    @staticmethod
+    def _filter_history(runs: list, search_text: str, provider_filter: str, status_filter: str) -> list:
+        """Return the runs matching the (lower-cased) search text and filters."""
+        if not search_text and provider_filter == "Todos" and status_filter == "Todos":
+            return runs
         filtered_runs = []
         for r in runs:
+            # Provider and status filters first: they are plain comparisons
+            if provider_filter != "Todos" and r.provider != provider_filter:
+                continue
+            if status_filter != "Todos" and r.status != status_filter:
+                continue
             # Search filter: match in id, provider, model, status or timestamp string
-            ts_str = datetime.fromtimestamp(r["start_time"]).strftime("%Y-%m-%d %H:%M:%S")
             if search_text:
                 text_target = " ".join([
-                    r["id"],
-                    r["provider"],
-                    r["model"],
-                    r["status"],
-                    ts_str,
+                    r.id,
+                    r.provider,
+                    r.model,
+                    r.status,
+                    _fmt_ts(int(r.start_time)),
                 ]).lower()
                 if search_text not in text_target:
                     continue
-            # Provider filter
-            if provider_filter != "Todos" and r["provider"] != provider_filter:
-                continue
-            # Status filter
-            if status_filter != "Todos" and r["status"] != status_filter:
-                continue
             filtered_runs.append(r)
-        for r in filtered_runs:
-            row_idx = self.history_table.rowCount()
-            self.history_table.insertRow(row_idx)
-            ts = r["start_time"]
-            dt = datetime.fromtimestamp(ts)
-            ts_str = dt.strftime("%Y-%m-%d %H:%M:%S")
-            # Compute duration if available
-            dur = "-"
-            st = r.get("start_time")
-            et = r.get("end_time")
-            if st and et:
-                dur_val = et - st
-                if dur_val >= 0:
-                    dur = f"{dur_val:.2f}"
-            values = [ts_str, r["provider"], r["model"], r["status"], dur]
-            for col, val in enumerate(values):
-                item = QTableWidgetItem(val)
-                self.history_table.setItem(row_idx, col, item)
+        return filtered_runs
 
     def _open_selected_history_log(self) -> None:
         # When a row is selected in the history table, update the detail view instead of opening a dialog.
@@ -1030,37 +1719,14 @@ class QtMainWindow(QMainWindow):
             self.history_detail_log.setPlainText("")
             self.history_detail_events.setRowCount(0)
             return
-        # Reapply the same filters used in _refresh_history to map row index to the correct run
-        show_all = self.show_all_checkbox.isChecked()
-        runs = self.db.get_all_runs() if show_all else self.db.get_recent_runs(limit=100)
-        search_text = self.history_search_input.text().strip().lower() if hasattr(self, "history_search_input") else ""
-        provider_filter = self.history_provider_filter.currentText() if hasattr(self, "history_provider_filter") else "Todos"
-        status_filter = self.history_status_filter.currentText() if hasattr(self, "history_status_filter") else "Todos"
-        filtered = []
-        for r in runs:
-            ts_str = datetime.fromtimestamp(r["start_time"]).strftime("%Y-%m-%d %H:%M:%S")
-            if search_text:
-                target = " ".join([
-                    r["id"],
-                    r["provider"],
-                    r["model"],
-                    r["status"],
-                    ts_str,
-                ]).lower()
-                if search_text not in target:
-                    continue
-            if provider_filter != "Todos" and r["provider"] != provider_filter:
-                continue
-            if status_filter != "Todos" and r["status"] != status_filter:
-                continue
-            filtered.append(r)
-        if row >= len(filtered):
+        # Map the row to the run it was filled from
+        if row >= len(self._history_runs):
             # Should not happen, but clear detail
             self.history_detail_summary.setText("Seleccione una ejecución para ver detalles")
             self.history_detail_log.setPlainText("")
             self.history_detail_events.setRowCount(0)
             return
-        run = filtered[row]
+        run = self._history_runs[row]
         run_id = run["id"]
         # Summary line: run ID, provider, model, status, tokens, durations
         summary_parts = [f"Run {run_id[:8]}…", f"Estado: {run['status']}"]
@@ -1085,25 +1751,22 @@ class QtMainWindow(QMainWindow):
             data = "No se pudo leer el log"
         self.history_detail_log.setPlainText(data)
         # Timeline events
-        self.history_detail_events.setRowCount(0)
         try:
             events = self.db.get_events_for_run(run_id)
         except Exception:
             events = []
-        start_ts = events[0]["timestamp"] if events else None
-        for ev in events:
-            row_idx = self.history_detail_events.rowCount()
-            self.history_detail_events.insertRow(row_idx)
-            ts = ev.get("timestamp")
+        start_ts = events[0].timestamp if events else None
+        rows = []
+        for _, ts, event_name, details in events:
             # Relative time from start
             if start_ts:
                 rel = ts - start_ts
                 tstr = f"{rel:.2f}s"
             else:
                 tstr = time.strftime("%H:%M:%S", time.localtime(ts))
-            self.history_detail_events.setItem(row_idx, 0, QTableWidgetItem(tstr))
-            self.history_detail_events.setItem(row_idx, 1, QTableWidgetItem(ev.get("event", "")))
-            self.history_detail_events.setItem(row_idx, 2, QTableWidgetItem(ev.get("details", "")))
+            rows.append((tstr, event_name, details or ""))
+        self._fill_table(self.history_detail_events, rows)
+        self._fit_timeline_columns(self.history_detail_events)
 
     def _export_history_csv(self) -> None:
         # Ask file path
@@ -1112,25 +1775,10 @@ class QtMainWindow(QMainWindow):
         if not path:
             return
         show_all = self.show_all_checkbox.isChecked()
-        runs = self.db.get_all_runs() if show_all else self.db.get_recent_runs(limit=100)
-        try:
-            import csv
-            with open(path, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["id", "start_time", "provider", "model", "status", "log_file"])
-                for r in runs:
-                    dt = datetime.fromtimestamp(r["start_time"]).strftime("%Y-%m-%d %H:%M:%S")
-                    writer.writerow([
-                        r["id"],
-                        dt,
-                        r["provider"],
-                        r["model"],
-                        r["status"],
-                        r["log_file"],
-                    ])
-            self.statusBar().showMessage(f"Historial exportado a {path}", 3000)
-        except Exception as exc:
-            self.statusBar().showMessage(f"Error al exportar: {exc}", 5000)
+        runs = self._list_runs(show_all)
+        # The file is written on a pool thread; the outcome is shown in
+        # the status bar through export_done / export_failed
+        QThreadPool.globalInstance().start(_CsvExportTask(self, path, runs))
 
     # Permissions handlers
     def _toggle_sudo(self, state: int) -> None:
@@ -1156,135 +1804,85 @@ class QtMainWindow(QMainWindow):
         self.command_list.takeItem(row)
 
     # Stats updates
-    def _refresh_stats(self) -> None:
-        all_runs = self.db.get_all_runs()
-        # runs total
-        self.stat_labels["runs_total"].setText(str(len(all_runs)))
-        # runs 24h
-        now = time.time()
-        runs_24h = [r for r in all_runs if r["start_time"] > now - 86400]
-        self.stat_labels["runs_24h"].setText(str(len(runs_24h)))
-        # errors
-        errors = [r for r in all_runs if r["status"] != "success"]
-        self.stat_labels["errors_total"].setText(str(len(errors)))
-        # avg duration
-        durations = [r["end_time"] - r["start_time"] for r in all_runs if r.get("end_time") and r.get("start_time")]
-        if durations:
-            avg = sum(durations) / len(durations)
-            self.stat_labels["avg_duration"].setText(f"{avg:.2f}")
-        else:
-            self.stat_labels["avg_duration"].setText("-")
-        # tokens total
-        tokens = 0
-        for r in all_runs:
-            if r.get("tokens_in"):
-                tokens += r["tokens_in"]
-            if r.get("tokens_out"):
-                tokens += r["tokens_out"]
-        self.stat_labels["tokens_total"].setText(str(tokens) if tokens else "-")
+    def _refresh_stats(self, db_changed: bool = True) -> None:
+        """Refresh the stats tab.
+
+        With ``db_changed`` False the database-backed figures (run
+        counts, denied commands, tokens chart) are left as they are;
+        log usage and health probes are always updated.
+        """
+        if db_changed:
+            self._refresh_run_stats()
         # log usage
         stats = self.log_manager.get_stats()
-        total_bytes = stats.get("total_bytes", 0)
-        limit_bytes = self.log_manager.max_bytes
-        self.stat_labels["log_usage"].setText(f"{_human_bytes(total_bytes)} / {_human_bytes(limit_bytes)}")
+        usage_sig = (stats.get("total_bytes", 0), self.log_manager.max_bytes)
+        if usage_sig != self._log_usage_sig:
+            self._log_usage_sig = usage_sig
+            total_bytes, limit_bytes = usage_sig
+            self.stat_labels["log_usage"].setText(f"{_human_bytes(total_bytes)} / {_human_bytes(limit_bytes)}")
         # top logs
         top_files = self.log_manager.get_top_files(3)
-        if top_files:
-            top_strs = [f"{name} ({_human_bytes(size)})" for name, size in top_files]
-            self.stat_labels["top_logs"].setText(", ".join(top_strs))
+        top_sig = tuple(top_files)
+        if top_sig != self._top_logs_sig:
+            self._top_logs_sig = top_sig
+            if top_files:
+                top_strs = [f"{name} ({_human_bytes(size)})" for name, size in top_files]
+                self.stat_labels["top_logs"].setText(", ".join(top_strs))
+            else:
+                self.stat_labels["top_logs"].setText("-")
+
+        # Health status metrics.  The probes block on the network for
+        # seconds, so they run on a pool thread and _apply_health fills
+        # in the labels; a new round starts only when the last finished.
+        if not self._health_inflight:
+            self._health_inflight = True
+            QThreadPool.globalInstance().start(_HealthProbeTask(self, self.get_config()))
+
+    def _refresh_run_stats(self) -> None:
+        """Refresh the stats tab's figures that come from the database."""
+        # Run counts, average duration and tokens (in + out), aggregated
+        # by the database; the 24h window starts 86400 s ago
+        agg = self.db.get_run_stats(time.time() - 86400)
+        self.stat_labels["runs_total"].setText(str(agg.runs_total))
+        self.stat_labels["runs_24h"].setText(str(agg.runs_since))
+        self.stat_labels["errors_total"].setText(str(agg.errors_total))
+        if agg.avg_duration is not None:
+            self.stat_labels["avg_duration"].setText(f"{agg.avg_duration:.2f}")
         else:
-            self.stat_labels["top_logs"].setText("-")
+            self.stat_labels["avg_duration"].setText("-")
+        tokens = agg.tokens_total
+        self.stat_labels["tokens_total"].setText(str(tokens) if tokens else "-")
 
         # Denied commands list (show last 10)
         try:
             denied = self.db.get_denied_commands()
         except Exception:
             denied = []
-        # Keep the most recent 10 entries
+        # Keep the most recent 10 entries; the list is only rebuilt
+        # when they change
         latest_denied = denied[:10] if denied else []
-        # Clear list
-        self.denied_list.clear()
-        if latest_denied:
-            for dc in latest_denied:
-                ts = dc["timestamp"]
-                cmd = dc["command"]
-                dt = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
-                self.denied_list.addItem(f"{dt}: {cmd}")
-        else:
-            self.denied_list.addItem("-")
-
-        # Health status metrics
-        # Service status via integration helper
-        svc_status = None
-        if self.integration_helper is not None:
-            try:
-                svc_state = self.integration_helper.is_service_active()
-                if svc_state is True:
-                    svc_status = "activo"
-                elif svc_state is False:
-                    svc_status = "inactivo"
-                else:
-                    svc_status = "desconocido"
-            except Exception:
-                svc_status = "error"
-        if svc_status is not None:
-            self.stat_labels.get("service_status", QLabel()).setText(svc_status)
-        # Proxy status: call local /health endpoint
-        proxy_stat = "-"
-        proxy_port = getattr(self.integration_helper, "proxy_port", None) if self.integration_helper else None
-        if proxy_port:
-            try:
-                import requests
-                resp = requests.get(f"http://127.0.0.1:{proxy_port}/health", timeout=2)
-                if resp.ok:
-                    proxy_stat = "activo"
-                else:
-                    proxy_stat = f"{resp.status_code}"
-            except Exception:
-                proxy_stat = "inactivo"
-        self.stat_labels.get("proxy_status", QLabel()).setText(proxy_stat)
-        # Provider status: attempt to call models endpoint for selected provider
-        prov_stat = "-"
-        try:
-            config = self.get_config()
-            provider = config.get("provider", "openai")
-            providers_cfg = config.get("providers", {}) if isinstance(config.get("providers"), dict) else {}
-            provider_cfg = providers_cfg.get(provider, {}) if providers_cfg else {}
-            base_url = provider_cfg.get("base_url") or "https://api.openai.com"
-            api_key = provider_cfg.get("api_key") or None
-            api_header = provider_cfg.get("api_key_header") or "Authorization"
-            api_prefix = provider_cfg.get("api_key_prefix") or ""
-            headers = {}
-            if api_key:
-                headers[api_header] = f"{api_prefix}{api_key}"
-            # Determine models endpoint based on provider
-            models_path = "/v1/models"
-            # Use GET for list
-            import requests
-            resp = requests.get(f"{base_url}{models_path}", headers=headers, timeout=4)
-            if resp.status_code < 400:
-                prov_stat = "ok"
+        denied_sig = tuple((dc["timestamp"], dc["command"]) for dc in latest_denied)
+        if denied_sig != self._denied_sig:
+            self._denied_sig = denied_sig
+            self.denied_list.clear()
+            if latest_denied:
+                self.denied_list.addItems([
+                    f"{_fmt_ts(int(ts))}: {cmd}" for ts, cmd in denied_sig
+                ])
             else:
-                prov_stat = str(resp.status_code)
-        except Exception:
-            prov_stat = "error"
-        self.stat_labels.get("provider_status", QLabel()).setText(prov_stat)
-        # Internet status: ping a known host
-        inet_stat = "-"
-        try:
-            import socket
-            # Try to resolve and connect to a well-known DNS (google DNS)
-            sock = socket.create_connection(("8.8.8.8", 53), timeout=2)
-            sock.close()
-            inet_stat = "ok"
-        except Exception:
-            inet_stat = "sin red"
-        self.stat_labels.get("internet_status", QLabel()).setText(inet_stat)
+                self.denied_list.addItem("-")
 
         # Update tokens per day chart if charts are available
         if _QTCHARTS_AVAILABLE:
             self._update_tokens_chart()
 
+    def _apply_health(self, results: dict) -> None:
+        """Show the results of a health probe round in the stats tab."""
+        self._health_inflight = False
+        for key, text in results.items():
+            label = self.stat_labels.get(key)
+            if label is not None:
+                label.setText(text)
 
     # Integration
     def _update_integration_status(self) -> None:
@@ -1376,6 +1974,18 @@ class QtMainWindow(QMainWindow):
     def _apply_settings(self) -> None:
         selected_theme = self.theme_combo.currentText()
         selected_icon = self.icon_combo.currentText()
+        key_edits = getattr(self, "provider_key_edits", {})
+        # Nothing to compare or write if the form and the config file
+        # are both as they were after the last apply
+        state = (selected_theme, selected_icon, tuple(line.text().strip() for line in key_edits.values()))
+        try:
+            current_cfg = self._read_cfg()
+        except Exception:
+            current_cfg = None
+        applied = self._applied_state
+        if applied is not None and applied[0] == state and applied[1] is current_cfg:
+            self.statusBar().showMessage("Sin cambios", 1500)
+            return
         changed = False
         if selected_theme != self.theme:
             self._apply_theme(selected_theme)
@@ -1386,138 +1996,172 @@ class QtMainWindow(QMainWindow):
             changed = True
         # Save provider API keys if changed (encode keys when saving)
         cfg_changed = False
-        try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                cfg = json.load(f)
-        except Exception:
-            cfg = {}
-        providers_cfg = cfg.get("providers", {}) if isinstance(cfg.get("providers"), dict) else {}
-        for prov, line in getattr(self, "provider_key_edits", {}).items():
+        cfg = dict(current_cfg) if current_cfg is not None else {}
+        # Copied down to each changed provider, so the cached parse is
+        # left untouched
+        providers_cfg = dict(cfg["providers"]) if isinstance(cfg.get("providers"), dict) else {}
+        for prov, line in key_edits.items():
             new_key_plain = line.text().strip()
+            old_key = providers_cfg.get(prov, {}).get("api_key", "")
+            # Compare in plain text (decryptions are remembered), so
+            # unchanged keys are neither encrypted nor rewritten
+            if new_key_plain == self._decode_key(old_key):
+                continue
             # Encode key when saving
             new_key = self._encode_key(new_key_plain) if new_key_plain else ""
-            old_key = providers_cfg.get(prov, {}).get("api_key", "")
-            if old_key != new_key:
-                providers_cfg.setdefault(prov, {})["api_key"] = new_key
-                cfg_changed = True
+            providers_cfg[prov] = dict(providers_cfg.get(prov, {}), api_key=new_key)
+            cfg_changed = True
         if cfg_changed:
             cfg["providers"] = providers_cfg
         if changed or cfg_changed:
-            # Write back
-            with open(self.config_path, "w", encoding="utf-8") as f:
-                json.dump(cfg, f, indent=2)
-            # Update in-memory config
-            self.update_config_callback()
+            # Write back.  The form state is only recorded as applied
+            # once the write succeeds (see _config_saved), so a failed
+            # write is retried on the next click.
+            self._write_cfg(cfg, applied=state)
             self.statusBar().showMessage("Ajustes aplicados", 3000)
+        elif current_cfg is not None:
+            # Nothing to write
+            self._applied_state = (state, current_cfg)
 
     def _test_api_key(self, provider: str) -> None:
         """Test the API key for the given provider by calling its models endpoint."""
         key = self.provider_key_edits.get(provider).text().strip() if hasattr(self, "provider_key_edits") else ""
         # Determine endpoint and headers
         try:
-            with open(self.config_path, "r", encoding="utf-8") as f:
-                cfg = json.load(f)
+            cfg = self._read_cfg()
         except Exception:
             cfg = {}
         prov_cfg = cfg.get("providers", {}).get(provider, {})
         base_url = prov_cfg.get("base_url", "https://api.openai.com")
         api_header = prov_cfg.get("api_key_header", "Authorization")
         api_prefix = prov_cfg.get("api_key_prefix", "")
-        headers = {}
-        if key:
-            headers[api_header] = f"{api_prefix}{key}"
         # Determine models path (OpenAI is /v1/models; others may differ)
         models_path = "/v1/models"
-        import requests
-        try:
-            resp = requests.get(f"{base_url}{models_path}", headers=headers, timeout=5)
-            if resp.status_code < 400:
-                self.statusBar().showMessage(f"Clave {provider} válida", 4000)
-            else:
-                self.statusBar().showMessage(f"Clave {provider} no válida ({resp.status_code})", 5000)
-        except Exception as exc:
-            self.statusBar().showMessage(f"Error al probar clave {provider}: {exc}", 5000)
+        request = QNetworkRequest(QUrl(f"{base_url}{models_path}"))
+        if key:
+            request.setRawHeader(api_header.encode(), f"{api_prefix}{key}".encode())
+        request.setTransferTimeout(5000)
+        # The reply is handled asynchronously so the UI stays responsive
+        if self._nam is None:
+            self._nam = QNetworkAccessManager(self)
+        reply = self._nam.get(request)
+        reply.finished.connect(lambda: self._api_key_tested(provider, reply))
+
+    def _api_key_tested(self, provider: str, reply: QNetworkReply) -> None:
+        """Report the outcome of an API key test in the status bar."""
+        status = reply.attribute(QNetworkRequest.HttpStatusCodeAttribute)
+        if status is None:
+            # No HTTP response (connection error, timeout, bad URL)
+            self.statusBar().showMessage(f"Error al probar clave {provider}: {reply.errorString()}", 5000)
+        elif int(status) < 400:
+            self.statusBar().showMessage(f"Clave {provider} válida", 4000)
+        else:
+            self.statusBar().showMessage(f"Clave {provider} no válida ({int(status)})", 5000)
+        reply.deleteLater()
 
     def _update_tokens_chart(self) -> None:
         """Update the tokens-per-day chart.  Aggregates tokens over the last 30 days and draws a line chart."""
         if not _QTCHARTS_AVAILABLE:
             return
         try:
-            from datetime import datetime, timedelta
-            runs = self.db.get_all_runs()
-            now = datetime.now()
-            # Aggregate tokens by date (YYYY-MM-DD)
-            aggregates: Dict[datetime.date, int] = {}
-            for r in runs:
-                st = r.get("start_time")
-                if not st:
-                    continue
-                dt = datetime.fromtimestamp(st)
-                # Consider only last 30 days
-                if (now.date() - dt.date()).days > 29:
-                    continue
-                tokens = 0
-                if r.get("tokens_in"):
-                    tokens += r.get("tokens_in")
-                if r.get("tokens_out"):
-                    tokens += r.get("tokens_out")
-                if tokens == 0:
-                    continue
-                aggregates[dt.date()] = aggregates.get(dt.date(), 0) + tokens
-            # Prepare series data for last 30 days, oldest to newest
-            dates = []
-            values = []
-            for i in range(29, -1, -1):
-                day = now.date() - timedelta(days=i)
-                dates.append(day)
-                values.append(aggregates.get(day, 0))
-            # Build series
-            series = QLineSeries()
-            for day, value in zip(dates, values):
-                # Use midnight for each date
-                dt = datetime.combine(day, datetime.min.time())
-                qdt = QDateTime(dt)
-                series.append(qdt.toMSecsSinceEpoch(), value)
-            chart = QChart()
-            chart.addSeries(series)
-            chart.setTitle("Tokens por día (últimos 30 días)")
-            # Configure axes
-            axis_x = QDateTimeAxis()
-            axis_x.setFormat("dd/MM")
-            axis_x.setTickCount(7)
-            # Range from oldest to newest date
-            start_dt = datetime.combine((now.date() - timedelta(days=29)), datetime.min.time())
-            end_dt = datetime.combine(now.date(), datetime.min.time())
-            axis_x.setRange(QDateTime(start_dt), QDateTime(end_dt))
-            chart.addAxis(axis_x, Qt.AlignBottom)
-            series.attachAxis(axis_x)
-            # Y axis
-            axis_y = QValueAxis()
-            axis_y.setLabelFormat("%i")
-            axis_y.setMin(0)
+            today = datetime.now().date()
+            days = self._tokens_days
+            if days is None or days[0] != today:
+                # Midnight of each of the last 30 days, oldest to newest
+                midnights = [
+                    datetime.combine(today - timedelta(days=i), datetime.min.time())
+                    for i in range(29, -1, -1)
+                ]
+                days = self._tokens_days = (
+                    today,
+                    midnights[0].timestamp(),
+                    [m.date().isoformat() for m in midnights],
+                    [QDateTime(m).toMSecsSinceEpoch() for m in midnights],
+                )
+                # Range from oldest to newest date
+                self._tokens_axis_x.setRange(QDateTime(midnights[0]), QDateTime(midnights[-1]))
+            _, since, keys, xs = days
+            # Tokens per date (YYYY-MM-DD), summed by the database; days
+            # without runs are absent and count as zero
+            by_date = self.db.get_daily_tokens(since)
+            values = [by_date.get(key, 0) for key in keys]
+            # Replace all points in one call (one redraw)
+            self._tokens_series.replace([QPointF(x, value) for x, value in zip(xs, values)])
             # Compute max with margin
             max_val = max(values) if values else 0
-            axis_y.setMax(max_val * 1.2 if max_val > 0 else 1)
-            chart.addAxis(axis_y, Qt.AlignLeft)
-            series.attachAxis(axis_y)
-            chart.legend().hide()
-            # Apply chart to view
-            self.chart_view.setChart(chart)
+            self._tokens_axis_y.setMax(max_val * 1.2 if max_val > 0 else 1)
         except Exception:
             # In case of error, clear chart
-            if hasattr(self, "chart_view"):
-                self.chart_view.setChart(QChart())
+            if hasattr(self, "_tokens_series"):
+                self._tokens_series.clear()
     # Helpers
-    def _read_log_file(self, path: str) -> str:
+    def _read_log_file(self, path: str, tail_bytes: Optional[int] = None) -> str:
+        """Return the text of a run's log, or its last ``tail_bytes`` bytes.
+
+        Compressed copies (``.zst``/``.gz``) are used when the plain log
+        no longer exists.  When only the tail is read, the partial first
+        line is dropped.
+        """
         if not path:
             return ""
-        if path.endswith(".gz"):
-            import gzip
-            with gzip.open(path, "rt", encoding="utf-8", errors="replace") as f:
-                return f.read()
+        if not os.path.exists(path):
+            # The log may have been compressed since the run was recorded
+            for suffix in (".zst", ".gz"):
+                if os.path.exists(path + suffix):
+                    path += suffix
+                    break
+        skipped = False
+        if path.endswith((".zst", ".gz")):
+            if path.endswith(".zst"):
+                if zstd is None:
+                    raise RuntimeError("zstandard no está instalado")
+                raw = open(path, "rb")
+                f = zstd.ZstdDecompressor().stream_reader(raw)
+            else:
+                f = gzip.open(path, "rb")
+            # Compressed logs cannot be seeked into, so they are
+            # decompressed in chunks keeping at most tail_bytes of output
+            with f:
+                if tail_bytes is None:
+                    data = f.read()
+                else:
+                    buf = bytearray()
+                    while True:
+                        chunk = f.read(65536)
+                        if not chunk:
+                            break
+                        buf += chunk
+                        if len(buf) > tail_bytes:
+                            del buf[:len(buf) - tail_bytes]
+                            skipped = True
+                    data = bytes(buf)
         else:
-            with open(path, "r", encoding="utf-8", errors="replace") as f:
-                return f.read()
+            # Read the raw bytes in as few read() calls as the file size
+            # allows and decode once, bypassing the text layer's buffering
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                remaining = os.fstat(fd).st_size
+                if tail_bytes is not None and remaining > tail_bytes:
+                    os.lseek(fd, -tail_bytes, os.SEEK_END)
+                    remaining = tail_bytes
+                    skipped = True
+                chunks = []
+                while True:
+                    chunk = os.read(fd, max(remaining, 65536))
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                    remaining -= len(chunk)
+            finally:
+                os.close(fd)
+            data = b"".join(chunks)
+        text = data.decode("utf-8", errors="replace")
+        if skipped:
+            text = text[text.find("\n") + 1:]
+        # Same newlines as a text-mode read
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
 
     # Periodic timers
     def _setup_timers(self) -> None:
@@ -1539,10 +2183,61 @@ class QtMainWindow(QMainWindow):
             self.event_timer.timeout.connect(self._process_event_queue)
             self.event_timer.start()
 
+    def _sync_event_timer(self) -> None:
+        """Start or stop the live-event timer for the current page and visibility.
+
+        Live events are only drained while the live page is visible.
+        Events that arrive meanwhile are dropped on return: the next
+        refresh reloads the timeline from the database.
+        """
+        event_timer = getattr(self, "event_timer", None)
+        if event_timer is None:
+            return
+        if self.isVisible() and not self.isMinimized() and self.stack.currentIndex() == 0:
+            if not event_timer.isActive():
+                try:
+                    self.event_queue.drain()
+                except Exception:
+                    pass
+                event_timer.start()
+        else:
+            event_timer.stop()
+
+    def showEvent(self, event) -> None:  # type: ignore[override]
+        """Resume the periodic refreshes when the window is shown or restored."""
+        super().showEvent(event)
+        timer = getattr(self, "timer", None)
+        if timer is not None and not timer.isActive():
+            timer.start()
+            # Catch up with what happened while hidden
+            self._tick()
+        self._sync_event_timer()
+
+    def hideEvent(self, event) -> None:  # type: ignore[override]
+        """Pause the periodic refreshes while the window is hidden or minimised."""
+        super().hideEvent(event)
+        timer = getattr(self, "timer", None)
+        if timer is not None:
+            timer.stop()
+        self._sync_event_timer()
+
     def _tick(self) -> None:
-        # Update stats, history, live logs, integration status (lightweight)
-        self._refresh_stats()
-        self._refresh_history()
-        self._refresh_live_log()
-        if self.integration_helper is not None:
+        # Update stats, history, live logs, integration status (lightweight).
+        # Pages that have never been shown have no widgets to update.
+        # The database queries of the stats and history tabs only run
+        # when something was written since the last tick, or at least
+        # every DB_REFRESH_MAX_AGE seconds.
+        try:
+            db_sig = (self.db.data_version(), int(time.time() // DB_REFRESH_MAX_AGE))
+        except Exception:
+            db_sig = None
+        db_changed = db_sig is None or db_sig != self._tick_db_sig
+        self._tick_db_sig = db_sig
+        built = self._pages_built
+        if self._stats_page in built:
+            self._refresh_stats(db_changed)
+        if self._history_page in built and db_changed:
+            self._refresh_history()
+        self._refresh_live_log(db_changed)
+        if self._integration_page in built:
             self._update_integration_status()
\ No newline at end of file
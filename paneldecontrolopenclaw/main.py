@@ -23,10 +23,7 @@ import sys
 import threading
 from pathlib import Path
 
-import tkinter as tk
-
-from backend import Database, LogManager, Permissions, ProxyServer
-from gui.main_window import MainWindow
+from backend import Database, LogManager, Permissions, ProxyServer, config_file
 
 
 def main() -> None:
@@ -54,12 +51,8 @@ def main() -> None:
         pass
     permissions = Permissions(str(config_path))
 
-    def get_config() -> dict:
-        try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {}
+    # Parsed config, reloaded only when the file changes on disk
+    get_config = config_file(config_path)
 
     # The update callback is called when the UI writes config; we don't need
     # to do anything besides reload config in the proxy on next request
@@ -108,11 +101,16 @@ def main() -> None:
         window.show()
         # Execute Qt application event loop
         app_qt.exec()
-        # On exit stop proxy
+        # On exit stop proxy and commit any queued events
         proxy.shutdown()
+        db.flush()
+        log_manager.close()
         return
 
-    # Fall back to Tkinter UI if Qt not available
+    # Fall back to Tkinter UI if Qt not available.  Imported here so the
+    # Qt path does not load Tk at all.
+    import tkinter as tk
+    from gui.main_window import MainWindow
     root = tk.Tk()
     # Set window icon if available. Use the OpenClaw mascot stored in resources.
     icon_path = base_dir / "resources" / "openclaw_icon.png"
@@ -138,8 +136,10 @@ def main() -> None:
     )
 
     def on_close() -> None:
-        # Stop proxy and exit
+        # Stop proxy, commit queued events and exit
         proxy.shutdown()
+        db.flush()
+        log_manager.close()
         root.destroy()
 
     root.protocol("WM_DELETE_WINDOW", on_close)
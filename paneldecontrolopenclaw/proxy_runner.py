@@ -20,13 +20,22 @@ from __future__ import annotations
 import json
 import signal
 import sys
+import threading
 from pathlib import Path
 
+from backend.config import config_file
 from backend.db import Database
 from backend.log_manager import LogManager
 from backend.permissions import Permissions
 from backend.proxy import ProxyServer
 
+# Seconds between checks that the proxy thread is still running while
+# waiting for SIGINT/SIGTERM.
+STOP_POLL_INTERVAL = 1.0
+
+# Seconds to wait for the proxy thread to finish after shutdown.
+SHUTDOWN_TIMEOUT = 5.0
+
 
 def main() -> None:
     # Load configuration
@@ -55,24 +64,26 @@ def main() -> None:
     log_manager = LogManager(log_dir=log_dir, max_size_mb=max_mb, compress_days=compress_days)
     # Permissions manager
     perms = Permissions(str(cfg_path))
-    # Function to load config at runtime
-    def get_config() -> dict:
-        try:
-            with open(cfg_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {}
+    # Load config at runtime; reparsed only when the file changes
+    get_config = config_file(cfg_path)
     # Start proxy server
     proxy = ProxyServer("127.0.0.1", proxy_port, get_config, log_manager, db)
     proxy.start()
-    # Setup signal handlers to stop the proxy
-    def shutdown(*_args) -> None:
-        proxy.shutdown()
-        sys.exit(0)
+    # Signal handlers only request the stop; the main thread does the
+    # actual shutdown once its wait returns
+    stop = threading.Event()
+
+    def request_stop(*_args) -> None:
+        stop.set()
     for s in [signal.SIGINT, signal.SIGTERM]:
-        signal.signal(s, shutdown)
-    # Wait for the proxy thread to exit
-    proxy.join()
+        signal.signal(s, request_stop)
+    # Wait for a signal, or for the proxy thread to exit on its own
+    while proxy.is_alive() and not stop.wait(STOP_POLL_INTERVAL):
+        pass
+    proxy.shutdown()
+    proxy.join(timeout=SHUTDOWN_TIMEOUT)
+    db.flush()
+    log_manager.close()
 
 
 if __name__ == "__main__":